@@ -6,6 +6,10 @@ from ast_nodes.ast_builder import (
     DeclarationNode,
     AssignmentNode,
     IfNode,
+    WhileNode,
+    FunctionNode,
+    ReturnNode,
+    CallNode,
     BinaryOpNode,
     IdentifierNode,
     NumberNode
@@ -16,7 +20,15 @@ from ast_nodes.ast_builder import (
 # --------------------------------------------------
 
 class ASTAnalyzer:
-    def __init__(self):
+    """
+    When the AST was built with a SymbolTable, variable sets hold the
+    integer symbol IDs; pass the same table here to get names back in
+    the report.
+    """
+
+    def __init__(self, symbols=None):
+        self.symbols = symbols
+
         self.declared_vars = set()
         self.used_vars = set()
         self.unused_vars = set()
@@ -25,8 +37,15 @@ class ASTAnalyzer:
         self.current_depth = 0
 
         self.if_count = 0
+        self.while_count = 0
         self.assignment_count = 0
 
+        self.max_loop_depth = 0
+        self.current_loop_depth = 0
+
+        self.function_count = 0
+        self.call_sites = []    # (function name, argument count)
+
         self.warnings = []
 
     # --------------------------------------------------
@@ -52,11 +71,11 @@ class ASTAnalyzer:
                 self._visit(stmt)
 
         elif isinstance(node, DeclarationNode):
-            self.declared_vars.add(node.identifier)
+            self.declared_vars.add(node.identifier if node.sid is None else node.sid)
 
         elif isinstance(node, AssignmentNode):
             self.assignment_count += 1
-            self.used_vars.add(node.identifier)
+            self.used_vars.add(node.identifier if node.sid is None else node.sid)
             self._visit(node.expression)
 
         elif isinstance(node, IfNode):
@@ -65,12 +84,40 @@ class ASTAnalyzer:
             for stmt in node.body:
                 self._visit(stmt)
 
+        elif isinstance(node, WhileNode):
+            self.while_count += 1
+            self.current_loop_depth += 1
+            self.max_loop_depth = max(self.max_loop_depth, self.current_loop_depth)
+
+            self._visit(node.condition)
+            for stmt in node.body:
+                self._visit(stmt)
+
+            self.current_loop_depth -= 1
+
+        elif isinstance(node, FunctionNode):
+            self.function_count += 1
+            if node.param_ids is not None:
+                self.declared_vars.update(node.param_ids)
+            else:
+                self.declared_vars.update(param for _, param in node.params)
+            for stmt in node.body:
+                self._visit(stmt)
+
+        elif isinstance(node, ReturnNode):
+            self._visit(node.expression)
+
+        elif isinstance(node, CallNode):
+            self.call_sites.append((node.name, len(node.args)))
+            for arg in node.args:
+                self._visit(arg)
+
         elif isinstance(node, BinaryOpNode):
             self._visit(node.left)
             self._visit(node.right)
 
         elif isinstance(node, IdentifierNode):
-            self.used_vars.add(node.name)
+            self.used_vars.add(node.name if node.sid is None else node.sid)
 
         elif isinstance(node, NumberNode):
             pass  # No action needed
@@ -84,8 +131,12 @@ class ASTAnalyzer:
         self.unused_vars = self.declared_vars - self.used_vars
 
         for var in self.unused_vars:
+            where = ""
+            if self.symbols is not None and isinstance(var, int):
+                where = f" (line {self.symbols[var].decl_line})"
+
             self.warnings.append(
-                f"Warning: Variable '{var}' declared but never used"
+                f"Warning: Variable '{self._name(var)}' declared but never used{where}"
             )
 
         if self.max_depth > 10:
@@ -93,17 +144,26 @@ class ASTAnalyzer:
                 f"Warning: High AST depth ({self.max_depth}) — code may be complex"
             )
 
+    def _name(self, var):
+        if self.symbols is not None and isinstance(var, int):
+            return self.symbols.name(var)
+        return var
+
     # --------------------------------------------------
     # Analysis Report
     # --------------------------------------------------
     def _report(self):
         return {
-            "declared_variables": list(self.declared_vars),
-            "used_variables": list(self.used_vars),
-            "unused_variables": list(self.unused_vars),
+            "declared_variables": [self._name(v) for v in self.declared_vars],
+            "used_variables": [self._name(v) for v in self.used_vars],
+            "unused_variables": [self._name(v) for v in self.unused_vars],
             "ast_max_depth": self.max_depth,
             "if_statements": self.if_count,
+            "while_loops": self.while_count,
+            "loop_depth": self.max_loop_depth,
             "assignments": self.assignment_count,
+            "functions": self.function_count,
+            "call_sites": self.call_sites,
             "warnings": self.warnings
         }
 
@@ -6,6 +6,8 @@
 # --------------------------------------------------
 
 class ASTNode:
+    lineno = None   # source line, set when the parser builds nodes directly
+
     def __init__(self, nodetype):
         self.nodetype = nodetype
 
@@ -27,20 +29,22 @@ class ProgramNode(ASTNode):
 
 
 class DeclarationNode(ASTNode):
-    def __init__(self, datatype, identifier):
+    def __init__(self, datatype, identifier, sid=None):
         super().__init__("Declaration")
         self.datatype = datatype
         self.identifier = identifier
+        self.sid = sid      # SymbolTable ID, when built with symbols
 
     def __str__(self):
         return f"Declaration(type={self.datatype}, name={self.identifier})"
 
 
 class AssignmentNode(ASTNode):
-    def __init__(self, identifier, expression):
+    def __init__(self, identifier, expression, sid=None):
         super().__init__("Assignment")
         self.identifier = identifier
         self.expression = expression
+        self.sid = sid
 
     def __str__(self):
         return f"Assign({self.identifier} = {self.expression})"
@@ -56,6 +60,48 @@ class IfNode(ASTNode):
         return f"If(condition={self.condition}, body={self.body})"
 
 
+class WhileNode(ASTNode):
+    def __init__(self, condition, body):
+        super().__init__("While")
+        self.condition = condition
+        self.body = body
+
+    def __str__(self):
+        return f"While(condition={self.condition}, body={self.body})"
+
+
+class FunctionNode(ASTNode):
+    def __init__(self, return_type, name, params, body, param_ids=None):
+        super().__init__("Function")
+        self.return_type = return_type
+        self.name = name
+        self.params = params    # list of (datatype, name)
+        self.body = body
+        self.param_ids = param_ids
+
+    def __str__(self):
+        return f"Function({self.return_type} {self.name}{self.params}, body={self.body})"
+
+
+class ReturnNode(ASTNode):
+    def __init__(self, expression):
+        super().__init__("Return")
+        self.expression = expression
+
+    def __str__(self):
+        return f"Return({self.expression})"
+
+
+class CallNode(ASTNode):
+    def __init__(self, name, args):
+        super().__init__("Call")
+        self.name = name
+        self.args = args
+
+    def __str__(self):
+        return f"Call({self.name}, args={self.args})"
+
+
 class BinaryOpNode(ASTNode):
     def __init__(self, operator, left, right):
         super().__init__("BinaryOp")
@@ -77,70 +123,351 @@ class NumberNode(ASTNode):
 
 
 class IdentifierNode(ASTNode):
-    def __init__(self, name):
+    def __init__(self, name, sid=None):
         super().__init__("Identifier")
         self.name = name
+        self.sid = sid
 
     def __str__(self):
         return self.name
 
 
 # --------------------------------------------------
-# 3. AST Builder Function
+# 3. Expression Interning (hash-consing)
+# --------------------------------------------------
+
+class FrozenNode:
+    """
+    Mixed into interned expression nodes: one object is shared by every
+    parent, so it cannot be changed. Only interned nodes pay for the
+    __setattr__ check.
+    """
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{self.nodetype} node is shared and immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{self.nodetype} node is shared and immutable")
+
+
+class FrozenNumberNode(FrozenNode, NumberNode):
+    pass
+
+
+class FrozenIdentifierNode(FrozenNode, IdentifierNode):
+    pass
+
+
+class FrozenBinaryOpNode(FrozenNode, BinaryOpNode):
+    pass
+
+
+class FrozenCallNode(FrozenNode, CallNode):
+    pass
+
+
+# Node class → the class its interned nodes have. Tables keyed on the
+# exact node class register the frozen classes as well.
+FROZEN_CLASSES = {
+    NumberNode: FrozenNumberNode,
+    IdentifierNode: FrozenIdentifierNode,
+    BinaryOpNode: FrozenBinaryOpNode,
+    CallNode: FrozenCallNode,
+}
+
+
+# Mini-C `int` is 32 bits wide
+INT_MIN = -2 ** 31
+INT_MAX = 2 ** 31 - 1
+
+
+def _fold(operator, a, b):
+    """
+    Evaluates a binary operation on 32-bit int constants as C does
+    (division truncates towards zero). Returns None when the operation
+    must not be folded: division by zero, operands outside the int
+    range, or a result that overflows (undefined behaviour in C).
+    """
+    if not (INT_MIN <= a <= INT_MAX and INT_MIN <= b <= INT_MAX):
+        return None
+
+    if operator == '+':
+        result = a + b
+    elif operator == '-':
+        result = a - b
+    elif operator == '*':
+        result = a * b
+    elif operator == '/':
+        if b == 0:
+            return None     # keep the division so it stays visible
+        quotient = abs(a) // abs(b)
+        result = quotient if (a < 0) == (b < 0) else -quotient
+    else:
+        result = _compare(operator, a, b)
+
+    if result is None or not INT_MIN <= result <= INT_MAX:
+        return None
+    return result
+
+
+def _compare(operator, a, b):
+    if operator == '>':
+        return int(a > b)
+    elif operator == '<':
+        return int(a < b)
+    elif operator == '>=':
+        return int(a >= b)
+    elif operator == '<=':
+        return int(a <= b)
+    elif operator == '==':
+        return int(a == b)
+    elif operator == '!=':
+        return int(a != b)
+    return None
+
+
+class ExpressionInterner:
+    """
+    Shares one frozen node (see FrozenNode) per structurally distinct
+    expression. Because children are interned first, two subtrees are
+    equal exactly when their children are the same objects, so keys
+    use id().
+
+    Each interned node also carries `vars`, the tuple of variables it
+    reads (symbol IDs when available, else names), computed once from
+    its children and reused by later passes.
+    """
+
+    def __init__(self, fold_constants=True):
+        self.fold_constants = fold_constants
+        self.table = {}
+
+        self.hits = 0
+        self.folded = 0
+
+    def _intern(self, key, make, names):
+        node = self.table.get(key)
+        if node is not None:
+            self.hits += 1
+            return node
+
+        node = make()
+        node.vars = names
+        node.__class__ = FROZEN_CLASSES[type(node)]
+        self.table[key] = node
+        return node
+
+    def number(self, value):
+        return self._intern(('number', value), lambda: NumberNode(value), ())
+
+    def identifier(self, name, sid=None):
+        return self._intern(
+            ('identifier', name, sid),
+            lambda: IdentifierNode(name, sid),
+            (name if sid is None else sid,)
+        )
+
+    def binop(self, operator, left, right):
+        if (
+            self.fold_constants
+            and isinstance(left, NumberNode)
+            and isinstance(right, NumberNode)
+        ):
+            value = _fold(operator, left.value, right.value)
+            if value is not None:
+                self.folded += 1
+                return self.number(value)
+
+        return self._intern(
+            ('binop', operator, id(left), id(right)),
+            lambda: BinaryOpNode(operator, left, right),
+            left.vars + right.vars
+        )
+
+    def call(self, name, args):
+        return self._intern(
+            ('call', name) + tuple(id(arg) for arg in args),
+            lambda: CallNode(name, list(args)),
+            tuple(v for arg in args for v in arg.vars)
+        )
+
+
+# --------------------------------------------------
+# 4. Node Factory (used directly by the grammar actions)
+# --------------------------------------------------
+
+class NodeFactory:
+    """
+    Builds AST nodes straight from the parser's grammar actions, so no
+    intermediate tuple tree is created (see parser.parse_ast).
+
+    Produces the same nodes as build_ast, plus `lineno` on every
+    statement and on expressions that are not interned (shared nodes
+    have no single position).
+    """
+
+    def __init__(self, interner=None, symbols=None):
+        self.interner = interner
+        self.symbols = symbols
+
+    def _at(self, node, line):
+        node.lineno = line
+        return node
+
+    def program(self, statements):
+        return self._at(ProgramNode(statements), 1)
+
+    def declaration(self, datatype, identifier, line):
+        node = DeclarationNode(datatype, identifier, _sid(self.symbols, identifier))
+        return self._at(node, line)
+
+    def assignment(self, identifier, expression, line):
+        node = AssignmentNode(identifier, expression, _sid(self.symbols, identifier))
+        return self._at(node, line)
+
+    def if_statement(self, condition, body, line):
+        return self._at(IfNode(condition, body), line)
+
+    def while_statement(self, condition, body, line):
+        return self._at(WhileNode(condition, body), line)
+
+    def function(self, return_type, name, params, body, line):
+        param_ids = None
+        if self.symbols is not None:
+            param_ids = [_sid(self.symbols, param) for _, param in params]
+        return self._at(FunctionNode(return_type, name, params, body, param_ids), line)
+
+    def return_statement(self, expression, line):
+        return self._at(ReturnNode(expression), line)
+
+    def call(self, name, args, line):
+        if self.interner is not None:
+            return self.interner.call(name, args)
+        return self._at(CallNode(name, args), line)
+
+    def binop(self, operator, left, right, line):
+        if self.interner is not None:
+            return self.interner.binop(operator, left, right)
+        return self._at(BinaryOpNode(operator, left, right), line)
+
+    def number(self, value, line):
+        if self.interner is not None:
+            return self.interner.number(value)
+        return self._at(NumberNode(value), line)
+
+    def identifier(self, name, line):
+        sid = _sid(self.symbols, name)
+        if self.interner is not None:
+            return self.interner.identifier(name, sid)
+        return self._at(IdentifierNode(name, sid), line)
+
+
+# --------------------------------------------------
+# 5. AST Builder Function
 # --------------------------------------------------
 
-def build_ast(parse_tree):
+def build_ast(parse_tree, interner=None, symbols=None):
     """
-    Converts parser tuple output into AST nodes
+    Converts parser tuple output into AST nodes.
+    With an ExpressionInterner, expressions are hash-consed and
+    constant subexpressions are folded while building.
+    With a SymbolTable, variable references carry their symbol ID (sid).
     """
 
     node_type = parse_tree[0]
 
     # Program
     if node_type == 'program':
-        statements = [build_ast(stmt) for stmt in parse_tree[1]]
+        statements = [build_ast(stmt, interner, symbols) for stmt in parse_tree[1]]
         return ProgramNode(statements)
 
     # Declaration
     elif node_type == 'declaration':
         _, datatype, identifier = parse_tree
-        return DeclarationNode(datatype, identifier)
+        return DeclarationNode(datatype, identifier, _sid(symbols, identifier))
 
     # Assignment
     elif node_type == 'assign':
         _, identifier, expression = parse_tree
-        return AssignmentNode(identifier, build_ast(expression))
+        return AssignmentNode(
+            identifier,
+            build_ast(expression, interner, symbols),
+            _sid(symbols, identifier)
+        )
 
     # If statement
     elif node_type == 'if':
         _, condition, body = parse_tree
-        condition_node = build_ast(condition)
-        body_nodes = [build_ast(stmt) for stmt in body]
+        condition_node = build_ast(condition, interner, symbols)
+        body_nodes = [build_ast(stmt, interner, symbols) for stmt in body]
         return IfNode(condition_node, body_nodes)
 
+    # While loop
+    elif node_type == 'while':
+        _, condition, body = parse_tree
+        condition_node = build_ast(condition, interner, symbols)
+        body_nodes = [build_ast(stmt, interner, symbols) for stmt in body]
+        return WhileNode(condition_node, body_nodes)
+
+    # Function definition
+    elif node_type == 'function':
+        _, return_type, name, params, body = parse_tree
+        body_nodes = [build_ast(stmt, interner, symbols) for stmt in body]
+        param_ids = None
+        if symbols is not None:
+            param_ids = [_sid(symbols, param) for _, param in params]
+        return FunctionNode(return_type, name, list(params), body_nodes, param_ids)
+
+    # Return statement
+    elif node_type == 'return':
+        return ReturnNode(build_ast(parse_tree[1], interner, symbols))
+
+    # Function call
+    elif node_type == 'call':
+        _, name, args = parse_tree
+        arg_nodes = [build_ast(arg, interner, symbols) for arg in args]
+        if interner is not None:
+            return interner.call(name, arg_nodes)
+        return CallNode(name, arg_nodes)
+
     # Binary operation
     elif node_type == 'binop':
         _, operator, left, right = parse_tree
+        if interner is not None:
+            return interner.binop(
+                operator,
+                build_ast(left, interner, symbols),
+                build_ast(right, interner, symbols)
+            )
         return BinaryOpNode(
             operator,
-            build_ast(left),
-            build_ast(right)
+            build_ast(left, interner, symbols),
+            build_ast(right, interner, symbols)
         )
 
     # Number
     elif node_type == 'number':
+        if interner is not None:
+            return interner.number(parse_tree[1])
         return NumberNode(parse_tree[1])
 
     # Identifier
     elif node_type == 'identifier':
-        return IdentifierNode(parse_tree[1])
+        sid = _sid(symbols, parse_tree[1])
+        if interner is not None:
+            return interner.identifier(parse_tree[1], sid)
+        return IdentifierNode(parse_tree[1], sid)
 
     else:
         raise Exception(f"Unknown parse tree node: {node_type}")
 
 
+def _sid(symbols, name):
+    return symbols.intern(name) if symbols is not None else None
+
+
 # --------------------------------------------------
-# 4. Testing AST Builder
+# 6. Testing AST Builder
 # --------------------------------------------------
 if __name__ == "__main__":
     # Sample parse tree (from parser.py)
@@ -0,0 +1,104 @@
+# ast_printer.py
+# Renders AST nodes back into Mini-C source text
+
+from ast_nodes.ast_builder import (
+    ProgramNode,
+    DeclarationNode,
+    AssignmentNode,
+    IfNode,
+    WhileNode,
+    FunctionNode,
+    ReturnNode,
+    CallNode,
+    BinaryOpNode,
+    IdentifierNode,
+    NumberNode
+)
+
+
+# --------------------------------------------------
+# Source renderer
+# --------------------------------------------------
+
+def to_source(node, indent=0):
+    """
+    Converts an AST (or a single statement / expression) into Mini-C code.
+    Binary operations are always parenthesised so the output re-parses
+    to the same tree regardless of operator precedence.
+    """
+
+    pad = "    " * indent
+
+    if isinstance(node, ProgramNode):
+        return "".join(to_source(stmt, indent) for stmt in node.statements)
+
+    elif isinstance(node, DeclarationNode):
+        return f"{pad}{node.datatype} {node.identifier};\n"
+
+    elif isinstance(node, AssignmentNode):
+        return f"{pad}{node.identifier} = {_expr(node.expression)};\n"
+
+    elif isinstance(node, IfNode):
+        body = "".join(to_source(stmt, indent + 1) for stmt in node.body)
+        return f"{pad}if ({_expr(node.condition)}) {{\n{body}{pad}}}\n"
+
+    elif isinstance(node, WhileNode):
+        body = "".join(to_source(stmt, indent + 1) for stmt in node.body)
+        return f"{pad}while ({_expr(node.condition)}) {{\n{body}{pad}}}\n"
+
+    elif isinstance(node, FunctionNode):
+        params = ", ".join(f"{datatype} {name}" for datatype, name in node.params)
+        body = "".join(to_source(stmt, indent + 1) for stmt in node.body)
+        return f"{pad}{node.return_type} {node.name}({params}) {{\n{body}{pad}}}\n"
+
+    elif isinstance(node, ReturnNode):
+        return f"{pad}return {_expr(node.expression)};\n"
+
+    elif isinstance(node, CallNode):
+        return f"{pad}{_expr(node)};\n"
+
+    else:
+        return _expr(node)
+
+
+def _expr(node):
+    if isinstance(node, BinaryOpNode):
+        return f"({_expr(node.left)} {node.operator} {_expr(node.right)})"
+
+    elif isinstance(node, NumberNode):
+        # Mini-C has no unary minus; folded negatives are written as 0 - n
+        if node.value < 0:
+            return f"(0 - {-node.value})"
+        return str(node.value)
+
+    elif isinstance(node, IdentifierNode):
+        return node.name
+
+    elif isinstance(node, CallNode):
+        return f"{node.name}({', '.join(_expr(arg) for arg in node.args)})"
+
+    else:
+        raise Exception(f"Cannot render node: {node}")
+
+
+# --------------------------------------------------
+# Testing the AST Printer
+# --------------------------------------------------
+if __name__ == "__main__":
+    from ast_nodes.ast_builder import build_ast
+
+    parse_tree = (
+        'program',
+        [
+            ('declaration', 'int', 'a'),
+            ('assign', 'a', ('number', 10)),
+            ('if',
+             ('binop', '>', ('identifier', 'a'), ('number', 5)),
+             [
+                 ('assign', 'a',
+                  ('binop', '+', ('identifier', 'a'), ('number', 1)))
+             ])
+        ]
+    )
+
+    print(to_source(build_ast(parse_tree)))
@@ -0,0 +1,72 @@
+# symbol_table.py
+# Per-program symbol table mapping identifiers to dense integer IDs
+
+import sys
+
+
+# --------------------------------------------------
+# Symbol
+# --------------------------------------------------
+
+class Symbol:
+    __slots__ = ("id", "name", "datatype", "decl_line")
+
+    def __init__(self, sid, name):
+        self.id = sid
+        self.name = name
+        self.datatype = None
+        self.decl_line = None
+
+    def __str__(self):
+        return f"Symbol({self.id}: {self.datatype} {self.name}, line {self.decl_line})"
+
+    def __repr__(self):
+        return self.__str__()
+
+
+# --------------------------------------------------
+# Symbol Table
+# --------------------------------------------------
+
+class SymbolTable:
+    """
+    Filled while lexing (every identifier gets an ID on first sight)
+    and parsing (declarations record type and line). Later stages key
+    their sets and dictionaries on the integer IDs; IDs are dense
+    (0..n-1), so they can also index arrays directly.
+    """
+
+    def __init__(self):
+        self.ids = {}        # name → id
+        self.symbols = []    # id → Symbol
+
+    def intern(self, name):
+        sid = self.ids.get(name)
+        if sid is None:
+            sid = len(self.symbols)
+            name = sys.intern(name)
+            self.ids[name] = sid
+            self.symbols.append(Symbol(sid, name))
+        return sid
+
+    def declare(self, name, datatype, line):
+        symbol = self.symbols[self.intern(name)]
+        if symbol.decl_line is None:
+            symbol.datatype = datatype
+            symbol.decl_line = line
+        return symbol.id
+
+    def lookup(self, name):
+        return self.ids.get(name)
+
+    def name(self, sid):
+        return self.symbols[sid].name
+
+    def __getitem__(self, sid):
+        return self.symbols[sid]
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def __iter__(self):
+        return iter(self.symbols)
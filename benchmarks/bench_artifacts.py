@@ -0,0 +1,73 @@
+# bench_artifacts.py
+# Size and round-trip time of AST + CFG + data-flow artifacts:
+# pickle vs the flat binary format (full rebuild and lazy field access)
+
+import pickle
+import sys
+import time
+
+from lexer_parser.parser import parse_ast
+from cfg.cfg_builder import CFGBuilder
+from data_flow.data_flow_analyzer import DataFlowAnalyzer
+from dataset.ast_generator import ASTProgramGenerator
+from pipeline.artifacts import dump_artifacts, load_artifacts
+
+
+# --------------------------------------------------
+# Benchmark
+# --------------------------------------------------
+
+def timed(function, repeat=5):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def artifacts_for(programs, seed=0):
+    generator = ASTProgramGenerator(seed=seed, statements=(5, 12), depth=(0, 2))
+    code = "\n".join(generator.generate().source for _ in range(programs))
+
+    ast, _ = parse_ast(code)
+    cfg = CFGBuilder().build(ast)
+    return ast, cfg, DataFlowAnalyzer(cfg).analyze()
+
+
+def run(sizes=(5, 20, 80)):
+    # Long CFG chains (node.next → node.next → ...) are pickled recursively;
+    # from about a thousand nodes pickle needs a raised recursion limit
+    sys.setrecursionlimit(1_000_000)
+
+    print(f"{'cfg nodes':>9} {'pickle KB':>10} {'flat KB':>8} "
+          f"{'pickle dump/load ms':>20} {'flat dump/load ms':>18} {'flat lazy ms':>13}")
+
+    for programs in sizes:
+        ast, cfg, report = artifacts_for(programs)
+
+        pickle_dump, pickled = timed(lambda: pickle.dumps((ast, cfg, report), pickle.HIGHEST_PROTOCOL))
+        pickle_load, _ = timed(lambda: pickle.loads(pickled))
+
+        flat_dump, data = timed(lambda: dump_artifacts(ast=ast, cfg=cfg, dataflow=report))
+
+        def rebuild():
+            reader = load_artifacts(data)
+            return reader.ast(), reader.cfg(), reader.dataflow()
+
+        def lazy():
+            # What a cache lookup typically needs: sizes and warnings
+            reader = load_artifacts(data)
+            return reader.ast_counts(), reader.cfg_edge_count, reader.warnings()
+
+        flat_load, _ = timed(rebuild)
+        lazy_load, _ = timed(lazy)
+
+        print(f"{len(cfg.nodes):>9} {len(pickled) / 1024:>10.1f} {len(data) / 1024:>8.1f} "
+              f"{pickle_dump:>9.2f} / {pickle_load:<8.2f} {flat_dump:>8.2f} / {flat_load:<7.2f} "
+              f"{lazy_load:>13.3f}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,81 @@
+# bench_attributions.py
+# Per-sample tree-path attributions: naive per-request walk vs the
+# batched ForestExplainer (uncached and cached), and single-request latency
+
+import time
+
+import joblib
+import numpy as np
+
+from ml.attributions import ForestExplainer, LATENCY_TARGET_MS
+
+
+# --------------------------------------------------
+# Naive baseline
+# --------------------------------------------------
+
+def naive_contributions(model, x, target):
+    """
+    Follows the decision path of every tree for one sample.
+    """
+    x = np.asarray([x], dtype=np.float32)
+    contribution = np.zeros(model.n_features_in_)
+
+    for estimator in model.estimators_:
+        tree = estimator.tree_
+        value = tree.value[:, 0, :]
+        value = value[:, target] / value.sum(axis=1)
+
+        path = estimator.decision_path(x).indices
+        for parent, child in zip(path[:-1], path[1:]):
+            contribution[tree.feature[parent]] += value[child] - value[parent]
+
+    return contribution / len(model.estimators_)
+
+
+# --------------------------------------------------
+# Benchmark
+# --------------------------------------------------
+
+def random_rows(names, count, seed=0):
+    rng = np.random.default_rng(seed)
+    return [{name: int(v) for name, v in zip(names, row)}
+            for row in rng.integers(0, 12, size=(count, len(names)))]
+
+
+def run(model_path="ml/models/random_forest.joblib", batch=1000, requests=500):
+    model = joblib.load(model_path)
+    explainer = ForestExplainer(model, cache_size=batch)
+    rows = random_rows(explainer.feature_names, batch)
+
+    X = [[r[name] for name in explainer.feature_names] for r in rows[:50]]
+    start = time.perf_counter()
+    expected = [naive_contributions(model, x, explainer.target) for x in X]
+    naive_ms = (time.perf_counter() - start) * 1000 / len(X)
+
+    got = explainer.contributions(np.asarray(X))
+    print(f"max difference vs naive: {np.abs(got - np.asarray(expected)).max():.1e}")
+
+    explainer.explain_many(rows)
+    uncached = explainer.last_ms
+    explainer.explain_many(rows)
+    cached = explainer.last_ms
+
+    print(f"naive:           {naive_ms:8.3f} ms / sample")
+    print(f"batched:         {uncached / batch:8.3f} ms / sample ({batch} rows in {uncached:.1f} ms)")
+    print(f"batched, cached: {cached / batch:8.3f} ms / sample")
+
+    fresh = ForestExplainer(model, cache_size=0)
+    latencies = []
+    for row in random_rows(fresh.feature_names, requests, seed=1):
+        fresh.explain(row)
+        latencies.append(fresh.last_ms)
+
+    p50, p99 = np.percentile(latencies, [50, 99])
+    status = "ok" if p99 <= LATENCY_TARGET_MS else "OVER TARGET"
+    print(f"single request:  p50 {p50:.3f} ms, p99 {p99:.3f} ms "
+          f"(target {LATENCY_TARGET_MS} ms: {status})")
+
+
+if __name__ == "__main__":
+    run()
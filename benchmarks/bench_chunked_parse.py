@@ -0,0 +1,54 @@
+# bench_chunked_parse.py
+# Sequential vs chunked parallel parsing (AST + CFG) of one large
+# generated Mini-C file
+
+import os
+import time
+
+from dataset.ast_generator import ASTProgramGenerator
+from pipeline.chunked_parse import parse_parallel, split_top_level, _parse
+
+
+# --------------------------------------------------
+# Input
+# --------------------------------------------------
+
+def large_source(megabytes, seed=0):
+    generator = ASTProgramGenerator(seed=seed, statements=(3, 10), depth=(0, 2))
+    parts = []
+    size = 0
+
+    while size < megabytes * 1024 * 1024:
+        source = generator.generate().source
+        parts.append(source)
+        size += len(source) + 1
+
+    return "\n".join(parts)
+
+
+# --------------------------------------------------
+# Benchmark
+# --------------------------------------------------
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    func(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def run(megabytes=4, worker_counts=(2, 4, 8)):
+    data = large_source(megabytes)
+    print(f"{len(data) / 1e6:.1f} MB, {len(split_top_level(data))} chunks, "
+          f"{os.cpu_count()} CPUs")
+
+    sequential = timed(_parse, data, 1)
+    print(f"{'workers':>8} {'seconds':>8} {'speedup':>8}")
+    print(f"{1:>8} {sequential:>8.2f} {1.0:>8.2f}")
+
+    for workers in worker_counts:
+        seconds = timed(parse_parallel, data, workers)
+        print(f"{workers:>8} {seconds:>8.2f} {sequential / seconds:>8.2f}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,81 @@
+# bench_token_stream.py
+# Memory and time per 1M tokens: PLY LexTokens vs a packed TokenStream,
+# kept for later passes and fed to the parser
+
+import time
+import tracemalloc
+
+from dataset.ast_generator import ASTProgramGenerator
+from lexer_parser.lexer import lexer as base_lexer
+from lexer_parser.parser import parse_ast, parse_tokens
+from lexer_parser.token_stream import TokenStream
+
+
+def source(programs, seed=0):
+    generator = ASTProgramGenerator(seed=seed, statements=(5, 12), depth=(0, 2))
+    return "\n".join(generator.generate().source for _ in range(programs))
+
+
+def lex_tokens(data):
+    lex = base_lexer.clone()
+    lex.lineno = 1
+    lex.symbols = None
+    lex.nodes = None
+    lex.input(data)
+    return list(iter(lex.token, None))
+
+
+# --------------------------------------------------
+# Measurements
+# --------------------------------------------------
+
+def traced(func, *args):
+    """
+    (result, bytes still allocated, peak bytes) for one call.
+    """
+    tracemalloc.start()
+    result = func(*args)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current, peak
+
+
+def best_seconds(func, *args, repeat=3):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def run(programs=300):
+    data = source(programs)
+    stream = TokenStream.lex(data)
+    scale = 1_000_000 / len(stream)
+
+    print(f"{len(stream)} tokens, {len(stream.constants)} distinct values; "
+          f"figures per 1M tokens")
+
+    # What keeping the stream costs
+    _, list_bytes, _ = traced(lex_tokens, data)
+    _, packed_bytes, _ = traced(TokenStream.lex, data)
+    print(f"{'kept stream':<28} {'MB':>8}")
+    print(f"{'list of LexTokens':<28} {list_bytes * scale / 1e6:>8.1f}")
+    print(f"{'TokenStream':<28} {packed_bytes * scale / 1e6:>8.1f}")
+
+    # Parsing: lexing on the fly vs replaying the packed stream. Peak
+    # bytes include the AST being built, which is the same in both.
+    print(f"{'parse':<28} {'seconds':>8} {'peak MB':>8}")
+    for label, func, arg in (
+        ("lex + parse (PLY lexer)", parse_ast, data),
+        ("lex once into TokenStream", TokenStream.lex, data),
+        ("parse from TokenStream", parse_tokens, stream),
+    ):
+        _, _, peak = traced(func, arg)
+        seconds = best_seconds(func, arg)
+        print(f"{label:<28} {seconds * scale:>8.2f} {peak * scale / 1e6:>8.1f}")
+
+
+if __name__ == "__main__":
+    run()
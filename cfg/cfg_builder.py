@@ -1,11 +1,19 @@
 # cfg_builder.py
 # Builds a Control Flow Graph (CFG) from AST
 
+import itertools
+
 from ast_nodes.ast_builder import (
     ProgramNode,
     DeclarationNode,
     AssignmentNode,
-    IfNode
+    IfNode,
+    WhileNode,
+    FunctionNode,
+    ReturnNode,
+    CallNode,
+    BinaryOpNode,
+    IdentifierNode
 )
 
 # --------------------------------------------------
@@ -13,15 +21,22 @@ from ast_nodes.ast_builder import (
 # --------------------------------------------------
 
 class CFGNode:
-    _id = 0
+    # next() on a shared counter is atomic, so builders running in
+    # several threads never hand out the same id twice
+    _ids = itertools.count()
 
-    def __init__(self, label):
-        self.id = CFGNode._id
-        CFGNode._id += 1
+    def __init__(self, label, defs=None, uses=None, declares=None):
+        self.id = next(CFGNode._ids)
 
         self.label = label
         self.next = []   # outgoing edges
 
+        # Variables written / read by this node, and the variable it
+        # declares (if any); used by the SSA builder
+        self.defs = defs or []
+        self.uses = uses or []
+        self.declares = declares
+
     def connect(self, node):
         self.next.append(node)
 
@@ -30,6 +45,33 @@ class CFGNode:
         return f"Node({self.id}): {self.label} -> {next_ids}"
 
 
+def expression_vars(expr):
+    """
+    Returns the variables read by an expression, in source order
+    (symbol IDs when the AST carries them, else names).
+    """
+    # Interned expressions carry this precomputed
+    cached = getattr(expr, "vars", None)
+    if cached is not None:
+        return list(cached)
+
+    names = []
+    stack = [expr]
+
+    while stack:
+        node = stack.pop()
+
+        if isinstance(node, IdentifierNode):
+            names.append(node.name if node.sid is None else node.sid)
+        elif isinstance(node, BinaryOpNode):
+            stack.append(node.right)
+            stack.append(node.left)
+        elif isinstance(node, CallNode):
+            stack.extend(reversed(node.args))
+
+    return names
+
+
 # --------------------------------------------------
 # CFG Graph
 # --------------------------------------------------
@@ -37,8 +79,11 @@ class CFGNode:
 class ControlFlowGraph:
     def __init__(self):
         self.start = None
+        self.exit = None
         self.nodes = []
 
+        self.max_loop_depth = 0
+
     def add_node(self, node):
         self.nodes.append(node)
         return node
@@ -49,13 +94,45 @@ class ControlFlowGraph:
 # --------------------------------------------------
 
 class CFGBuilder:
-    def __init__(self):
+    def __init__(self, budget=None):
         self.cfg = ControlFlowGraph()
+        self.loop_depth = 0
+        self.budget = budget    # optional pipeline.budget.AnalysisBudget
 
     def build(self, ast_root):
-        self.cfg.start = self._build_node(ast_root, None)
+        self.cfg.exit = self._build_node(ast_root, None)
+        self.cfg.start = self.cfg.nodes[0] if self.cfg.nodes else None
         return self.cfg
 
+    def build_function(self, function_node):
+        """
+        Builds a standalone CFG for one function. Parameters are
+        modelled as assignments at entry so they count as initialized.
+        """
+        entry = CFGNode(f"function {function_node.name}")
+        self._add(entry)
+
+        param_ids = function_node.param_ids or [None] * len(function_node.params)
+
+        current = entry
+        for (_, param), sid in zip(function_node.params, param_ids):
+            param_node = CFGNode(f"{param} = <param>", defs=[param if sid is None else sid])
+            self._add(param_node)
+            current.connect(param_node)
+            current = param_node
+
+        for stmt in function_node.body:
+            current = self._build_node(stmt, current)
+
+        self.cfg.start = entry
+        self.cfg.exit = current
+        return self.cfg
+
+    def _add(self, node):
+        if self.budget is not None:
+            self.budget.count_cfg_nodes()
+        return self.cfg.add_node(node)
+
     # --------------------------------------------------
     # Recursive builder
     # --------------------------------------------------
@@ -70,8 +147,11 @@ class CFGBuilder:
 
         # Declaration
         elif isinstance(node, DeclarationNode):
-            cfg_node = CFGNode(f"declare {node.identifier}")
-            self.cfg.add_node(cfg_node)
+            cfg_node = CFGNode(
+                f"declare {node.identifier}",
+                declares=node.identifier if node.sid is None else node.sid
+            )
+            self._add(cfg_node)
 
             if prev_node:
                 prev_node.connect(cfg_node)
@@ -80,8 +160,12 @@ class CFGBuilder:
 
         # Assignment
         elif isinstance(node, AssignmentNode):
-            cfg_node = CFGNode(f"{node.identifier} = ...")
-            self.cfg.add_node(cfg_node)
+            cfg_node = CFGNode(
+                f"{node.identifier} = ...",
+                defs=[node.identifier if node.sid is None else node.sid],
+                uses=expression_vars(node.expression)
+            )
+            self._add(cfg_node)
 
             if prev_node:
                 prev_node.connect(cfg_node)
@@ -90,8 +174,8 @@ class CFGBuilder:
 
         # If statement
         elif isinstance(node, IfNode):
-            cond_node = CFGNode("if condition")
-            self.cfg.add_node(cond_node)
+            cond_node = CFGNode("if condition", uses=expression_vars(node.condition))
+            self._add(cond_node)
 
             if prev_node:
                 prev_node.connect(cond_node)
@@ -103,7 +187,7 @@ class CFGBuilder:
 
             # Merge node
             merge_node = CFGNode("merge")
-            self.cfg.add_node(merge_node)
+            self._add(merge_node)
 
             cond_node.connect(body_last)   # true branch
             cond_node.connect(merge_node)  # false branch
@@ -111,6 +195,50 @@ class CFGBuilder:
 
             return merge_node
 
+        # While loop
+        elif isinstance(node, WhileNode):
+            cond_node = CFGNode("while condition", uses=expression_vars(node.condition))
+            self._add(cond_node)
+
+            if prev_node:
+                prev_node.connect(cond_node)
+
+            self.loop_depth += 1
+            self.cfg.max_loop_depth = max(self.cfg.max_loop_depth, self.loop_depth)
+
+            # Build loop body (true branch)
+            body_last = cond_node
+            for stmt in node.body:
+                body_last = self._build_node(stmt, body_last)
+
+            self.loop_depth -= 1
+
+            # Exit node
+            exit_node = CFGNode("loop exit")
+            self._add(exit_node)
+
+            body_last.connect(cond_node)   # back edge
+            cond_node.connect(exit_node)   # false branch
+
+            return exit_node
+
+        # Return / call statements
+        elif isinstance(node, (ReturnNode, CallNode)):
+            if isinstance(node, ReturnNode):
+                cfg_node = CFGNode("return ...", uses=expression_vars(node.expression))
+            else:
+                cfg_node = CFGNode(f"call {node.name}", uses=expression_vars(node))
+            self._add(cfg_node)
+
+            if prev_node:
+                prev_node.connect(cfg_node)
+
+            return cfg_node
+
+        # Function definitions get their own CFG (see build_function)
+        elif isinstance(node, FunctionNode):
+            return prev_node
+
         else:
             return prev_node
 
@@ -131,6 +259,12 @@ if __name__ == "__main__":
              [
                  ('assign', 'a',
                   ('binop', '+', ('identifier', 'a'), ('number', 1)))
+             ]),
+            ('while',
+             ('binop', '<', ('identifier', 'a'), ('number', 20)),
+             [
+                 ('assign', 'a',
+                  ('binop', '+', ('identifier', 'a'), ('number', 2)))
              ])
         ]
     )
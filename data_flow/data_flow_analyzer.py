@@ -9,8 +9,16 @@ from cfg.cfg_builder import CFGNode, ControlFlowGraph
 # --------------------------------------------------
 
 class DataFlowAnalyzer:
-    def __init__(self, cfg: ControlFlowGraph):
+    """
+    May-defined analysis over the CFG nodes' defs / uses. Sets hold the
+    same variable keys as the CFG (symbol IDs when the AST was built
+    with a SymbolTable; pass it as `symbols` to get names in warnings).
+    """
+
+    def __init__(self, cfg: ControlFlowGraph, budget=None, symbols=None):
         self.cfg = cfg
+        self.budget = budget    # optional pipeline.budget.AnalysisBudget
+        self.symbols = symbols
         self.in_sets = {}
         self.out_sets = {}
 
@@ -27,14 +35,36 @@ class DataFlowAnalyzer:
         """
 
         # Initialize IN and OUT sets
+        self._gen = {}
         for node in self.cfg.nodes:
             self.in_sets[node.id] = set()
             self.out_sets[node.id] = set()
+            self._gen[node.id] = frozenset(node.defs)
+
+        self._preds = self._predecessor_map()
+        order, back_edges = self._reverse_postorder()
+
+        # Union-of-gen/kill problems are rapid: visiting nodes in reverse
+        # postorder converges after at most d + 1 passes, plus one pass
+        # that observes no change, where d (loop connectedness) is bounded
+        # by the loop nesting depth of a structured CFG.
+        loop_depth = getattr(self.cfg, "max_loop_depth", back_edges)
+        self.max_passes = min(loop_depth, back_edges) + 2
+        self.passes = 0
 
         changed = True
         while changed:
+            if self.passes == self.max_passes:
+                raise Exception(
+                    f"Data flow did not converge in {self.max_passes} passes"
+                )
+
+            self.passes += 1
             changed = False
-            for node in self.cfg.nodes:
+            for node in order:
+                if self.budget is not None:
+                    self.budget.count_solver_iteration()
+
                 in_set = self._compute_in(node)
                 out_set = self._compute_out(node, in_set)
 
@@ -52,7 +82,7 @@ class DataFlowAnalyzer:
     # --------------------------------------------------
     def _compute_in(self, node):
         in_set = set()
-        for pred in self._predecessors(node):
+        for pred in self._preds[node.id]:
             in_set |= self.out_sets[pred.id]
         return in_set
 
@@ -67,66 +97,94 @@ class DataFlowAnalyzer:
     # GEN / KILL computation
     # --------------------------------------------------
     def _gen_kill(self, node):
-        gen = set()
-        kill = set()
-
-        label = node.label
-
-        # Assignment: x = ...
-        if "=" in label and not label.startswith("if"):
-            var = label.split("=")[0].strip()
-            gen.add(var)
-            kill.add(var)
-
-        return gen, kill
+        # An assignment defines its target; nothing is ever undefined
+        # again, so KILL only matters for the dead-assignment check
+        gen = self._gen[node.id]
+        return gen, gen
 
     # --------------------------------------------------
-    # Predecessor calculation
+    # Predecessor calculation (one pass over all edges)
     # --------------------------------------------------
-    def _predecessors(self, node):
-        preds = []
+    def _predecessor_map(self):
+        preds = {node.id: [] for node in self.cfg.nodes}
         for n in self.cfg.nodes:
-            if node in n.next:
-                preds.append(n)
+            for succ in n.next:
+                preds[succ.id].append(n)
         return preds
 
+    # --------------------------------------------------
+    # Reverse postorder from the entry node
+    # Also counts back edges (edges into a node still on the DFS stack)
+    # --------------------------------------------------
+    def _reverse_postorder(self):
+        postorder = []
+        visited = set()
+        on_stack = set()
+        back_edges = 0
+
+        roots = [self.cfg.start] if self.cfg.start is not None else []
+        roots += self.cfg.nodes   # unreachable nodes still get visited
+
+        for root in roots:
+            if root.id in visited:
+                continue
+
+            visited.add(root.id)
+            on_stack.add(root.id)
+            stack = [(root, iter(root.next))]
+
+            while stack:
+                node, successors = stack[-1]
+                advanced = False
+
+                for succ in successors:
+                    if succ.id not in visited:
+                        visited.add(succ.id)
+                        on_stack.add(succ.id)
+                        stack.append((succ, iter(succ.next)))
+                        advanced = True
+                        break
+                    elif succ.id in on_stack:
+                        back_edges += 1
+
+                if not advanced:
+                    stack.pop()
+                    on_stack.discard(node.id)
+                    postorder.append(node)
+
+        postorder.reverse()
+        return postorder, back_edges
+
     # --------------------------------------------------
     # Issue Detection
     # --------------------------------------------------
     def _detect_issues(self):
         for node in self.cfg.nodes:
-            label = node.label
+            in_set = self.in_sets[node.id]
 
-            # Detect use before initialization
-            if "=" in label:
-                rhs_vars = self._extract_rhs_vars(label)
-                for var in rhs_vars:
-                    if var not in self.in_sets[node.id]:
-                        self.warnings.append(
-                            f"Use before initialization: '{var}' in node {node.id}"
-                        )
+            # Detect use before initialization: no path from the entry
+            # assigns the variable before this read
+            for var in node.uses:
+                if var not in in_set:
+                    self.warnings.append(
+                        f"Use before initialization: '{self._name(var)}' in node {node.id}"
+                    )
 
             # Dead assignment detection
-            if "=" in label:
-                var = label.split("=")[0].strip()
+            for var in node.defs:
                 used_later = False
                 for succ in node.next:
                     if var in self.in_sets.get(succ.id, set()):
                         used_later = True
                 if not used_later:
                     self.warnings.append(
-                        f"Dead assignment: '{var}' at node {node.id}"
+                        f"Dead assignment: '{self._name(var)}' at node {node.id}"
                     )
 
-    # --------------------------------------------------
-    # Helper: Extract RHS variables
-    # --------------------------------------------------
-    def _extract_rhs_vars(self, label):
-        rhs = label.split("=")[1]
-        tokens = rhs.replace("+", " ").replace("-", " ") \
-                    .replace("*", " ").replace("/", " ") \
-                    .split()
-        return [tok for tok in tokens if tok.isidentifier()]
+    def _name(self, var):
+        if self.symbols is not None and isinstance(var, int):
+            return self.symbols.name(var)
+        return var
 
     # --------------------------------------------------
     # Report
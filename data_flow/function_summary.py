@@ -0,0 +1,241 @@
+# function_summary.py
+# Per-function CFG / data-flow summaries, memoized by a hash of the function body
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from ast_nodes.ast_builder import ProgramNode, FunctionNode
+from ast_nodes.ast_printer import to_source
+from ast_nodes.ast_analyzer import ASTAnalyzer
+from cfg.cfg_builder import CFGBuilder
+from data_flow.data_flow_analyzer import DataFlowAnalyzer
+
+
+# --------------------------------------------------
+# Function Summary
+# --------------------------------------------------
+
+class FunctionSummary:
+    """
+    Analysis results for a single function. Summaries only hold plain
+    values, so they can be cached on disk and sent between processes.
+
+    A summary is reused for the same body in any file, so it holds no
+    warnings: their line numbers and CFG node ids belong to the file
+    the function was first seen in.
+    """
+
+    def __init__(self, name, params, body_hash, cfg_nodes, cfg_edges,
+                 use_before_init, dead_assignments, unused_variables):
+        self.name = name
+        self.params = params
+        self.body_hash = body_hash
+
+        self.cfg_nodes = cfg_nodes
+        self.cfg_edges = cfg_edges
+
+        self.use_before_init = use_before_init
+        self.dead_assignments = dead_assignments
+        self.unused_variables = unused_variables
+
+    def __str__(self):
+        return (
+            f"Summary({self.name}/{len(self.params)}: nodes={self.cfg_nodes}, "
+            f"use_before_init={self.use_before_init}, dead={self.dead_assignments}, "
+            f"unused={self.unused_variables})"
+        )
+
+    def to_dict(self):
+        return dict(vars(self))
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+
+def function_hash(function_node):
+    """
+    Hash of the function's canonical source (signature + body).
+    """
+    return hashlib.sha256(to_source(function_node).encode("utf-8")).hexdigest()
+
+
+def summarize_function(function_node, body_hash=None, symbols=None, budget=None):
+    cfg = CFGBuilder(budget).build_function(function_node)
+    df_report = DataFlowAnalyzer(cfg, budget, symbols).analyze()
+    ast_report = ASTAnalyzer(symbols).analyze(function_node)
+
+    return FunctionSummary(
+        name=function_node.name,
+        params=[name for _, name in function_node.params],
+        body_hash=body_hash or function_hash(function_node),
+        cfg_nodes=len(cfg.nodes),
+        cfg_edges=sum(len(node.next) for node in cfg.nodes),
+        use_before_init=sum(
+            1 for w in df_report["warnings"] if "Use before initialization" in w
+        ),
+        dead_assignments=sum(
+            1 for w in df_report["warnings"] if "Dead assignment" in w
+        ),
+        unused_variables=len(ast_report["unused_variables"])
+    )
+
+
+def _summarize_job(job):
+    function_node, body_hash, symbols, budget = job
+    return summarize_function(function_node, body_hash, symbols, budget)
+
+
+# --------------------------------------------------
+# Summary Cache
+# --------------------------------------------------
+
+class SummaryCache:
+    """
+    Maps body hash → FunctionSummary, keeping the `size` most recently
+    used summaries in memory. With a directory, summaries are also
+    persisted as JSON, so they are reused across files and runs. Files
+    are only read as plain data and must carry the hash they are
+    stored under, so a shared directory cannot inject code; a bad file
+    counts as a miss (as do files from older summary layouts).
+    """
+
+    def __init__(self, directory=None, size=4096):
+        self.directory = directory
+        self.size = size
+        self.memory = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _path(self, body_hash):
+        return os.path.join(self.directory, f"{body_hash}.json")
+
+    def _remember(self, summary):
+        with self._lock:
+            self.memory[summary.body_hash] = summary
+            self.memory.move_to_end(summary.body_hash)
+            if len(self.memory) > self.size:
+                self.memory.popitem(last=False)
+
+    def _read(self, body_hash):
+        try:
+            with open(self._path(body_hash), encoding="utf-8") as f:
+                summary = FunctionSummary.from_dict(json.load(f))
+        except (OSError, ValueError, TypeError):
+            return None
+
+        return summary if summary.body_hash == body_hash else None
+
+    def get(self, body_hash):
+        with self._lock:
+            summary = self.memory.get(body_hash)
+            if summary is not None:
+                self.memory.move_to_end(body_hash)
+
+        if summary is None and self.directory:
+            summary = self._read(body_hash)
+            if summary is not None:
+                self._remember(summary)
+
+        if summary is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return summary
+
+    def put(self, summary):
+        self._remember(summary)
+
+        if self.directory:
+            path = self._path(summary.body_hash)
+            with open(path + ".tmp", "w", encoding="utf-8") as f:
+                json.dump(summary.to_dict(), f)
+            os.replace(path + ".tmp", path)
+
+
+# --------------------------------------------------
+# Program-level entry point
+# --------------------------------------------------
+
+def analyze_functions(ast_root, cache=None, workers=None, symbols=None, budget=None):
+    """
+    Returns {(function name, statement index): FunctionSummary} for
+    every function defined in the program, so a name defined twice
+    keeps both. Only
+    functions whose body hash is not cached are analyzed; with
+    workers > 1 they are analyzed in parallel.
+
+    If `budget` runs out, BudgetExceeded propagates and no partial
+    summary is cached.
+    """
+    cache = cache if cache is not None else SummaryCache()
+
+    functions = []
+    if isinstance(ast_root, ProgramNode):
+        functions = [
+            (i, s) for i, s in enumerate(ast_root.statements) if isinstance(s, FunctionNode)
+        ]
+
+    summaries = {}
+    pending = []
+    keys = []       # summaries key of each pending job
+
+    for i, fn in functions:
+        body_hash = function_hash(fn)
+        summary = cache.get(body_hash)
+
+        if summary is None:
+            pending.append((fn, body_hash, symbols, budget))
+            keys.append((fn.name, i))
+        else:
+            summaries[fn.name, i] = summary
+
+    if workers and workers > 1 and len(pending) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            computed = list(pool.map(_summarize_job, pending))
+    else:
+        computed = [_summarize_job(job) for job in pending]
+
+    for key, summary in zip(keys, computed):
+        cache.put(summary)
+        summaries[key] = summary
+
+    return summaries
+
+
+# --------------------------------------------------
+# Testing the Function Summaries
+# --------------------------------------------------
+if __name__ == "__main__":
+    from lexer_parser.parser import parser
+    from ast_nodes.ast_builder import build_ast
+
+    code = """
+    int inc(int x) {
+        return x + 1;
+    }
+    int twice(int x) {
+        int unused;
+        return inc(inc(x));
+    }
+    int a;
+    a = twice(3);
+    """
+
+    cache = SummaryCache()
+    ast = build_ast(parser.parse(code))
+
+    for _ in range(2):
+        for (name, _), summary in analyze_functions(ast, cache).items():
+            print(name, "->", summary)
+
+    print(f"cache hits={cache.hits}, misses={cache.misses}")
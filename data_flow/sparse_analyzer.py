@@ -0,0 +1,149 @@
+# sparse_analyzer.py
+# Use-before-init, dead-store and unused-variable checks as sparse walks
+# over SSA def-use chains (cost scales with defs + uses, not nodes × vars)
+
+from cfg.cfg_builder import ControlFlowGraph
+from data_flow.ssa_builder import SSABuilder
+
+
+# --------------------------------------------------
+# Sparse Data Flow Analyzer
+# --------------------------------------------------
+
+class SparseDataFlowAnalyzer:
+    def __init__(self, cfg: ControlFlowGraph, symbols=None, budget=None):
+        self.cfg = cfg
+        self.symbols = symbols
+        self.budget = budget
+        self.ssa = None
+
+        self.warnings = []
+
+    # --------------------------------------------------
+    # Main analysis function
+    # --------------------------------------------------
+    def analyze(self):
+        self.ssa = SSABuilder(self.cfg, self.budget).build()
+
+        defined_phis = self._defined_phis()
+        live_phis = self._live_phis()
+
+        self._use_before_init(defined_phis)
+        self._dead_stores(live_phis)
+        self._unused_variables()
+
+        return self._report()
+
+    # --------------------------------------------------
+    # Phis reached by at least one real definition
+    # (forward walk along def → phi edges)
+    # --------------------------------------------------
+    def _defined_phis(self):
+        defined = set()
+        worklist = [v for v in self.ssa.values if v.kind == "def"]
+
+        while worklist:
+            value = worklist.pop()
+            for phi in value.phi_users:
+                if id(phi) not in defined:
+                    defined.add(id(phi))
+                    worklist.append(phi)
+
+        return defined
+
+    # --------------------------------------------------
+    # Phis whose value is eventually read
+    # (backward walk along phi → operand edges)
+    # --------------------------------------------------
+    def _live_phis(self):
+        live = set()
+        worklist = [v for v in self.ssa.values if v.kind == "phi" and v.uses]
+
+        for phi in worklist:
+            live.add(id(phi))
+
+        while worklist:
+            phi = worklist.pop()
+            for operand in phi.operands:
+                if operand.kind == "phi" and id(operand) not in live:
+                    live.add(id(operand))
+                    worklist.append(operand)
+
+        return live
+
+    # --------------------------------------------------
+    # Checks
+    # --------------------------------------------------
+    def _use_before_init(self, defined_phis):
+        for node, var, value in self.ssa.use_sites:
+            undefined = (
+                value.kind == "undef"
+                or (value.kind == "phi" and id(value) not in defined_phis)
+            )
+            if undefined:
+                self.warnings.append(
+                    f"Use before initialization: '{self._name(var)}' in node {node.id}"
+                )
+
+    def _dead_stores(self, live_phis):
+        for value in self.ssa.values:
+            if value.kind != "def" or value.uses:
+                continue
+
+            if any(id(phi) in live_phis for phi in value.phi_users):
+                continue
+
+            self.warnings.append(
+                f"Dead assignment: '{self._name(value.var)}' at node {value.node.id}"
+            )
+
+    def _unused_variables(self):
+        used = {var for _, var, _ in self.ssa.use_sites}
+
+        for var, node in self.ssa.declared.items():
+            if var not in used:
+                self.warnings.append(
+                    f"Unused variable: '{self._name(var)}' declared at node {node.id}"
+                )
+
+    def _name(self, var):
+        if self.symbols is not None and isinstance(var, int):
+            return self.symbols.name(var)
+        return var
+
+    # --------------------------------------------------
+    # Report
+    # --------------------------------------------------
+    def _report(self):
+        return {
+            "ssa": self.ssa,
+            "warnings": self.warnings
+        }
+
+
+# --------------------------------------------------
+# Testing the Sparse Analyzer
+# --------------------------------------------------
+if __name__ == "__main__":
+    from lexer_parser.parser import parser
+    from ast_nodes.ast_builder import build_ast
+    from cfg.cfg_builder import CFGBuilder
+
+    code = """
+    int a;
+    int b;
+    int c;
+    a = 1;
+    if (a > 0) {
+        b = a;
+    }
+    a = b + d;
+    a = 2;
+    """
+
+    cfg = CFGBuilder().build(build_ast(parser.parse(code)))
+    report = SparseDataFlowAnalyzer(cfg).analyze()
+
+    print("Sparse Data Flow Report:")
+    for w in report["warnings"]:
+        print("-", w)
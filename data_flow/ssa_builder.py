@@ -0,0 +1,309 @@
+# ssa_builder.py
+# Builds SSA form over the CFG (dominator tree, dominance frontiers,
+# phi placement, renaming) and exposes explicit def-use chains
+
+from cfg.cfg_builder import ControlFlowGraph
+
+
+# --------------------------------------------------
+# SSA Values
+# --------------------------------------------------
+
+class SSAValue:
+    """
+    One SSA definition of a variable.
+
+    kind:
+    - "undef": the implicit value a variable has before any assignment
+    - "def":   an assignment at a CFG node
+    - "phi":   a merge at a join node
+    """
+
+    __slots__ = ("var", "version", "kind", "node", "operands", "uses", "phi_users")
+
+    def __init__(self, var, version, kind, node=None):
+        self.var = var
+        self.version = version
+        self.kind = kind
+        self.node = node
+
+        self.operands = []    # phi only: incoming SSAValues, one per predecessor edge
+        self.uses = []        # CFG nodes that read this value
+        self.phi_users = []   # phis that take this value as an operand
+
+    def __str__(self):
+        return f"{self.var}_{self.version}"
+
+    def __repr__(self):
+        return self.__str__()
+
+
+# --------------------------------------------------
+# SSA Form
+# --------------------------------------------------
+
+class SSAForm:
+    def __init__(self, cfg):
+        self.cfg = cfg
+
+        self.values = []          # every SSAValue, including phis
+        self.undef = {}           # var → its "undef" SSAValue
+        self.phis = {}            # CFG node id → [phi SSAValue]
+        self.use_sites = []       # (CFG node, var, reaching SSAValue)
+
+        self.idom = {}            # CFG node id → immediate dominator node
+        self.frontiers = {}       # CFG node id → set of node ids
+        self.declared = {}        # var → declaring CFG node
+
+
+# --------------------------------------------------
+# SSA Builder
+# --------------------------------------------------
+
+class SSABuilder:
+    def __init__(self, cfg: ControlFlowGraph, budget=None):
+        self.cfg = cfg
+        self.budget = budget    # optional pipeline.budget.AnalysisBudget
+        self.ssa = SSAForm(cfg)
+
+    def build(self):
+        if self.cfg.start is None:
+            return self.ssa
+
+        self._order_and_preds()
+        self._dominators()
+        self._dominance_frontiers()
+        self._place_phis()
+        self._rename()
+
+        return self.ssa
+
+    # --------------------------------------------------
+    # Reverse postorder and predecessors (reachable nodes only)
+    # --------------------------------------------------
+    def _order_and_preds(self):
+        start = self.cfg.start
+        postorder = []
+        visited = {start.id}
+        stack = [(start, iter(start.next))]
+
+        while stack:
+            node, successors = stack[-1]
+            for succ in successors:
+                if succ.id not in visited:
+                    visited.add(succ.id)
+                    stack.append((succ, iter(succ.next)))
+                    break
+            else:
+                stack.pop()
+                postorder.append(node)
+
+        self.order = postorder[::-1]
+        self.rpo_index = {node.id: i for i, node in enumerate(self.order)}
+
+        self.preds = {node.id: [] for node in self.order}
+        for node in self.order:
+            for succ in node.next:
+                self.preds[succ.id].append(node)
+
+    # --------------------------------------------------
+    # Dominator tree (Cooper, Harvey & Kennedy)
+    # --------------------------------------------------
+    def _dominators(self):
+        start = self.cfg.start
+        index = self.rpo_index
+        idom = {start.id: start}
+
+        def intersect(a, b):
+            while a is not b:
+                while index[a.id] > index[b.id]:
+                    a = idom[a.id]
+                while index[b.id] > index[a.id]:
+                    b = idom[b.id]
+            return a
+
+        changed = True
+        while changed:
+            changed = False
+            for node in self.order[1:]:
+                if self.budget is not None:
+                    self.budget.count_solver_iteration()
+
+                new_idom = None
+                for pred in self.preds[node.id]:
+                    if pred.id in idom:
+                        new_idom = pred if new_idom is None else intersect(pred, new_idom)
+
+                if idom.get(node.id) is not new_idom:
+                    idom[node.id] = new_idom
+                    changed = True
+
+        self.ssa.idom = idom
+
+        self.dom_children = {node.id: [] for node in self.order}
+        for node in self.order[1:]:
+            self.dom_children[idom[node.id].id].append(node)
+
+    # --------------------------------------------------
+    # Dominance frontiers
+    # --------------------------------------------------
+    def _dominance_frontiers(self):
+        start = self.cfg.start
+        idom = self.ssa.idom
+        frontiers = {node.id: set() for node in self.order}
+
+        for node in self.order:
+            preds = self.preds[node.id]
+
+            # The entry node also has an implicit edge from outside the graph
+            incoming = len(preds) + (1 if node is start else 0)
+            if incoming < 2:
+                continue
+
+            for pred in preds:
+                runner = pred
+                while runner is not idom[node.id]:
+                    frontiers[runner.id].add(node.id)
+                    if runner is start:
+                        break
+                    runner = idom[runner.id]
+
+        self.ssa.frontiers = frontiers
+
+    # --------------------------------------------------
+    # Phi placement (iterated dominance frontier per variable)
+    # --------------------------------------------------
+    def _place_phis(self):
+        ssa = self.ssa
+        def_sites = {}
+
+        for node in self.order:
+            for var in node.defs:
+                def_sites.setdefault(var, set()).add(node.id)
+            if node.declares is not None:
+                ssa.declared.setdefault(node.declares, node)
+
+        self.phi_vars = {node.id: [] for node in self.order}
+
+        for var, sites in def_sites.items():
+            has_phi = set()
+            worklist = list(sites)
+
+            while worklist:
+                node_id = worklist.pop()
+                for frontier_id in ssa.frontiers[node_id]:
+                    if frontier_id in has_phi:
+                        continue
+                    has_phi.add(frontier_id)
+                    self.phi_vars[frontier_id].append(var)
+                    if frontier_id not in sites:
+                        worklist.append(frontier_id)
+
+    # --------------------------------------------------
+    # Renaming (iterative walk over the dominator tree)
+    # --------------------------------------------------
+    def _undef(self, var):
+        value = self.ssa.undef.get(var)
+        if value is None:
+            value = SSAValue(var, 0, "undef")
+            self.ssa.undef[var] = value
+            self.ssa.values.append(value)
+        return value
+
+    def _new_value(self, var, kind, node):
+        self.versions[var] = self.versions.get(var, 0) + 1
+        value = SSAValue(var, self.versions[var], kind, node)
+        self.ssa.values.append(value)
+        return value
+
+    def _current(self, var):
+        stack = self.stacks.get(var)
+        return stack[-1] if stack else self._undef(var)
+
+    def _add_operand(self, phi, value):
+        phi.operands.append(value)
+        value.phi_users.append(phi)
+
+    def _rename(self):
+        ssa = self.ssa
+        start = self.cfg.start
+
+        self.versions = {}
+        self.stacks = {}
+        self.pushed = {}
+
+        for node in self.order:
+            ssa.phis[node.id] = [
+                self._new_value(var, "phi", node) for var in self.phi_vars[node.id]
+            ]
+
+        # Operands flowing into the entry from outside the graph are undefined
+        for phi in ssa.phis[start.id]:
+            self._add_operand(phi, self._undef(phi.var))
+
+        work = [(start, False)]
+        while work:
+            node, leaving = work.pop()
+
+            if leaving:
+                for var in self.pushed.pop(node.id):
+                    self.stacks[var].pop()
+                continue
+
+            pushed = []
+
+            for phi in ssa.phis[node.id]:
+                self.stacks.setdefault(phi.var, []).append(phi)
+                pushed.append(phi.var)
+
+            for var in node.uses:
+                value = self._current(var)
+                value.uses.append(node)
+                ssa.use_sites.append((node, var, value))
+
+            for var in node.defs:
+                value = self._new_value(var, "def", node)
+                self.stacks.setdefault(var, []).append(value)
+                pushed.append(var)
+
+            for succ in node.next:
+                for phi in ssa.phis[succ.id]:
+                    self._add_operand(phi, self._current(phi.var))
+
+            self.pushed[node.id] = pushed
+
+            work.append((node, True))
+            for child in reversed(self.dom_children[node.id]):
+                work.append((child, False))
+
+
+# --------------------------------------------------
+# Testing the SSA Builder
+# --------------------------------------------------
+if __name__ == "__main__":
+    from lexer_parser.parser import parser
+    from ast_nodes.ast_builder import build_ast
+    from cfg.cfg_builder import CFGBuilder
+
+    code = """
+    int a;
+    int b;
+    a = 1;
+    while (a < 10) {
+        a = a + 1;
+        b = a;
+    }
+    a = b;
+    """
+
+    cfg = CFGBuilder().build(build_ast(parser.parse(code)))
+    ssa = SSABuilder(cfg).build()
+
+    for node in cfg.nodes:
+        phis = [f"{p} = phi{p.operands}" for p in ssa.phis.get(node.id, [])]
+        print(node, phis)
+
+    print("Def-use chains:")
+    for value in ssa.values:
+        print(f"  {value} ({value.kind}) -> nodes {[n.id for n in value.uses]}, "
+              f"phis {value.phi_users}")
@@ -0,0 +1,177 @@
+# ast_generator.py
+# Grammar-driven random generator that builds Mini-C ASTs directly,
+# skipping the render → lex → parse round trip used by the f-string generators
+
+import random
+import string
+
+from ast_nodes.ast_builder import (
+    ProgramNode,
+    DeclarationNode,
+    AssignmentNode,
+    IfNode,
+    WhileNode,
+    BinaryOpNode,
+    IdentifierNode,
+    NumberNode
+)
+from ast_nodes.ast_printer import to_source
+
+
+ARITH_OPS = ['+', '-', '*', '/']
+REL_OPS = ['>', '<', '>=', '<=', '==', '!=']
+
+
+def variable_names(count):
+    """
+    a, b, ..., z, then a1, b1, ..., z1, a2, ... (never a keyword).
+    """
+    letters = string.ascii_lowercase
+    return [
+        letters[i % 26] + (str(i // 26) if i >= 26 else "")
+        for i in range(max(count, 26))
+    ]
+
+
+# --------------------------------------------------
+# Generated program wrapper
+# --------------------------------------------------
+
+class GeneratedProgram:
+    """
+    Holds a generated AST. The Mini-C source is only rendered
+    the first time `source` is accessed.
+    """
+
+    def __init__(self, ast):
+        self.ast = ast
+        self._source = None
+
+    @property
+    def source(self):
+        if self._source is None:
+            self._source = to_source(self.ast)
+        return self._source
+
+
+# --------------------------------------------------
+# AST Generator
+# --------------------------------------------------
+
+class ASTProgramGenerator:
+    """
+    Random program generator following the Mini-C grammar.
+
+    Ranges are inclusive (min, max) tuples:
+    - statements: number of statements per block
+    - depth:      maximum `if` / `while` nesting depth
+    - variables:  size of the variable pool per program (single letters
+                  up to 26, numbered names beyond)
+    - expr_depth: maximum binary-operation depth of an expression
+    """
+
+    def __init__(
+        self,
+        seed=None,
+        statements=(2, 8),
+        depth=(0, 4),
+        variables=(1, 5),
+        expr_depth=(0, 2),
+        if_probability=0.3,
+        while_probability=0.1,
+        declare_probability=0.9
+    ):
+        self.rng = random.Random(seed)
+
+        self.statements = statements
+        self.depth = depth
+        self.variables = variables
+        self.expr_depth = expr_depth
+
+        self.if_probability = if_probability
+        self.while_probability = while_probability
+        self.declare_probability = declare_probability
+
+    # --------------------------------------------------
+    # Entry point
+    # --------------------------------------------------
+    def generate(self):
+        rng = self.rng
+
+        var_count = rng.randint(*self.variables)
+        pool = rng.sample(variable_names(var_count), var_count)
+        max_depth = rng.randint(*self.depth)
+
+        statements = [
+            DeclarationNode("int", v)
+            for v in pool
+            if rng.random() < self.declare_probability
+        ]
+        statements += self._block(pool, max_depth)
+
+        return GeneratedProgram(ProgramNode(statements))
+
+    def generate_many(self, count):
+        for _ in range(count):
+            yield self.generate()
+
+    # --------------------------------------------------
+    # Statements
+    # --------------------------------------------------
+    def _block(self, pool, depth_left):
+        size = self.rng.randint(*self.statements)
+        return [self._statement(pool, depth_left) for _ in range(max(size, 1))]
+
+    def _statement(self, pool, depth_left):
+        if depth_left > 0:
+            roll = self.rng.random()
+
+            if roll < self.if_probability:
+                return IfNode(
+                    self._condition(pool),
+                    self._block(pool, depth_left - 1)
+                )
+
+            if roll < self.if_probability + self.while_probability:
+                return WhileNode(
+                    self._condition(pool),
+                    self._block(pool, depth_left - 1)
+                )
+
+        target = self.rng.choice(pool)
+        return AssignmentNode(target, self._expression(pool, self._expr_budget()))
+
+    # --------------------------------------------------
+    # Expressions
+    # --------------------------------------------------
+    def _expr_budget(self):
+        return self.rng.randint(*self.expr_depth)
+
+    def _condition(self, pool):
+        return BinaryOpNode(
+            self.rng.choice(REL_OPS),
+            self._expression(pool, self._expr_budget()),
+            self._expression(pool, 0)
+        )
+
+    def _expression(self, pool, depth_left):
+        if depth_left > 0:
+            return BinaryOpNode(
+                self.rng.choice(ARITH_OPS),
+                self._expression(pool, depth_left - 1),
+                self._expression(pool, depth_left - 1)
+            )
+
+        if self.rng.random() < 0.5:
+            return IdentifierNode(self.rng.choice(pool))
+        return NumberNode(self.rng.randint(1, 100))
+
+
+# --------------------------------------------------
+# Testing the AST Generator
+# --------------------------------------------------
+if __name__ == "__main__":
+    generator = ASTProgramGenerator(seed=42)
+
+    for program in generator.generate_many(3):
+        print(program.source)
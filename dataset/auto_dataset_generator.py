@@ -5,10 +5,10 @@ import csv
 import random
 import string
 
-from lexer_parser.parser import parser
-from ast_nodes.ast_builder import build_ast
+from lexer_parser.parser import parse_ast
 from cfg.cfg_builder import CFGBuilder
-from features.feature_extractor import FeatureExtractor
+from features.feature_extractor import FeatureExtractor, FEATURE_SCHEMA_VERSION
+from dataset.ast_generator import ASTProgramGenerator
 
 
 # --------------------------------------------------
@@ -75,6 +75,17 @@ def generate_deep_nesting_bug(depth=4):
     return code
 
 
+# One template per bug type (plus clean code); the AST mode generates
+# as many rows in total as the templates do
+TEXT_GENERATORS = [
+    generate_clean_code,
+    generate_unused_variable_bug,
+    generate_use_before_init_bug,
+    generate_dead_assignment_bug,
+    lambda: generate_deep_nesting_bug(depth=random.randint(4, 7))
+]
+
+
 # --------------------------------------------------
 # Labeling Logic
 # --------------------------------------------------
@@ -94,15 +105,30 @@ def assign_label(features):
 # Analyze code → features
 # --------------------------------------------------
 
-def analyze(code):
+def analyze(code, extractor=None):
+    """
+    Returns the labelled feature row, or None if the code does not parse.
+    Bulk callers pass one FeatureExtractor to reuse for every program.
+    """
+    try:
+        ast, symbols = parse_ast(code)
+        return analyze_ast(ast, symbols, extractor)
+    except Exception:
+        return None
+
+
+def analyze_ast(ast, symbols=None, extractor=None):
+    # parse_ast gives no tree on a syntax error; that is not a clean row
+    if ast is None:
+        return None
+
     try:
-        parse_tree = parser.parse(code)
-        ast = build_ast(parse_tree)
         cfg = CFGBuilder().build(ast)
 
-        extractor = FeatureExtractor()
-        features = extractor.extract(ast, cfg)
+        extractor = extractor or FeatureExtractor()
+        features = extractor.extract(ast, cfg, symbols)
         features["label"] = assign_label(features)
+        features["feature_schema"] = FEATURE_SCHEMA_VERSION
 
         return features
     except Exception:
@@ -113,24 +139,25 @@ def analyze(code):
 # Dataset generation
 # --------------------------------------------------
 
-def generate_dataset(samples_per_type=250, output_csv="dataset/large_static_dataset.csv"):
-    dataset = []
-
-    generators = [
-        generate_clean_code,
-        generate_unused_variable_bug,
-        generate_use_before_init_bug,
-        generate_dead_assignment_bug,
-        lambda: generate_deep_nesting_bug(depth=random.randint(4, 7))
-    ]
-
-    while len(dataset) < samples_per_type * len(generators):
-        gen = random.choice(generators)
-        code = gen()
+def generate_dataset(
+    samples_per_type=250,
+    output_csv="dataset/large_static_dataset.csv",
+    mode="text",
+    seed=None,
+    include_source=False
+):
+    """
+    mode="text": render templates as source and parse them (original path)
+    mode="ast":  build ASTs directly with ASTProgramGenerator
 
-        features = analyze(code)
-        if features:
-            dataset.append(features)
+    Every row records the FEATURE_SCHEMA_VERSION it was extracted with.
+    """
+    if mode == "ast":
+        dataset = _generate_ast_rows(
+            samples_per_type * len(TEXT_GENERATORS), seed, include_source
+        )
+    else:
+        dataset = _generate_text_rows(samples_per_type, include_source)
 
     # Write CSV
     fieldnames = dataset[0].keys()
@@ -143,9 +170,44 @@ def generate_dataset(samples_per_type=250, output_csv="dataset/large_static_data
     print(f"📊 Total samples: {len(dataset)}")
 
 
+def _generate_text_rows(samples_per_type, include_source):
+    dataset = []
+
+    while len(dataset) < samples_per_type * len(TEXT_GENERATORS):
+        gen = random.choice(TEXT_GENERATORS)
+        code = gen()
+
+        features = analyze(code)
+        if features:
+            if include_source:
+                features["code"] = code
+            dataset.append(features)
+
+    return dataset
+
+
+def _generate_ast_rows(total, seed, include_source):
+    dataset = []
+    generator = ASTProgramGenerator(seed=seed)
+
+    while len(dataset) < total:
+        program = generator.generate()
+
+        features = analyze_ast(program.ast)
+        if features:
+            if include_source:
+                features["code"] = program.source
+            dataset.append(features)
+
+    return dataset
+
+
 # --------------------------------------------------
 # Run
 # --------------------------------------------------
 
 if __name__ == "__main__":
-    generate_dataset(samples_per_type=250)
+    import sys
+
+    mode = sys.argv[1] if len(sys.argv) > 1 else "text"
+    generate_dataset(samples_per_type=250, mode=mode)
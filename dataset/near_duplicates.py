@@ -0,0 +1,257 @@
+# near_duplicates.py
+# MinHash / LSH index that clusters near-duplicate programs, so training
+# can down-sample each family of generated variants
+
+import csv
+import random
+import zlib
+
+import numpy as np
+
+from lexer_parser.lexer import lexer as base_lexer
+
+
+# 2**31 - 1: (a * x + b) stays below 2**64 for 32-bit shingle hashes
+_PRIME = (1 << 31) - 1
+
+
+# --------------------------------------------------
+# Normalization
+# --------------------------------------------------
+
+def normalized_tokens(code):
+    """
+    Token stream with identifiers renamed in order of first appearance
+    (ID0, ID1, ...) and every number replaced by NUM. Programs that
+    differ only in variable letters or constants normalize equally,
+    while `a = a + 1` and `a = b + 1` stay different.
+    """
+    lex = base_lexer.clone()
+    lex.lineno = 1
+    lex.input(code)
+
+    names = {}
+    tokens = []
+    for tok in lex:
+        if tok.type == "IDENTIFIER":
+            tokens.append(names.setdefault(tok.value, f"ID{len(names)}"))
+        elif tok.type == "NUMBER":
+            tokens.append("NUM")
+        else:
+            tokens.append(tok.type)
+    return tokens
+
+
+def shingles(tokens, size=5):
+    """
+    32-bit hashes of every run of `size` consecutive tokens.
+    """
+    if len(tokens) <= size:
+        runs = [tokens]
+    else:
+        runs = [tokens[i:i + size] for i in range(len(tokens) - size + 1)]
+
+    return np.unique(np.fromiter(
+        (zlib.crc32(" ".join(run).encode()) for run in runs),
+        dtype=np.uint64
+    ))
+
+
+# --------------------------------------------------
+# Near-Duplicate Index
+# --------------------------------------------------
+
+class NearDuplicateIndex:
+    """
+    num_perm MinHash values per program, split into `bands` LSH bands.
+    Programs sharing a band bucket are candidates; candidates whose
+    estimated Jaccard similarity reaches `threshold` are merged into
+    one cluster (union-find), so clusters are transitive.
+    """
+
+    def __init__(self, threshold=0.8, num_perm=64, bands=16, shingle_size=5, seed=1):
+        if num_perm % bands:
+            raise Exception("num_perm must be a multiple of bands")
+
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, _PRIME, size=(num_perm, 1), dtype=np.uint64)
+        self._b = rng.integers(0, _PRIME, size=(num_perm, 1), dtype=np.uint64)
+
+        self.signatures = []
+        self.buckets = {}      # (band, band bytes) → {cluster root: sample id}
+        self.parent = []       # union-find over sample ids
+
+    # --------------------------------------------------
+    # Building
+    # --------------------------------------------------
+    def signature(self, code):
+        hashes = shingles(normalized_tokens(code), self.shingle_size)
+        return ((self._a * hashes + self._b) % _PRIME).min(axis=1)
+
+    def add(self, code):
+        """
+        Indexes one program and returns its sample id.
+        """
+        sid = len(self.signatures)
+        signature = self.signature(code)
+
+        self.signatures.append(signature)
+        self.parent.append(sid)
+
+        for band in range(self.bands):
+            key = (band, signature[band * self.rows:(band + 1) * self.rows].tobytes())
+
+            # A bucket keeps one member per cluster, so families of
+            # identical variants cost one comparison, not one per member
+            bucket = self.buckets.setdefault(key, {})
+            for other in list(bucket.values()):
+                if (
+                    self._find(other) != self._find(sid)
+                    and self.similarity(sid, other) >= self.threshold
+                ):
+                    self._union(sid, other)
+            bucket.setdefault(self._find(sid), sid)
+
+        return sid
+
+    def add_many(self, sources):
+        return [self.add(code) for code in sources]
+
+    def similarity(self, i, j):
+        """
+        Estimated Jaccard similarity of the two programs' shingle sets.
+        """
+        return float(np.mean(self.signatures[i] == self.signatures[j]))
+
+    def _find(self, i):
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def _union(self, i, j):
+        ri, rj = self._find(i), self._find(j)
+        if ri != rj:
+            self.parent[max(ri, rj)] = min(ri, rj)
+
+    # --------------------------------------------------
+    # Clusters
+    # --------------------------------------------------
+    def cluster_labels(self):
+        """
+        Cluster id per sample (the smallest sample id in its cluster).
+        """
+        return np.asarray([self._find(i) for i in range(len(self.parent))])
+
+    def clusters(self):
+        groups = {}
+        for sid, root in enumerate(self.cluster_labels()):
+            groups.setdefault(int(root), []).append(sid)
+        return list(groups.values())
+
+
+# --------------------------------------------------
+# Down-sampling
+# --------------------------------------------------
+
+def downsample(cluster_labels, labels=None, per_cluster=1, seed=0):
+    """
+    Sorted sample indices keeping at most `per_cluster` samples of each
+    cluster. With class labels, each (cluster, label) group is capped
+    separately, so no cluster loses a class entirely.
+    """
+    rng = random.Random(seed)
+    groups = {}
+
+    for i, cluster in enumerate(cluster_labels):
+        key = (cluster, labels[i]) if labels is not None else cluster
+        groups.setdefault(key, []).append(i)
+
+    keep = []
+    for members in groups.values():
+        if len(members) > per_cluster:
+            members = rng.sample(members, per_cluster)
+        keep.extend(members)
+
+    return np.asarray(sorted(keep), dtype=np.int64)
+
+
+def prune_csv_rows(csv_path, per_cluster=1, code_column="code", **index_options):
+    """
+    Clusters the programs of a dataset CSV (written with
+    include_source=True) and returns (row indices to keep, index).
+    """
+    index = NearDuplicateIndex(**index_options)
+    labels = []
+
+    with open(csv_path, newline="") as f:
+        reader = csv.DictReader(f)
+        if code_column not in (reader.fieldnames or ()):
+            raise Exception(f"{csv_path} has no '{code_column}' column "
+                            f"(generate it with include_source=True)")
+
+        for row in reader:
+            index.add(row[code_column])
+            labels.append(row["label"])
+
+    return downsample(index.cluster_labels(), labels, per_cluster), index
+
+
+# --------------------------------------------------
+# Training report
+# --------------------------------------------------
+
+def pruning_report(csv_path, per_cluster=5, folds=5, n_jobs=-1):
+    """
+    Cross-validates every model family on the full dataset and with
+    each cluster down-sampled (same test folds, all rows), and prints
+    rows kept, training time saved and the change in accuracy / F1.
+    """
+    import tempfile
+
+    from ml.parallel_train import train_all
+
+    keep, index = prune_csv_rows(csv_path, per_cluster)
+    total = len(index.signatures)
+    print(f"{total} programs -> {len(index.clusters())} clusters; "
+          f"training on {len(keep)} rows ({100 * len(keep) / total:.1f}%)")
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        full = train_all(csv_path, folds, n_jobs, output_dir)
+        pruned = train_all(csv_path, folds, n_jobs, output_dir, keep=keep)
+
+    print(f"{'model':<20} {'fit s (full → pruned)':>24} {'accuracy':>18} {'f1':>18}")
+    for name in full:
+        if name.startswith("_"):
+            continue
+        a, b = full[name], pruned[name]
+        print(f"{name:<20} {a['seconds']:>10.3f} → {b['seconds']:<10.3f} "
+              f"{a['accuracy']:.4f} → {b['accuracy']:.4f} {a['f1']:.4f} → {b['f1']:.4f}")
+
+    saved = full["_wall_seconds"] - pruned["_wall_seconds"]
+    print(f"⏱ Wall time {full['_wall_seconds']:.2f}s → {pruned['_wall_seconds']:.2f}s "
+          f"({saved:+.2f}s saved)")
+    return full, pruned
+
+
+# --------------------------------------------------
+# Run
+# --------------------------------------------------
+if __name__ == "__main__":
+    import os
+    import sys
+
+    from dataset.auto_dataset_generator import generate_dataset
+
+    csv_path = sys.argv[1] if len(sys.argv) > 1 else "dataset/near_duplicate_dataset.csv"
+    if not os.path.exists(csv_path):
+        generate_dataset(samples_per_type=250, output_csv=csv_path, include_source=True)
+
+    per_cluster = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    pruning_report(csv_path, per_cluster)
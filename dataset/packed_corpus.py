@@ -0,0 +1,257 @@
+# packed_corpus.py
+# Packs many small Mini-C programs into a single file with an offset index
+# and analyzes them in bulk through a memory map
+
+import csv
+import mmap
+import os
+import struct
+import sys
+from array import array
+from multiprocessing import Pool
+
+from dataset.auto_dataset_generator import analyze
+from features.feature_extractor import FeatureExtractor
+
+
+# --------------------------------------------------
+# File layout
+# --------------------------------------------------
+#
+#   header : magic(4s) version(I) count(Q) index_offset(Q)
+#   data   : UTF-8 sources, back to back
+#   index  : count × (offset(Q), length(Q)), little-endian like the header
+#
+# The index is written last so sources can be streamed in
+# without knowing the corpus size up front.
+
+MAGIC = b"MCPK"
+VERSION = 1
+HEADER = struct.Struct("<4sIQQ")
+
+
+# --------------------------------------------------
+# Writer
+# --------------------------------------------------
+
+def write_packed_corpus(sources, output_path):
+    """
+    Writes an iterable of source strings to a packed corpus file.
+    Returns the number of programs written.
+    """
+    index = array("Q")
+
+    with open(output_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, 0, 0))
+
+        offset = HEADER.size
+        for code in sources:
+            data = code.encode("utf-8")
+            f.write(data)
+
+            index.append(offset)
+            index.append(len(data))
+            offset += len(data)
+
+        index_offset = offset
+        if sys.byteorder != "little":
+            index.byteswap()
+        index.tofile(f)
+
+        count = len(index) // 2
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, VERSION, count, index_offset))
+
+    return count
+
+
+def pack_directory(source_dir, output_path, extension=".mc"):
+    """
+    Packs every file with the given extension under source_dir.
+    """
+    def read_sources():
+        for root, _, files in os.walk(source_dir):
+            for name in sorted(files):
+                if name.endswith(extension):
+                    with open(os.path.join(root, name), encoding="utf-8") as f:
+                        yield f.read()
+
+    return write_packed_corpus(read_sources(), output_path)
+
+
+# --------------------------------------------------
+# Reader
+# --------------------------------------------------
+
+class PackedCorpus:
+    """
+    Read-only, memory-mapped view of a packed corpus.
+    Indexing returns a memoryview into the mapping (no copy).
+    """
+
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        self._mm = None
+        self._view = None
+        self._index = None
+
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._view = memoryview(self._mm)
+            self._open_index(path)
+        except Exception:
+            self.close()
+            raise
+
+    def _open_index(self, path):
+        if len(self._mm) < HEADER.size:
+            raise Exception(f"Not a packed corpus (v{VERSION}): {path}")
+
+        magic, version, count, index_offset = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            raise Exception(f"Not a packed corpus (v{VERSION}): {path}")
+        if index_offset + count * 16 > len(self._mm):
+            raise Exception(f"Truncated packed corpus: {path}")
+
+        self.count = count
+        index = self._view[index_offset:index_offset + count * 16]
+
+        # Little-endian hosts read the index in place; others get a
+        # byte-swapped copy
+        if sys.byteorder == "little":
+            self._index = index.cast("Q")
+        else:
+            self._index = array("Q", index.tobytes())
+            self._index.byteswap()
+            index.release()
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        offset = self._index[2 * i]
+        length = self._index[2 * i + 1]
+        return self._view[offset:offset + length]
+
+    def source(self, i):
+        return str(self[i], "utf-8")
+
+    def close(self):
+        if isinstance(self._index, memoryview):
+            self._index.release()
+        self._index = None
+
+        if self._view is not None:
+            self._view.release()
+            self._view = None
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# --------------------------------------------------
+# Bulk analysis
+# --------------------------------------------------
+
+def iter_features(corpus, start=0, stop=None, extractor=None):
+    """
+    Streams feature rows for programs[start:stop].
+    Rows that fail to parse are yielded as None to keep positions aligned.
+    One FeatureExtractor (and its rule engine) serves every program.
+    """
+    stop = len(corpus) if stop is None else stop
+    extractor = extractor or FeatureExtractor()
+
+    for i in range(start, stop):
+        # PLY's lexer matches str patterns, so each program is decoded
+        # once here; no intermediate bytes object is created.
+        yield analyze(corpus.source(i), extractor)
+
+
+_worker_corpus = None
+_worker_extractor = None
+
+
+def _init_worker(path):
+    global _worker_corpus, _worker_extractor
+    _worker_corpus = PackedCorpus(path)
+    _worker_extractor = FeatureExtractor()
+
+
+def _analyze_range(bounds):
+    start, stop = bounds
+    return list(iter_features(_worker_corpus, start, stop, _worker_extractor))
+
+
+def analyze_packed_corpus(path, workers=None, chunk_size=1000):
+    """
+    Yields (program_index, features) for every program in the corpus.
+    With workers > 1 each process maps the file itself, so the OS page
+    cache is shared and only feature rows cross process boundaries.
+    """
+    with PackedCorpus(path) as corpus:
+        total = len(corpus)
+
+        if not workers or workers <= 1:
+            for i, features in enumerate(iter_features(corpus)):
+                yield i, features
+            return
+
+    ranges = [
+        (start, min(start + chunk_size, total))
+        for start in range(0, total, chunk_size)
+    ]
+
+    with Pool(workers, initializer=_init_worker, initargs=(path,)) as pool:
+        for (start, _), rows in zip(ranges, pool.imap(_analyze_range, ranges)):
+            for offset, features in enumerate(rows):
+                yield start + offset, features
+
+
+def write_features_csv(path, output_csv, workers=None):
+    """
+    Analyzes a packed corpus and streams feature rows into a CSV file.
+    """
+    writer = None
+    written = 0
+
+    with open(output_csv, "w", newline="") as f:
+        for i, features in analyze_packed_corpus(path, workers=workers):
+            if features is None:
+                continue
+
+            row = {"program": i, **features}
+            if writer is None:
+                writer = csv.DictWriter(f, fieldnames=row.keys())
+                writer.writeheader()
+
+            writer.writerow(row)
+            written += 1
+
+    return written
+
+
+# --------------------------------------------------
+# Run
+# --------------------------------------------------
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == "pack":
+        count = pack_directory(sys.argv[2], sys.argv[3])
+        print(f"✅ Packed {count} programs into {sys.argv[3]}")
+
+    elif len(sys.argv) >= 4 and sys.argv[1] == "analyze":
+        workers = int(sys.argv[4]) if len(sys.argv) > 4 else None
+        count = write_features_csv(sys.argv[2], sys.argv[3], workers=workers)
+        print(f"✅ Wrote {count} feature rows to {sys.argv[3]}")
+
+    else:
+        print("Usage:")
+        print("  python -m dataset.packed_corpus pack <source_dir> <corpus_file>")
+        print("  python -m dataset.packed_corpus analyze <corpus_file> <output_csv> [workers]")
@@ -1,63 +1,106 @@
 # feature_extractor.py
 # Extracts numerical features from AST, CFG, and Data Flow Analysis
 
-from ast_nodes.ast_analyzer import ASTAnalyzer
 from cfg.cfg_builder import ControlFlowGraph
 from data_flow.data_flow_analyzer import DataFlowAnalyzer
+from data_flow.sparse_analyzer import SparseDataFlowAnalyzer
+from data_flow.function_summary import SummaryCache, analyze_functions
+from rules.rule_engine import RuleEngine
 
 
 # --------------------------------------------------
 # Feature Extractor
 # --------------------------------------------------
 
+FEATURE_NAMES = (
+    "ast_max_depth", "unused_variables", "if_statements", "while_loops",
+    "loop_depth", "assignments", "functions", "function_calls",
+    "invalid_calls", "cfg_nodes", "cfg_edges", "use_before_init",
+    "dead_assignments",
+)
+
+# Version of the FEATURE_NAMES columns, bumped whenever one is added,
+# removed, reordered or computed differently. Datasets and trained
+# models record it, and a model is only used on features of the same
+# version.
+#   1: ast_max_depth … dead_assignments, the original 8 columns
+#   2: + while_loops, loop_depth
+#   3: + functions, function_calls, invalid_calls
+FEATURE_SCHEMA_VERSION = 3
+
+
 class FeatureExtractor:
-    def __init__(self):
-        pass
+    """
+    dataflow="dense": set-based DataFlowAnalyzer (original behaviour)
+    dataflow="ssa":   SparseDataFlowAnalyzer over SSA def-use chains
+
+    AST and CFG features come from the feature passes of `rules` (a
+    RuleEngine, default: every registered rule), which always run.
+    Every FEATURE_NAMES column is always filled; the rule selection
+    only changes the warnings and timings in rule_report.
+    """
+
+    def __init__(self, summary_cache=None, dataflow="dense", rules=None):
+        if dataflow not in ("dense", "ssa"):
+            raise Exception(f"Unknown data-flow mode: {dataflow}")
+
+        self.dataflow = dataflow
+        self.summary_cache = summary_cache if summary_cache is not None else SummaryCache()
+        self.summaries = {}
+
+        self.rules = rules if rules is not None else RuleEngine()
+        self.rule_report = None
+
+        # Filled stage by stage, so it holds the features computed so far
+        # if an AnalysisBudget stops extract() part way
+        self.features = {}
 
     # --------------------------------------------------
     # Main feature extraction function
     # --------------------------------------------------
-    def extract(self, ast_root, cfg: ControlFlowGraph):
+    def extract(self, ast_root, cfg: ControlFlowGraph, symbols=None, budget=None):
         """
-        Returns a dictionary of numeric features
+        Returns a dictionary of numeric features.
+        `symbols` is the SymbolTable the AST was built with, if any.
+        `budget` is an optional pipeline.budget.AnalysisBudget.
         """
+        features = self.features = {}
+
+        # ---------- AST / CFG FEATURES ----------
+        # One AST walk and one CFG walk for every enabled rule
+        self.rule_report = self.rules.run(ast_root, cfg, symbols, budget)
+        features.update(self.rule_report.features)
 
-        # ---------- AST FEATURES ----------
-        ast_analyzer = ASTAnalyzer()
-        ast_report = ast_analyzer.analyze(ast_root)
+        # ---------- FUNCTION SUMMARIES ----------
+        # Function bodies are not part of the program CFG; their data-flow
+        # results come from (cached) per-function summaries instead.
+        self.summaries = analyze_functions(
+            ast_root, self.summary_cache, symbols=symbols, budget=budget
+        )
 
         # ---------- DATA FLOW FEATURES ----------
-        dfa = DataFlowAnalyzer(cfg)
+        if self.dataflow == "ssa":
+            dfa = SparseDataFlowAnalyzer(cfg, symbols, budget)
+        else:
+            dfa = DataFlowAnalyzer(cfg, budget, symbols)
         df_report = dfa.analyze()
 
-        # ---------- CFG FEATURES ----------
-        cfg_nodes = len(cfg.nodes)
-        cfg_edges = sum(len(node.next) for node in cfg.nodes)
-
-        # ---------- FEATURE VECTOR ----------
-        features = {
-            # AST-based
-            "ast_max_depth": ast_report["ast_max_depth"],
-            "unused_variables": len(ast_report["unused_variables"]),
-            "if_statements": ast_report["if_statements"],
-            "assignments": ast_report["assignments"],
-
-            # CFG-based
-            "cfg_nodes": cfg_nodes,
-            "cfg_edges": cfg_edges,
-
-            # Data-flow-based
+        features.update({
             "use_before_init": sum(
                 1 for w in df_report["warnings"]
                 if "Use before initialization" in w
-            ),
+            ) + sum(f.use_before_init for f in self.summaries.values()),
             "dead_assignments": sum(
                 1 for w in df_report["warnings"]
                 if "Dead assignment" in w
-            ),
-        }
-
-        return features
+            ) + sum(f.dead_assignments for f in self.summaries.values()),
+        })
+
+        # Same columns in the same order whichever rules are enabled
+        ordered = {name: features[name] for name in FEATURE_NAMES}
+        ordered.update(features)
+        self.features = ordered
+        return ordered
 
 
 # --------------------------------------------------
@@ -0,0 +1,168 @@
+# feature_store.py
+# SQLite-backed store of per-file features and predictions,
+# keyed by path, content hash and mtime, and tagged with the feature
+# schema and model that produced them
+
+import json
+import sqlite3
+import time
+
+
+# --------------------------------------------------
+# Feature Store
+# --------------------------------------------------
+
+class FeatureStore:
+    """
+    Every row records the FEATURE_SCHEMA_VERSION its features were
+    extracted with and the model version (Predictor.model_version)
+    that scored them, so results from another analyzer or model are
+    never taken for current ones.
+    """
+
+    def __init__(self, db_path="features.db"):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS files (
+                path           TEXT PRIMARY KEY,
+                content_hash   TEXT NOT NULL,
+                mtime          REAL NOT NULL,
+                size           INTEGER NOT NULL,
+                features       TEXT,
+                prediction     INTEGER,
+                error          TEXT,
+                analyzed_at    REAL NOT NULL,
+                feature_schema INTEGER,
+                model_version  TEXT
+            )
+            """
+        )
+
+        # Stores created before rows were tagged; their rows have NULL
+        # tags and so count as stale
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(files)")}
+        for column, kind in (("feature_schema", "INTEGER"), ("model_version", "TEXT")):
+            if column not in columns:
+                self.conn.execute(f"ALTER TABLE files ADD COLUMN {column} {kind}")
+
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS files_hash ON files (content_hash)"
+        )
+        self.conn.commit()
+
+    # --------------------------------------------------
+    # Lookups
+    # --------------------------------------------------
+    def stat_index(self):
+        """
+        Returns {path: (mtime, size, content_hash, feature_schema,
+        model_version)} for every stored file.
+        """
+        rows = self.conn.execute(
+            "SELECT path, mtime, size, content_hash, feature_schema, model_version FROM files"
+        )
+        return {path: tuple(rest) for path, *rest in rows}
+
+    def get(self, path):
+        row = self.conn.execute(
+            "SELECT content_hash, mtime, features, prediction, error FROM files WHERE path = ?",
+            (path,)
+        ).fetchone()
+
+        if row is None:
+            return None
+
+        content_hash, mtime, features, prediction, error = row
+        return {
+            "path": path,
+            "content_hash": content_hash,
+            "mtime": mtime,
+            "features": json.loads(features) if features else None,
+            "prediction": prediction,
+            "error": error
+        }
+
+    def find_by_hash(self, content_hash, feature_schema, model_version):
+        """
+        Reuses results from any file with identical content, analyzed
+        with the same feature schema and scored by the same model.
+        """
+        row = self.conn.execute(
+            """
+            SELECT features, prediction, error FROM files
+            WHERE content_hash = ? AND feature_schema = ? AND model_version = ?
+            LIMIT 1
+            """,
+            (content_hash, feature_schema, model_version)
+        ).fetchone()
+
+        if row is None:
+            return None
+
+        features, prediction, error = row
+        return json.loads(features) if features else None, prediction, error
+
+    # --------------------------------------------------
+    # Updates
+    # --------------------------------------------------
+    def upsert(self, path, content_hash, mtime, size, features, prediction, error=None,
+               feature_schema=None, model_version=None):
+        self.conn.execute(
+            """
+            INSERT INTO files (path, content_hash, mtime, size, features, prediction, error,
+                               analyzed_at, feature_schema, model_version)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(path) DO UPDATE SET
+                content_hash   = excluded.content_hash,
+                mtime          = excluded.mtime,
+                size           = excluded.size,
+                features       = excluded.features,
+                prediction     = excluded.prediction,
+                error          = excluded.error,
+                analyzed_at    = excluded.analyzed_at,
+                feature_schema = excluded.feature_schema,
+                model_version  = excluded.model_version
+            """,
+            (
+                path, content_hash, mtime, size,
+                json.dumps(features) if features is not None else None,
+                prediction, error, time.time(), feature_schema, model_version
+            )
+        )
+
+    def touch(self, path, mtime, size):
+        """
+        Records a new mtime for a file whose content did not change.
+        """
+        self.conn.execute(
+            "UPDATE files SET mtime = ?, size = ? WHERE path = ?",
+            (mtime, size, path)
+        )
+
+    def remove(self, paths):
+        self.conn.executemany("DELETE FROM files WHERE path = ?", [(p,) for p in paths])
+
+    def commit(self):
+        self.conn.commit()
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+    # --------------------------------------------------
+    # Summary
+    # --------------------------------------------------
+    def summary(self):
+        total, buggy, errors = self.conn.execute(
+            """
+            SELECT COUNT(*),
+                   COALESCE(SUM(prediction = 1), 0),
+                   COALESCE(SUM(error IS NOT NULL), 0)
+            FROM files
+            """
+        ).fetchone()
+        return {"files": total, "buggy": buggy, "errors": errors}
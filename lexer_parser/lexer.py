@@ -15,7 +15,7 @@ tokens = (
 
     'LPAREN', 'RPAREN',
     'LBRACE', 'RBRACE',
-    'SEMICOLON',
+    'SEMICOLON', 'COMMA',
 
     'LT', 'GT', 'LE', 'GE', 'EQ', 'NE'
 )
@@ -48,6 +48,7 @@ t_RPAREN    = r'\)'
 t_LBRACE    = r'\{'
 t_RBRACE    = r'\}'
 t_SEMICOLON = r';'
+t_COMMA     = r','
 
 t_LE        = r'<='
 t_GE        = r'>='
@@ -62,6 +63,12 @@ t_GT        = r'>'
 def t_IDENTIFIER(t):
     r'[a-zA-Z_][a-zA-Z_0-9]*'
     t.type = reserved.get(t.value, 'IDENTIFIER')
+
+    # Lexers carrying a SymbolTable assign each identifier its ID here
+    symbols = getattr(t.lexer, "symbols", None)
+    if symbols is not None and t.type == 'IDENTIFIER':
+        symbols.intern(t.value)
+
     return t
 
 # --------------------------------------------------
@@ -96,6 +103,10 @@ def t_error(t):
 # --------------------------------------------------
 lexer = lex.lex()
 
+# Per-parse state, set on clones (see parser.parse_with_symbols / parse_ast)
+lexer.symbols = None
+lexer.nodes = None
+
 # --------------------------------------------------
 # 10. Testing the lexer (run this file directly)
 # --------------------------------------------------
@@ -2,7 +2,9 @@
 # Syntax Analyzer using PLY (Python Yacc)
 
 import ply.yacc as yacc
-from lexer_parser.lexer import tokens
+from lexer_parser.lexer import tokens, lexer
+from ast_nodes.symbol_table import SymbolTable
+from ast_nodes.ast_builder import NodeFactory
 
 # --------------------------------------------------
 # 1. Operator precedence (important!)
@@ -14,15 +16,85 @@ precedence = (
 )
 
 # --------------------------------------------------
-# 2. Grammar rules
+# 2. Parse tree output
+# --------------------------------------------------
+# Grammar actions build their results through a factory. By default
+# that is TupleFactory (nested tuples, turned into AST nodes later by
+# build_ast); a lexer carrying a NodeFactory as `nodes` makes the
+# actions build AST nodes directly (see parse_ast).
+
+class TupleFactory:
+    def program(self, statements):
+        return ('program', statements)
+
+    def declaration(self, datatype, identifier, line):
+        return ('declaration', datatype, identifier)
+
+    def assignment(self, identifier, expression, line):
+        return ('assign', identifier, expression)
+
+    def if_statement(self, condition, body, line):
+        return ('if', condition, body)
+
+    def while_statement(self, condition, body, line):
+        return ('while', condition, body)
+
+    def function(self, return_type, name, params, body, line):
+        return ('function', return_type, name, params, body)
+
+    def return_statement(self, expression, line):
+        return ('return', expression)
+
+    def call(self, name, args, line):
+        return ('call', name, args)
+
+    def binop(self, operator, left, right, line):
+        return ('binop', operator, left, right)
+
+    def number(self, value, line):
+        return ('number', value)
+
+    def identifier(self, name, line):
+        return ('identifier', name)
+
+
+_tuples = TupleFactory()
+
+
+def _nodes(p):
+    return getattr(p.lexer, "nodes", None) or _tuples
+
+
+# --------------------------------------------------
+# 3. Grammar rules
 # --------------------------------------------------
 
 # Program start
 def p_program(p):
     """
-    program : statement_list
+    program : unit_list
     """
-    p[0] = ('program', p[1])
+    p[0] = _nodes(p).program(p[1])
+
+
+# Top-level units: statements and function definitions
+def p_unit_list(p):
+    """
+    unit_list : unit_list unit
+              | unit
+    """
+    if len(p) == 3:
+        p[0] = p[1] + [p[2]]
+    else:
+        p[0] = [p[1]]
+
+
+def p_unit(p):
+    """
+    unit : statement
+         | function_definition
+    """
+    p[0] = p[1]
 
 
 # List of statements
@@ -43,6 +115,18 @@ def p_statement(p):
     statement : declaration
               | assignment
               | if_statement
+              | while_statement
+              | return_statement
+              | call_statement
+    """
+    p[0] = p[1]
+
+
+# Type specifier
+def p_type_spec(p):
+    """
+    type_spec : INT
+              | FLOAT
     """
     p[0] = p[1]
 
@@ -50,10 +134,57 @@ def p_statement(p):
 # Variable declaration
 def p_declaration(p):
     """
-    declaration : INT IDENTIFIER SEMICOLON
-                | FLOAT IDENTIFIER SEMICOLON
+    declaration : type_spec IDENTIFIER SEMICOLON
     """
-    p[0] = ('declaration', p[1], p[2])
+    _declare(p, p[2], p[1], 2)
+    p[0] = _nodes(p).declaration(p[1], p[2], p.lineno(2))
+
+
+def _declare(p, name, datatype, index):
+    symbols = getattr(p.lexer, "symbols", None)
+    if symbols is not None:
+        symbols.declare(name, datatype, p.lineno(index))
+
+
+# Function definition
+def p_function_definition(p):
+    """
+    function_definition : type_spec IDENTIFIER LPAREN param_list RPAREN LBRACE statement_list RBRACE
+                        | type_spec IDENTIFIER LPAREN RPAREN LBRACE statement_list RBRACE
+    """
+    if len(p) == 9:
+        p[0] = _nodes(p).function(p[1], p[2], p[4], p[7], p.lineno(2))
+    else:
+        p[0] = _nodes(p).function(p[1], p[2], [], p[6], p.lineno(2))
+
+
+def p_param_list(p):
+    """
+    param_list : param_list COMMA type_spec IDENTIFIER
+               | type_spec IDENTIFIER
+    """
+    if len(p) == 5:
+        _declare(p, p[4], p[3], 4)
+        p[0] = p[1] + [(p[3], p[4])]
+    else:
+        _declare(p, p[2], p[1], 2)
+        p[0] = [(p[1], p[2])]
+
+
+# Return statement
+def p_return_statement(p):
+    """
+    return_statement : RETURN expression SEMICOLON
+    """
+    p[0] = _nodes(p).return_statement(p[2], p.lineno(1))
+
+
+# Function call used as a statement
+def p_call_statement(p):
+    """
+    call_statement : call SEMICOLON
+    """
+    p[0] = p[1]
 
 
 # Assignment
@@ -61,7 +192,7 @@ def p_assignment(p):
     """
     assignment : IDENTIFIER ASSIGN expression SEMICOLON
     """
-    p[0] = ('assign', p[1], p[3])
+    p[0] = _nodes(p).assignment(p[1], p[3], p.lineno(1))
 
 
 # If statement
@@ -69,7 +200,15 @@ def p_if_statement(p):
     """
     if_statement : IF LPAREN expression RPAREN LBRACE statement_list RBRACE
     """
-    p[0] = ('if', p[3], p[6])
+    p[0] = _nodes(p).if_statement(p[3], p[6], p.lineno(1))
+
+
+# While loop
+def p_while_statement(p):
+    """
+    while_statement : WHILE LPAREN expression RPAREN LBRACE statement_list RBRACE
+    """
+    p[0] = _nodes(p).while_statement(p[3], p[6], p.lineno(1))
 
 
 # Expression rules
@@ -86,7 +225,7 @@ def p_expression_binop(p):
                | expression EQ expression
                | expression NE expression
     """
-    p[0] = ('binop', p[2], p[1], p[3])
+    p[0] = _nodes(p).binop(p[2], p[1], p[3], p.lineno(2))
 
 
 def p_expression_group(p):
@@ -96,22 +235,51 @@ def p_expression_group(p):
     p[0] = p[2]
 
 
+def p_expression_call(p):
+    """
+    expression : call
+    """
+    p[0] = p[1]
+
+
+def p_call(p):
+    """
+    call : IDENTIFIER LPAREN arg_list RPAREN
+         | IDENTIFIER LPAREN RPAREN
+    """
+    if len(p) == 5:
+        p[0] = _nodes(p).call(p[1], p[3], p.lineno(1))
+    else:
+        p[0] = _nodes(p).call(p[1], [], p.lineno(1))
+
+
+def p_arg_list(p):
+    """
+    arg_list : arg_list COMMA expression
+             | expression
+    """
+    if len(p) == 4:
+        p[0] = p[1] + [p[3]]
+    else:
+        p[0] = [p[1]]
+
+
 def p_expression_number(p):
     """
     expression : NUMBER
     """
-    p[0] = ('number', p[1])
+    p[0] = _nodes(p).number(p[1], p.lineno(1))
 
 
 def p_expression_identifier(p):
     """
     expression : IDENTIFIER
     """
-    p[0] = ('identifier', p[1])
+    p[0] = _nodes(p).identifier(p[1], p.lineno(1))
 
 
 # --------------------------------------------------
-# 3. Error handling
+# 4. Error handling
 # --------------------------------------------------
 def p_error(p):
     if p:
@@ -121,22 +289,85 @@ def p_error(p):
 
 
 # --------------------------------------------------
-# 4. Build the parser
+# 5. Build the parser
 # --------------------------------------------------
 parser = yacc.yacc()
 
+
+def parse_with_symbols(data, parser_instance=None, lexer_instance=None):
+    """
+    Parses `data` while building its SymbolTable.
+    Returns (parse_tree, symbols).
+    """
+    lex = (lexer_instance or lexer).clone()
+    lex.lineno = 1
+    lex.symbols = SymbolTable()
+    lex.nodes = None
+
+    tree = (parser_instance or parser).parse(data, lexer=lex)
+    return tree, lex.symbols
+
+
+def parse_ast(data, interner=None, tuples=False, parser_instance=None, lexer_instance=None):
+    """
+    Parses `data` straight into AST nodes (with line numbers), skipping
+    the tuple tree and the separate build_ast pass.
+    With tuples=True the old tuple parse tree is returned instead.
+    Returns (tree, symbols); tree is None on a syntax error.
+    """
+    if tuples:
+        return parse_with_symbols(data, parser_instance, lexer_instance)
+
+    lex = (lexer_instance or lexer).clone()
+    lex.lineno = 1
+    lex.symbols = SymbolTable()
+    lex.nodes = NodeFactory(interner, lex.symbols)
+
+    tree = (parser_instance or parser).parse(data, lexer=lex)
+    return tree, lex.symbols
+
+
+def parse_tokens(stream, interner=None, budget=None, parser_instance=None, lexer_instance=None):
+    """
+    parse_ast() over an already lexed TokenStream (see token_stream.py).
+    The lexer only carries the per-parse symbols and node factory.
+    Returns (tree, symbols).
+    """
+    lex = (lexer_instance or lexer).clone()
+    lex.symbols = SymbolTable()
+    lex.nodes = NodeFactory(interner, lex.symbols)
+
+    tree = (parser_instance or parser).parse(
+        lexer=lex, tokenfunc=stream.token_func(lex, budget)
+    )
+    return tree, lex.symbols
+
 # --------------------------------------------------
-# 5. Testing the parser
+# 6. Testing the parser
 # --------------------------------------------------
 if __name__ == "__main__":
     data = """
+    int inc(int x) {
+        return x + 1;
+    }
     int a;
     a = 10;
     if (a > 5) {
         a = a + 1;
     }
+    while (a < 20) {
+        a = inc(a);
+    }
     """
 
-    result = parser.parse(data)
+    result, symbols = parse_with_symbols(data)
     print("Parse Result:")
     print(result)
+    print("Symbols:")
+    for symbol in symbols:
+        print(" ", symbol)
+
+    ast, _ = parse_ast(data)
+    print("AST (direct):")
+    for stmt in ast.statements:
+        print(f"  line {stmt.lineno}: {stmt}")
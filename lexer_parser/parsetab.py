@@ -6,9 +6,9 @@ _tabversion = '3.10'
 
 _lr_method = 'LALR'
 
-_lr_signature = 'leftPLUSMINUSleftTIMESDIVIDErightASSIGNASSIGN DIVIDE ELSE EQ FLOAT GE GT IDENTIFIER IF INT LBRACE LE LPAREN LT MINUS NE NUMBER PLUS RBRACE RETURN RPAREN SEMICOLON TIMES WHILE\n    program : statement_list\n    \n    statement_list : statement_list statement\n                   | statement\n    \n    statement : declaration\n              | assignment\n              | if_statement\n    \n    declaration : INT IDENTIFIER SEMICOLON\n                | FLOAT IDENTIFIER SEMICOLON\n    \n    assignment : IDENTIFIER ASSIGN expression SEMICOLON\n    \n    if_statement : IF LPAREN expression RPAREN LBRACE statement_list RBRACE\n    \n    expression : expression PLUS expression\n               | expression MINUS expression\n               | expression TIMES expression\n               | expression DIVIDE expression\n               | expression GT expression\n               | expression LT expression\n               | expression GE expression\n               | expression LE expression\n               | expression EQ expression\n               | expression NE expression\n    \n    expression : LPAREN expression RPAREN\n    \n    expression : NUMBER\n    \n    expression : IDENTIFIER\n    '
+_lr_signature = 'leftPLUSMINUSleftTIMESDIVIDErightASSIGNASSIGN COMMA DIVIDE ELSE EQ FLOAT GE GT IDENTIFIER IF INT LBRACE LE LPAREN LT MINUS NE NUMBER PLUS RBRACE RETURN RPAREN SEMICOLON TIMES WHILE\n    program : unit_list\n    \n    unit_list : unit_list unit\n              | unit\n    \n    unit : statement\n         | function_definition\n    \n    statement_list : statement_list statement\n                   | statement\n    \n    statement : declaration\n              | assignment\n              | if_statement\n              | while_statement\n              | return_statement\n              | call_statement\n    \n    type_spec : INT\n              | FLOAT\n    \n    declaration : type_spec IDENTIFIER SEMICOLON\n    \n    function_definition : type_spec IDENTIFIER LPAREN param_list RPAREN LBRACE statement_list RBRACE\n                        | type_spec IDENTIFIER LPAREN RPAREN LBRACE statement_list RBRACE\n    \n    param_list : param_list COMMA type_spec IDENTIFIER\n               | type_spec IDENTIFIER\n    \n    return_statement : RETURN expression SEMICOLON\n    \n    call_statement : call SEMICOLON\n    \n    assignment : IDENTIFIER ASSIGN expression SEMICOLON\n    \n    if_statement : IF LPAREN expression RPAREN LBRACE statement_list RBRACE\n    \n    while_statement : WHILE LPAREN expression RPAREN LBRACE statement_list RBRACE\n    \n    expression : expression PLUS expression\n               | expression MINUS expression\n               | expression TIMES expression\n               | expression DIVIDE expression\n               | expression GT expression\n               | expression LT expression\n               | expression GE expression\n               | expression LE expression\n               | expression EQ expression\n               | expression NE expression\n    \n    expression : LPAREN expression RPAREN\n    \n    expression : call\n    \n    call : IDENTIFIER LPAREN arg_list RPAREN\n         | IDENTIFIER LPAREN RPAREN\n    \n    arg_list : arg_list COMMA expression\n             | expression\n    \n    expression : NUMBER\n    \n    expression : IDENTIFIER\n    '
     
-_lr_action_items = {'INT':([0,2,3,4,5,6,11,16,21,23,47,48,49,],[7,7,-3,-4,-5,-6,-2,-7,-8,-9,7,7,-10,]),'FLOAT':([0,2,3,4,5,6,11,16,21,23,47,48,49,],[9,9,-3,-4,-5,-6,-2,-7,-8,-9,9,9,-10,]),'IDENTIFIER':([0,2,3,4,5,6,7,9,11,13,15,16,19,21,23,24,25,26,27,28,29,30,31,32,33,47,48,49,],[8,8,-3,-4,-5,-6,12,14,-2,17,17,-7,17,-8,-9,17,17,17,17,17,17,17,17,17,17,8,8,-10,]),'IF':([0,2,3,4,5,6,11,16,21,23,47,48,49,],[10,10,-3,-4,-5,-6,-2,-7,-8,-9,10,10,-10,]),'$end':([1,2,3,4,5,6,11,16,21,23,49,],[0,-1,-3,-4,-5,-6,-2,-7,-8,-9,-10,]),'RBRACE':([3,4,5,6,11,16,21,23,48,49,],[-3,-4,-5,-6,-2,-7,-8,-9,49,-10,]),'ASSIGN':([8,],[13,]),'LPAREN':([10,13,15,19,24,25,26,27,28,29,30,31,32,33,],[15,19,19,19,19,19,19,19,19,19,19,19,19,19,]),'SEMICOLON':([12,14,17,18,20,36,37,38,39,40,41,42,43,44,45,46,],[16,21,-23,23,-22,-11,-12,-13,-14,-15,-16,-17,-18,-19,-20,-21,]),'NUMBER':([13,15,19,24,25,26,27,28,29,30,31,32,33,],[20,20,20,20,20,20,20,20,20,20,20,20,20,]),'PLUS':([17,18,20,22,34,36,37,38,39,40,41,42,43,44,45,46,],[-23,24,-22,24,24,-11,-12,-13,-14,24,24,24,24,24,24,-21,]),'MINUS':([17,18,20,22,34,36,37,38,39,40,41,42,43,44,45,46,],[-23,25,-22,25,25,-11,-12,-13,-14,25,25,25,25,25,25,-21,]),'TIMES':([17,18,20,22,34,36,37,38,39,40,41,42,43,44,45,46,],[-23,26,-22,26,26,26,26,-13,-14,26,26,26,26,26,26,-21,]),'DIVIDE':([17,18,20,22,34,36,37,38,39,40,41,42,43,44,45,46,],[-23,27,-22,27,27,27,27,-13,-14,27,27,27,27,27,27,-21,]),'GT':([17,18,20,22,34,36,37,38,39,40,41,42,43,44,45,46,],[-23,28,-22,28,28,-11,-12,-13,-14,28,28,28,28,28,28,-21,]),'LT':([17,18,20,22,34,36,37,38,39,40,41,42,43,44,45,46,],[-23,29,-22,29,29,-11,-12,-13,-14,29,29,29,29,29,29,-21,]),'GE':([17,18,20,22,34,36,37,38,39,40,41,42,43,44,45,46,],[-23,30,-22,30,30,-11,-12,-13,-14,30,30,30,30,30,30,-21,]),'LE':([17,18,20,22,34,36,37,38,39,40,41,42,43,44,45,46,],[-23,31,-22,31,31,-11,-12,-13,-14,31,31,31,31,31,31,-21,]),'EQ':([17,18,20,22,34,36,37,38,39,40,41,42,43,44,45,46,],[-23,32,-22,32,32,-11,-12,-13,-14,32,32,32,32,32,32,-21,]),'NE':([17,18,20,22,34,36,37,38,39,40,41,42,43,44,45,46,],[-23,33,-22,33,33,-11,-12,-13,-14,33,33,33,33,33,33,-21,]),'RPAREN':([17,20,22,34,36,37,38,39,40,41,42,43,44,45,46,],[-23,-22,35,46,-11,-12,-13,-14,-15,-16,-17,-18,-19,-20,-21,]),'LBRACE':([35,],[47,]),}
+_lr_action_items = {'IDENTIFIER':([0,2,3,4,5,6,7,8,9,10,11,12,16,18,19,20,22,23,24,25,27,31,33,40,41,42,43,44,45,46,47,48,49,50,52,55,57,74,76,77,78,79,80,81,82,83,84,85,88,89,90,91,92,],[13,13,-3,-4,-5,-8,-9,-10,-11,-12,-13,21,30,-14,-15,-2,30,30,30,30,30,-22,-16,-21,30,30,30,30,30,30,30,30,30,30,71,-23,30,13,13,13,13,86,87,13,-7,13,13,13,-18,-6,-24,-25,-17,]),'IF':([0,2,3,4,5,6,7,8,9,10,11,20,31,33,40,55,74,76,77,78,81,82,83,84,85,88,89,90,91,92,],[14,14,-3,-4,-5,-8,-9,-10,-11,-12,-13,-2,-22,-16,-21,-23,14,14,14,14,14,-7,14,14,14,-18,-6,-24,-25,-17,]),'WHILE':([0,2,3,4,5,6,7,8,9,10,11,20,31,33,40,55,74,76,77,78,81,82,83,84,85,88,89,90,91,92,],[15,15,-3,-4,-5,-8,-9,-10,-11,-12,-13,-2,-22,-16,-21,-23,15,15,15,15,15,-7,15,15,15,-18,-6,-24,-25,-17,]),'RETURN':([0,2,3,4,5,6,7,8,9,10,11,20,31,33,40,55,74,76,77,78,81,82,83,84,85,88,89,90,91,92,],[16,16,-3,-4,-5,-8,-9,-10,-11,-12,-13,-2,-22,-16,-21,-23,16,16,16,16,16,-7,16,16,16,-18,-6,-24,-25,-17,]),'INT':([0,2,3,4,5,6,7,8,9,10,11,20,31,32,33,40,55,73,74,76,77,78,81,82,83,84,85,88,89,90,91,92,],[18,18,-3,-4,-5,-8,-9,-10,-11,-12,-13,-2,-22,18,-16,-21,-23,18,18,18,18,18,18,-7,18,18,18,-18,-6,-24,-25,-17,]),'FLOAT':([0,2,3,4,5,6,7,8,9,10,11,20,31,32,33,40,55,73,74,76,77,78,81,82,83,84,85,88,89,90,91,92,],[19,19,-3,-4,-5,-8,-9,-10,-11,-12,-13,-2,-22,19,-16,-21,-23,19,19,19,19,19,19,-7,19,19,19,-18,-6,-24,-25,-17,]),'$end':([1,2,3,4,5,6,7,8,9,10,11,20,31,33,40,55,88,90,91,92,],[0,-1,-3,-4,-5,-8,-9,-10,-11,-12,-13,-2,-22,-16,-21,-23,-18,-24,-25,-17,]),'RBRACE':([6,7,8,9,10,11,31,33,40,55,81,82,83,84,85,89,90,91,],[-8,-9,-10,-11,-12,-13,-22,-16,-21,-23,88,-7,90,91,92,-6,-24,-25,]),'ASSIGN':([13,],[22,]),'LPAREN':([13,14,15,16,21,22,23,24,25,27,30,41,42,43,44,45,46,47,48,49,50,57,],[23,24,25,27,32,27,27,27,27,27,23,27,27,27,27,27,27,27,27,27,27,27,]),'NUMBER':([16,22,23,24,25,27,41,42,43,44,45,46,47,48,49,50,57,],[29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,]),'SEMICOLON':([17,21,26,28,29,30,34,36,56,60,61,62,63,64,65,66,67,68,69,70,87,],[31,33,40,-37,-42,-43,55,-39,-38,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,33,]),'RPAREN':([23,28,29,30,32,35,36,37,38,39,51,53,56,60,61,62,63,64,65,66,67,68,69,70,71,75,86,],[36,-37,-42,-43,54,56,-39,-41,58,59,70,72,-38,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,-20,-40,-19,]),'PLUS':([26,28,29,30,34,36,37,38,39,51,56,60,61,62,63,64,65,66,67,68,69,70,75,],[41,-37,-42,-43,41,-39,41,41,41,41,-38,-26,-27,-28,-29,41,41,41,41,41,41,-36,41,]),'MINUS':([26,28,29,30,34,36,37,38,39,51,56,60,61,62,63,64,65,66,67,68,69,70,75,],[42,-37,-42,-43,42,-39,42,42,42,42,-38,-26,-27,-28,-29,42,42,42,42,42,42,-36,42,]),'TIMES':([26,28,29,30,34,36,37,38,39,51,56,60,61,62,63,64,65,66,67,68,69,70,75,],[43,-37,-42,-43,43,-39,43,43,43,43,-38,43,43,-28,-29,43,43,43,43,43,43,-36,43,]),'DIVIDE':([26,28,29,30,34,36,37,38,39,51,56,60,61,62,63,64,65,66,67,68,69,70,75,],[44,-37,-42,-43,44,-39,44,44,44,44,-38,44,44,-28,-29,44,44,44,44,44,44,-36,44,]),'GT':([26,28,29,30,34,36,37,38,39,51,56,60,61,62,63,64,65,66,67,68,69,70,75,],[45,-37,-42,-43,45,-39,45,45,45,45,-38,-26,-27,-28,-29,45,45,45,45,45,45,-36,45,]),'LT':([26,28,29,30,34,36,37,38,39,51,56,60,61,62,63,64,65,66,67,68,69,70,75,],[46,-37,-42,-43,46,-39,46,46,46,46,-38,-26,-27,-28,-29,46,46,46,46,46,46,-36,46,]),'GE':([26,28,29,30,34,36,37,38,39,51,56,60,61,62,63,64,65,66,67,68,69,70,75,],[47,-37,-42,-43,47,-39,47,47,47,47,-38,-26,-27,-28,-29,47,47,47,47,47,47,-36,47,]),'LE':([26,28,29,30,34,36,37,38,39,51,56,60,61,62,63,64,65,66,67,68,69,70,75,],[48,-37,-42,-43,48,-39,48,48,48,48,-38,-26,-27,-28,-29,48,48,48,48,48,48,-36,48,]),'EQ':([26,28,29,30,34,36,37,38,39,51,56,60,61,62,63,64,65,66,67,68,69,70,75,],[49,-37,-42,-43,49,-39,49,49,49,49,-38,-26,-27,-28,-29,49,49,49,49,49,49,-36,49,]),'NE':([26,28,29,30,34,36,37,38,39,51,56,60,61,62,63,64,65,66,67,68,69,70,75,],[50,-37,-42,-43,50,-39,50,50,50,50,-38,-26,-27,-28,-29,50,50,50,50,50,50,-36,50,]),'COMMA':([28,29,30,35,36,37,53,56,60,61,62,63,64,65,66,67,68,69,70,71,75,86,],[-37,-42,-43,57,-39,-41,73,-38,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,-20,-40,-19,]),'LBRACE':([54,58,59,72,],[74,76,77,78,]),}
 
 _lr_action = {}
 for _k, _v in _lr_action_items.items():
@@ -17,7 +17,7 @@ for _k, _v in _lr_action_items.items():
       _lr_action[_x][_k] = _y
 del _lr_action_items
 
-_lr_goto_items = {'program':([0,],[1,]),'statement_list':([0,47,],[2,48,]),'statement':([0,2,47,48,],[3,11,3,11,]),'declaration':([0,2,47,48,],[4,4,4,4,]),'assignment':([0,2,47,48,],[5,5,5,5,]),'if_statement':([0,2,47,48,],[6,6,6,6,]),'expression':([13,15,19,24,25,26,27,28,29,30,31,32,33,],[18,22,34,36,37,38,39,40,41,42,43,44,45,]),}
+_lr_goto_items = {'program':([0,],[1,]),'unit_list':([0,],[2,]),'unit':([0,2,],[3,20,]),'statement':([0,2,74,76,77,78,81,83,84,85,],[4,4,82,82,82,82,89,89,89,89,]),'function_definition':([0,2,],[5,5,]),'declaration':([0,2,74,76,77,78,81,83,84,85,],[6,6,6,6,6,6,6,6,6,6,]),'assignment':([0,2,74,76,77,78,81,83,84,85,],[7,7,7,7,7,7,7,7,7,7,]),'if_statement':([0,2,74,76,77,78,81,83,84,85,],[8,8,8,8,8,8,8,8,8,8,]),'while_statement':([0,2,74,76,77,78,81,83,84,85,],[9,9,9,9,9,9,9,9,9,9,]),'return_statement':([0,2,74,76,77,78,81,83,84,85,],[10,10,10,10,10,10,10,10,10,10,]),'call_statement':([0,2,74,76,77,78,81,83,84,85,],[11,11,11,11,11,11,11,11,11,11,]),'type_spec':([0,2,32,73,74,76,77,78,81,83,84,85,],[12,12,52,79,80,80,80,80,80,80,80,80,]),'call':([0,2,16,22,23,24,25,27,41,42,43,44,45,46,47,48,49,50,57,74,76,77,78,81,83,84,85,],[17,17,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,17,17,17,17,17,17,17,17,]),'expression':([16,22,23,24,25,27,41,42,43,44,45,46,47,48,49,50,57,],[26,34,37,38,39,51,60,61,62,63,64,65,66,67,68,69,75,]),'arg_list':([23,],[35,]),'param_list':([32,],[53,]),'statement_list':([74,76,77,78,],[81,83,84,85,]),}
 
 _lr_goto = {}
 for _k, _v in _lr_goto_items.items():
@@ -27,27 +27,47 @@ for _k, _v in _lr_goto_items.items():
 del _lr_goto_items
 _lr_productions = [
   ("S' -> program","S'",1,None,None,None),
-  ('program -> statement_list','program',1,'p_program','parser.py',23),
-  ('statement_list -> statement_list statement','statement_list',2,'p_statement_list','parser.py',31),
-  ('statement_list -> statement','statement_list',1,'p_statement_list','parser.py',32),
-  ('statement -> declaration','statement',1,'p_statement','parser.py',43),
-  ('statement -> assignment','statement',1,'p_statement','parser.py',44),
-  ('statement -> if_statement','statement',1,'p_statement','parser.py',45),
-  ('declaration -> INT IDENTIFIER SEMICOLON','declaration',3,'p_declaration','parser.py',53),
-  ('declaration -> FLOAT IDENTIFIER SEMICOLON','declaration',3,'p_declaration','parser.py',54),
-  ('assignment -> IDENTIFIER ASSIGN expression SEMICOLON','assignment',4,'p_assignment','parser.py',62),
-  ('if_statement -> IF LPAREN expression RPAREN LBRACE statement_list RBRACE','if_statement',7,'p_if_statement','parser.py',70),
-  ('expression -> expression PLUS expression','expression',3,'p_expression_binop','parser.py',78),
-  ('expression -> expression MINUS expression','expression',3,'p_expression_binop','parser.py',79),
-  ('expression -> expression TIMES expression','expression',3,'p_expression_binop','parser.py',80),
-  ('expression -> expression DIVIDE expression','expression',3,'p_expression_binop','parser.py',81),
-  ('expression -> expression GT expression','expression',3,'p_expression_binop','parser.py',82),
-  ('expression -> expression LT expression','expression',3,'p_expression_binop','parser.py',83),
-  ('expression -> expression GE expression','expression',3,'p_expression_binop','parser.py',84),
-  ('expression -> expression LE expression','expression',3,'p_expression_binop','parser.py',85),
-  ('expression -> expression EQ expression','expression',3,'p_expression_binop','parser.py',86),
-  ('expression -> expression NE expression','expression',3,'p_expression_binop','parser.py',87),
-  ('expression -> LPAREN expression RPAREN','expression',3,'p_expression_group','parser.py',94),
-  ('expression -> NUMBER','expression',1,'p_expression_number','parser.py',101),
-  ('expression -> IDENTIFIER','expression',1,'p_expression_identifier','parser.py',108),
+  ('program -> unit_list','program',1,'p_program','parser.py',75),
+  ('unit_list -> unit_list unit','unit_list',2,'p_unit_list','parser.py',83),
+  ('unit_list -> unit','unit_list',1,'p_unit_list','parser.py',84),
+  ('unit -> statement','unit',1,'p_unit','parser.py',94),
+  ('unit -> function_definition','unit',1,'p_unit','parser.py',95),
+  ('statement_list -> statement_list statement','statement_list',2,'p_statement_list','parser.py',103),
+  ('statement_list -> statement','statement_list',1,'p_statement_list','parser.py',104),
+  ('statement -> declaration','statement',1,'p_statement','parser.py',115),
+  ('statement -> assignment','statement',1,'p_statement','parser.py',116),
+  ('statement -> if_statement','statement',1,'p_statement','parser.py',117),
+  ('statement -> while_statement','statement',1,'p_statement','parser.py',118),
+  ('statement -> return_statement','statement',1,'p_statement','parser.py',119),
+  ('statement -> call_statement','statement',1,'p_statement','parser.py',120),
+  ('type_spec -> INT','type_spec',1,'p_type_spec','parser.py',128),
+  ('type_spec -> FLOAT','type_spec',1,'p_type_spec','parser.py',129),
+  ('declaration -> type_spec IDENTIFIER SEMICOLON','declaration',3,'p_declaration','parser.py',137),
+  ('function_definition -> type_spec IDENTIFIER LPAREN param_list RPAREN LBRACE statement_list RBRACE','function_definition',8,'p_function_definition','parser.py',152),
+  ('function_definition -> type_spec IDENTIFIER LPAREN RPAREN LBRACE statement_list RBRACE','function_definition',7,'p_function_definition','parser.py',153),
+  ('param_list -> param_list COMMA type_spec IDENTIFIER','param_list',4,'p_param_list','parser.py',163),
+  ('param_list -> type_spec IDENTIFIER','param_list',2,'p_param_list','parser.py',164),
+  ('return_statement -> RETURN expression SEMICOLON','return_statement',3,'p_return_statement','parser.py',177),
+  ('call_statement -> call SEMICOLON','call_statement',2,'p_call_statement','parser.py',185),
+  ('assignment -> IDENTIFIER ASSIGN expression SEMICOLON','assignment',4,'p_assignment','parser.py',193),
+  ('if_statement -> IF LPAREN expression RPAREN LBRACE statement_list RBRACE','if_statement',7,'p_if_statement','parser.py',201),
+  ('while_statement -> WHILE LPAREN expression RPAREN LBRACE statement_list RBRACE','while_statement',7,'p_while_statement','parser.py',209),
+  ('expression -> expression PLUS expression','expression',3,'p_expression_binop','parser.py',217),
+  ('expression -> expression MINUS expression','expression',3,'p_expression_binop','parser.py',218),
+  ('expression -> expression TIMES expression','expression',3,'p_expression_binop','parser.py',219),
+  ('expression -> expression DIVIDE expression','expression',3,'p_expression_binop','parser.py',220),
+  ('expression -> expression GT expression','expression',3,'p_expression_binop','parser.py',221),
+  ('expression -> expression LT expression','expression',3,'p_expression_binop','parser.py',222),
+  ('expression -> expression GE expression','expression',3,'p_expression_binop','parser.py',223),
+  ('expression -> expression LE expression','expression',3,'p_expression_binop','parser.py',224),
+  ('expression -> expression EQ expression','expression',3,'p_expression_binop','parser.py',225),
+  ('expression -> expression NE expression','expression',3,'p_expression_binop','parser.py',226),
+  ('expression -> LPAREN expression RPAREN','expression',3,'p_expression_group','parser.py',233),
+  ('expression -> call','expression',1,'p_expression_call','parser.py',240),
+  ('call -> IDENTIFIER LPAREN arg_list RPAREN','call',4,'p_call','parser.py',247),
+  ('call -> IDENTIFIER LPAREN RPAREN','call',3,'p_call','parser.py',248),
+  ('arg_list -> arg_list COMMA expression','arg_list',3,'p_arg_list','parser.py',258),
+  ('arg_list -> expression','arg_list',1,'p_arg_list','parser.py',259),
+  ('expression -> NUMBER','expression',1,'p_expression_number','parser.py',269),
+  ('expression -> IDENTIFIER','expression',1,'p_expression_identifier','parser.py',276),
 ]
@@ -0,0 +1,182 @@
+# token_stream.py
+# Lex-once token streams: the tokens of a source kept as a few packed
+# arrays, replayed into the parser as often as needed
+
+from array import array
+
+from lexer_parser.lexer import lexer as base_lexer, tokens as TOKEN_NAMES
+
+
+# Type code = index into TOKEN_NAMES
+TYPE_CODES = {name: code for code, name in enumerate(TOKEN_NAMES)}
+IDENTIFIER = TYPE_CODES["IDENTIFIER"]
+
+
+# --------------------------------------------------
+# Replayed token
+# --------------------------------------------------
+
+class PackedToken:
+    """
+    What the parser needs of a LexToken, without a per-token __dict__.
+    `lexer` is set by PLY on the token that caused a syntax error.
+    """
+    __slots__ = ("type", "value", "lineno", "lexpos", "lexer")
+
+    def __init__(self, type, value, lineno, lexpos):
+        self.type = type
+        self.value = value
+        self.lineno = lineno
+        self.lexpos = lexpos
+
+    def __repr__(self):
+        return f"LexToken({self.type},{self.value!r},{self.lineno},{self.lexpos})"
+
+
+# --------------------------------------------------
+# Token Stream
+# --------------------------------------------------
+
+class TokenStream:
+    """
+    Struct-of-arrays storage for one lexed source:
+
+    - types:     token type codes (see TYPE_CODES)
+    - values:    index into `constants`, the distinct token values
+                 (identifier names, operators, numbers) stored once
+    - lines:     line numbers
+    - columns:   1-based columns
+    - offsets:   character offsets (LexToken.lexpos)
+
+    The source is lexed once by lex(); token_func() then feeds the
+    parser from the arrays, as often as needed, without lexing again.
+    Illegal characters are reported when the stream is lexed, not on
+    each replay.
+    """
+
+    def __init__(self):
+        self.types = array("B")
+        self.values = array("I")
+        self.lines = array("I")
+        self.columns = array("I")
+        self.offsets = array("I")
+
+        self.constants = []
+        self._constant_ids = {}
+
+    @classmethod
+    def lex(cls, data, lineno=1, lexer_instance=None):
+        stream = cls()
+
+        lex = (lexer_instance or base_lexer).clone()
+        lex.lineno = lineno
+        lex.symbols = None
+        lex.nodes = None
+        lex.input(data)
+
+        line, line_start = None, 0
+        for tok in iter(lex.token, None):
+            if tok.lineno != line:
+                line = tok.lineno
+                line_start = data.rfind("\n", 0, tok.lexpos) + 1
+            stream.append(tok.type, tok.value, line, tok.lexpos - line_start + 1, tok.lexpos)
+
+        return stream
+
+    def append(self, type, value, line, column, offset):
+        key = (value.__class__, value)
+        index = self._constant_ids.get(key)
+        if index is None:
+            index = self._constant_ids[key] = len(self.constants)
+            self.constants.append(value)
+
+        self.types.append(TYPE_CODES[type])
+        self.values.append(index)
+        self.lines.append(line)
+        self.columns.append(column)
+        self.offsets.append(offset)
+
+    # --------------------------------------------------
+    # Access
+    # --------------------------------------------------
+    def __len__(self):
+        return len(self.types)
+
+    def type(self, i):
+        return TOKEN_NAMES[self.types[i]]
+
+    def value(self, i):
+        return self.constants[self.values[i]]
+
+    def token(self, i):
+        return PackedToken(self.type(i), self.value(i), self.lines[i], self.offsets[i])
+
+    def __iter__(self):
+        return map(self.token, range(len(self)))
+
+    @property
+    def nbytes(self):
+        """
+        Bytes held by the arrays (the constants are shared strings/ints).
+        """
+        return sum(
+            column.itemsize * len(column)
+            for column in (self.types, self.values, self.lines, self.columns, self.offsets)
+        )
+
+    # --------------------------------------------------
+    # Parser adapter
+    # --------------------------------------------------
+    def token_func(self, lexer=None, budget=None):
+        """
+        Returns a tokenfunc for parser.parse(None, lexer=..., tokenfunc=...).
+        Identifiers are interned into lexer.symbols in stream order, so
+        symbol IDs come out as if the parser had lexed the source itself.
+        With an AnalysisBudget every replayed token is counted.
+        """
+        return self._replay(getattr(lexer, "symbols", None), budget).__next__
+
+    def _replay(self, symbols, budget):
+        names = TOKEN_NAMES
+        constants = self.constants
+        intern = symbols.intern if symbols is not None else None
+        count = budget.count_token if budget is not None else None
+
+        # The AST keeps each token's line number; like the PLY lexer,
+        # hand out one int object per line rather than one per token
+        lineno = None
+
+        for code, value, line, offset in zip(self.types, self.values, self.lines, self.offsets):
+            if count is not None:
+                count()
+
+            if line != lineno:
+                lineno = line
+
+            value = constants[value]
+            if code == IDENTIFIER and intern is not None:
+                intern(value)
+
+            yield PackedToken(names[code], value, lineno, offset)
+
+        # PLY may ask again after the end of input
+        while True:
+            yield None
+
+
+# --------------------------------------------------
+# Testing the token stream
+# --------------------------------------------------
+if __name__ == "__main__":
+    data = """
+    int a = 10;
+    if (a > 5) {
+        a = a + 1;
+    }
+    """
+
+    stream = TokenStream.lex(data)
+    print(f"{len(stream)} tokens, {stream.nbytes} bytes, "
+          f"{len(stream.constants)} distinct values")
+    for i in range(len(stream)):
+        print(f"  {stream.lines[i]}:{stream.columns[i]} {stream.type(i)} {stream.value(i)!r}")
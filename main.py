@@ -0,0 +1,172 @@
+# main.py
+# CLI entry point: single-file pipeline, directory scans and watch mode
+
+import argparse
+import sys
+
+from pipeline.analyze import analyze_source
+from pipeline.predictor import Predictor
+
+
+# --------------------------------------------------
+# Commands
+# --------------------------------------------------
+
+def cmd_analyze(args):
+    with open(args.file, encoding="utf-8") as f:
+        code = f.read()
+
+    budget = budget_from_args(args)
+    rules = rules_from_args(args)
+    features = analyze_source(code, args.parse_workers, budget, rules)
+    # Partial features of a truncated run are not scored
+    if budget is not None and budget.exceeded:
+        print("Prediction: none")
+        print(f"⚠️  Analysis truncated: {budget.exceeded}")
+    else:
+        predictor = Predictor(args.model)
+        prediction = predictor.predict(features)
+
+        print(f"Prediction: {'BUGGY' if prediction else 'CLEAN'}")
+        if args.explain:
+            explanation = predictor.explain(features, top=5)
+            print(f"P(BUGGY) = {explanation['probability']:.2f} "
+                  f"(base rate {explanation['bias']:.2f}); largest contributions:")
+            for name, value in explanation["contributions"].items():
+                print(f"  {name}: {value:+.3f}")
+    print()
+    print("Features:")
+    for key, value in features.items():
+        print(f"{key}: {value}")
+
+    if args.rule_times:
+        print()
+        print("Time per rule:")
+        print(rules.timing_report())
+
+
+def cmd_scan(args):
+    from features.feature_store import FeatureStore
+    from pipeline.directory_scan import scan_directory
+
+    store = FeatureStore(args.db)
+    counts = scan_directory(args.directory, store, Predictor(args.model), args.workers,
+                            budget=budget_from_args(args))
+
+    print(f"✅ Analyzed {counts['analyzed']} files "
+          f"({counts['unchanged']} unchanged, {counts['removed']} removed)")
+    print(f"📊 Store: {store.summary()}")
+    store.close()
+
+
+def cmd_watch(args):
+    from features.feature_store import FeatureStore
+    from pipeline.directory_scan import watch_directory
+
+    store = FeatureStore(args.db)
+
+    def report(counts):
+        print(f"🔄 {counts['analyzed']} updated, {counts['removed']} removed — {store.summary()}")
+
+    print(f"👀 Watching {args.directory} (Ctrl+C to stop)")
+    try:
+        watch_directory(args.directory, store, Predictor(args.model),
+                        args.workers, args.interval, on_update=report,
+                        budget=budget_from_args(args))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        store.close()
+
+
+# --------------------------------------------------
+# Argument parsing
+# --------------------------------------------------
+
+BUDGET_OPTIONS = (
+    ("--max-tokens", int, "stop after this many tokens"),
+    ("--max-ast-depth", int, "reject ASTs nested deeper than this"),
+    ("--max-cfg-nodes", int, "stop after building this many CFG nodes"),
+    ("--max-solver-iterations", int, "stop data-flow solvers after this many node visits"),
+    ("--deadline", float, "per-file wall-clock limit in seconds"),
+)
+
+
+def add_budget_arguments(cmd):
+    for flag, kind, text in BUDGET_OPTIONS:
+        cmd.add_argument(flag, type=kind, default=None, help=text)
+
+
+def budget_from_args(args):
+    """
+    AnalysisBudget from the command line, or None when no limit is set.
+    """
+    from pipeline.budget import AnalysisBudget
+
+    limits = {
+        flag[2:].replace("-", "_"): getattr(args, flag[2:].replace("-", "_"))
+        for flag, _, _ in BUDGET_OPTIONS
+    }
+    if all(value is None for value in limits.values()):
+        return None
+    return AnalysisBudget(**limits)
+
+
+def rules_from_args(args):
+    from rules.rule_engine import RuleEngine
+
+    enabled = args.rules.split(",") if args.rules else None
+    disabled = args.disable_rules.split(",") if args.disable_rules else None
+    return RuleEngine(enabled, disabled)
+
+
+def build_arg_parser():
+    arg_parser = argparse.ArgumentParser(description="AI-Powered Static Code Analyzer for Mini-C")
+    arg_parser.add_argument("--model", help="joblib model file (default: rule-based labels)")
+    sub = arg_parser.add_subparsers(dest="command")
+
+    analyze = sub.add_parser("analyze", help="analyze a single file")
+    analyze.add_argument("file")
+    analyze.add_argument("--parse-workers", type=int, default=None,
+                         help="parse large files in chunks across this many processes")
+    analyze.add_argument("--rules", default=None,
+                         help="comma-separated rules to run (default: all)")
+    analyze.add_argument("--disable-rules", default=None,
+                         help="comma-separated rules to skip")
+    analyze.add_argument("--rule-times", action="store_true",
+                         help="print the time spent in each rule")
+    analyze.add_argument("--explain", action="store_true",
+                         help="show per-feature contributions (Random Forest --model)")
+    add_budget_arguments(analyze)
+    analyze.set_defaults(func=cmd_analyze)
+
+    for name, func, text in (
+        ("scan", cmd_scan, "analyze a source tree into the feature store"),
+        ("watch", cmd_watch, "keep the feature store updated as files change"),
+    ):
+        cmd = sub.add_parser(name, help=text)
+        cmd.add_argument("directory")
+        cmd.add_argument("--db", default="features.db", help="SQLite feature store path")
+        cmd.add_argument("--workers", type=int, default=None, help="parallel worker processes")
+        add_budget_arguments(cmd)
+        cmd.set_defaults(func=func)
+        if name == "watch":
+            cmd.add_argument("--interval", type=float, default=2.0, help="poll interval in seconds")
+
+    return arg_parser
+
+
+def main(argv=None):
+    arg_parser = build_arg_parser()
+    args = arg_parser.parse_args(argv)
+
+    if args.command is None:
+        arg_parser.print_help()
+        return 1
+
+    args.func(args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+# feature_matrix.py
+# Converts the dataset CSV once into memory-mappable .npy arrays
+
+import csv
+import json
+import os
+
+import numpy as np
+
+
+NON_FEATURE_COLUMNS = ("label", "feature_schema", "code", "program")
+CHUNK_ROWS = 65536
+
+# Bumped whenever the cache layout or its conversion changes, so caches
+# built by an older version are rebuilt (v2: rows counted as CSV
+# records, v3: feature schema recorded)
+FORMAT_VERSION = 3
+
+
+# --------------------------------------------------
+# Cache paths
+# --------------------------------------------------
+
+def cache_paths(csv_path):
+    base = os.path.splitext(csv_path)[0]
+    return {
+        "X": base + ".X.npy",
+        "y": base + ".y.npy",
+        "meta": base + ".meta.json"
+    }
+
+
+def _source_signature(csv_path):
+    st = os.stat(csv_path)
+    return {"size": st.st_size, "mtime": st.st_mtime}
+
+
+# --------------------------------------------------
+# Build / load
+# --------------------------------------------------
+
+def build_feature_matrix(csv_path):
+    """
+    Streams the CSV into float64 X and int8 y arrays on disk.
+    Rows are written directly into an on-disk array, so the CSV is
+    never held in memory as Python objects.
+    """
+    paths = cache_paths(csv_path)
+
+    # Counted as CSV records: a "code" column spans several lines
+    with open(csv_path, newline="") as f:
+        rows = sum(1 for _ in csv.reader(f)) - 1
+
+    with open(csv_path, newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader)
+
+        columns = [c for c in header if c not in NON_FEATURE_COLUMNS]
+        feature_idx = [header.index(c) for c in columns]
+        label_idx = header.index("label")
+        schema_idx = header.index("feature_schema") if "feature_schema" in header else None
+        schemas = set()
+
+        X = np.lib.format.open_memmap(paths["X"], mode="w+", dtype=np.float64,
+                                      shape=(rows, len(columns)))
+        y = np.lib.format.open_memmap(paths["y"], mode="w+", dtype=np.int8,
+                                      shape=(rows,))
+
+        start = 0
+        chunk_X, chunk_y = [], []
+
+        for row in reader:
+            chunk_X.append([row[j] for j in feature_idx])
+            chunk_y.append(row[label_idx])
+            if schema_idx is not None:
+                schemas.add(row[schema_idx])
+
+            if len(chunk_X) == CHUNK_ROWS:
+                X[start:start + CHUNK_ROWS] = np.asarray(chunk_X, dtype=np.float64)
+                y[start:start + CHUNK_ROWS] = np.asarray(chunk_y, dtype=np.int8)
+                start += CHUNK_ROWS
+                chunk_X, chunk_y = [], []
+
+        if chunk_X:
+            X[start:start + len(chunk_X)] = np.asarray(chunk_X, dtype=np.float64)
+            y[start:start + len(chunk_y)] = np.asarray(chunk_y, dtype=np.int8)
+
+        X.flush()
+        y.flush()
+        del X, y
+
+    if len(schemas) > 1:
+        raise Exception(f"{csv_path} mixes feature schemas {sorted(schemas)}")
+
+    meta = {
+        "version": FORMAT_VERSION,
+        # None: written before datasets recorded their schema
+        "feature_schema": int(schemas.pop()) if schemas else None,
+        "columns": columns,
+        "rows": rows,
+        "source": _source_signature(csv_path)
+    }
+    with open(paths["meta"], "w") as f:
+        json.dump(meta, f)
+
+    return paths
+
+
+def load_feature_matrix(csv_path, rebuild=False):
+    """
+    Returns (X, y, columns) as read-only memory maps, rebuilding the
+    cache only when the CSV changed since it was last converted or the
+    cache was written by another FORMAT_VERSION.
+    """
+    paths = cache_paths(csv_path)
+
+    stale = rebuild or not all(os.path.exists(p) for p in paths.values())
+    if not stale:
+        with open(paths["meta"]) as f:
+            meta = json.load(f)
+        stale = (
+            meta.get("version") != FORMAT_VERSION
+            or meta.get("source") != _source_signature(csv_path)
+        )
+
+    if stale:
+        build_feature_matrix(csv_path)
+
+    with open(paths["meta"]) as f:
+        meta = json.load(f)
+
+    X = np.load(paths["X"], mmap_mode="r")
+    y = np.load(paths["y"], mmap_mode="r")
+    return X, y, meta["columns"]
+
+
+def feature_schema(csv_path):
+    """
+    FEATURE_SCHEMA_VERSION the dataset was generated with (None for a
+    dataset that does not record it), from the cache's metadata.
+    """
+    load_feature_matrix(csv_path)
+    with open(cache_paths(csv_path)["meta"]) as f:
+        return json.load(f)["feature_schema"]
+
+
+# --------------------------------------------------
+# Run
+# --------------------------------------------------
+if __name__ == "__main__":
+    X, y, columns = load_feature_matrix("dataset/large_static_dataset.csv")
+    print(f"✅ Feature matrix: {X.shape[0]} rows × {X.shape[1]} features")
+    print(f"Columns: {columns}")
+    print(f"Feature schema: {feature_schema('dataset/large_static_dataset.csv')}")
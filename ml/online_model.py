@@ -0,0 +1,183 @@
+# online_model.py
+# Incremental model updates from new feature rows, with a versioned
+# model registry that running predictors hot-swap from
+
+import csv
+import os
+import re
+
+import joblib
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import SGDClassifier
+
+from features.feature_extractor import FEATURE_NAMES, FEATURE_SCHEMA_VERSION
+
+
+CLASSES = np.array([0, 1])
+
+# The estimator each OnlineTrainer kind updates
+MODEL_TYPES = {"forest": RandomForestClassifier, "linear": SGDClassifier}
+
+
+# --------------------------------------------------
+# Model Registry
+# --------------------------------------------------
+
+class ModelRegistry:
+    """
+    Stores models as model_v<N>.joblib in one directory. The CURRENT
+    file names the active version and is replaced atomically, so
+    readers never see a half-written model.
+    """
+
+    def __init__(self, directory="ml/models/online"):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, version):
+        return os.path.join(self.directory, f"model_v{version}.joblib")
+
+    def versions(self):
+        found = []
+        for name in os.listdir(self.directory):
+            match = re.fullmatch(r"model_v(\d+)\.joblib", name)
+            if match:
+                found.append(int(match.group(1)))
+        return sorted(found)
+
+    def current_version(self):
+        try:
+            with open(os.path.join(self.directory, "CURRENT")) as f:
+                return int(f.read().strip())
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def publish(self, model):
+        existing = self.versions()
+        version = existing[-1] + 1 if existing else 1
+
+        tmp = self.path(version) + ".tmp"
+        joblib.dump(model, tmp)
+        os.replace(tmp, self.path(version))
+
+        pointer = os.path.join(self.directory, "CURRENT")
+        with open(pointer + ".tmp", "w") as f:
+            f.write(str(version))
+        os.replace(pointer + ".tmp", pointer)
+
+        return version
+
+    def load(self, version=None):
+        version = version if version is not None else self.current_version()
+        if version is None:
+            return None
+        return joblib.load(self.path(version))
+
+
+# --------------------------------------------------
+# Online Trainer
+# --------------------------------------------------
+
+class OnlineTrainer:
+    """
+    kind="forest": warm-started Random Forest; each batch adds
+                   `trees_per_batch` trees fitted on that batch only
+    kind="linear": SGD logistic regression updated with partial_fit
+
+    Either way the cost of an update depends on the batch size, not on
+    the size of the corpus seen so far.
+    """
+
+    def __init__(self, registry, kind="forest", trees_per_batch=10):
+        if kind not in MODEL_TYPES:
+            raise Exception(f"Unknown online model kind: {kind}")
+
+        self.registry = registry
+        self.kind = kind
+        self.trees_per_batch = trees_per_batch
+
+        self.model = registry.load()
+        self.columns = list(FEATURE_NAMES)
+
+        schema = getattr(self.model, "feature_schema", None)
+        if self.model is not None and schema != FEATURE_SCHEMA_VERSION:
+            raise Exception(
+                f"Registry model uses feature schema {schema}, the analyzer produces "
+                f"{FEATURE_SCHEMA_VERSION}; start a new registry"
+            )
+
+        if self.model is not None and not isinstance(self.model, MODEL_TYPES[kind]):
+            raise ValueError(
+                f"Registry model is a {type(self.model).__name__}, not an online "
+                f"{kind!r} model; use kind={self._kind_of(self.model)!r} or a new registry"
+            )
+
+    @staticmethod
+    def _kind_of(model):
+        for kind, model_type in MODEL_TYPES.items():
+            if isinstance(model, model_type):
+                return kind
+        return None
+
+    def _new_model(self):
+        if self.kind == "forest":
+            return RandomForestClassifier(n_estimators=0, warm_start=True, random_state=42)
+        return SGDClassifier(loss="log_loss", random_state=42)
+
+    # --------------------------------------------------
+    # Updates
+    # --------------------------------------------------
+    def update(self, rows):
+        """
+        rows: list of feature dictionaries, each with a "label" key
+        (and a "feature_schema" key when read from a dataset CSV).
+        Publishes and returns the new model version.
+        """
+        if not rows:
+            return self.registry.current_version()
+
+        schemas = {int(r.get("feature_schema", FEATURE_SCHEMA_VERSION)) for r in rows}
+        if schemas != {FEATURE_SCHEMA_VERSION}:
+            raise Exception(f"Rows have feature schema {sorted(schemas)}, "
+                            f"expected {FEATURE_SCHEMA_VERSION}")
+
+        X = np.array([[float(r[c]) for c in self.columns] for r in rows])
+        y = np.array([int(r["label"]) for r in rows])
+
+        if self.model is None:
+            self.model = self._new_model()
+
+        if self.kind == "forest":
+            # A forest needs both classes in every batch to grow new trees
+            if len(np.unique(y)) < len(CLASSES):
+                raise Exception("Forest updates need both labels in the batch")
+            self.model.n_estimators += self.trees_per_batch
+            self.model.fit(X, y)
+        else:
+            self.model.partial_fit(X, y, classes=CLASSES)
+
+        self.model.feature_columns = list(self.columns)
+        self.model.feature_schema = FEATURE_SCHEMA_VERSION
+        return self.registry.publish(self.model)
+
+    def update_from_csv(self, csv_path):
+        with open(csv_path, newline="") as f:
+            return self.update(list(csv.DictReader(f)))
+
+
+# --------------------------------------------------
+# Run
+# --------------------------------------------------
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 2:
+        print("Usage: python -m ml.online_model <new_rows.csv> [forest|linear]")
+        sys.exit(1)
+
+    kind = sys.argv[2] if len(sys.argv) > 2 else "forest"
+    trainer = OnlineTrainer(ModelRegistry(), kind=kind)
+    version = trainer.update_from_csv(sys.argv[1])
+
+    print(f"✅ Published model version {version}")
@@ -0,0 +1,155 @@
+# parallel_train.py
+# Trains and cross-validates Logistic Regression, SVM and Random Forest
+# in parallel over a shared, memory-mapped feature matrix
+
+import os
+import time
+
+import joblib
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
+from sklearn.model_selection import StratifiedKFold
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+from sklearn.svm import SVC
+
+from features.feature_extractor import FEATURE_SCHEMA_VERSION
+from ml.feature_matrix import load_feature_matrix, cache_paths, feature_schema
+
+
+# --------------------------------------------------
+# Model families
+# --------------------------------------------------
+
+def make_model(name):
+    if name == "logistic_regression":
+        return make_pipeline(StandardScaler(), LogisticRegression(max_iter=1000))
+    elif name == "svm":
+        return make_pipeline(StandardScaler(), SVC())
+    elif name == "random_forest":
+        # n_jobs=1: parallelism comes from running folds / models side by side
+        return RandomForestClassifier(n_estimators=100, n_jobs=1, random_state=42)
+    else:
+        raise Exception(f"Unknown model: {name}")
+
+
+MODEL_NAMES = ("logistic_regression", "svm", "random_forest")
+
+
+# --------------------------------------------------
+# Worker tasks
+# --------------------------------------------------
+# Workers re-open the .npy files with mmap_mode="r", so every process
+# maps the same pages instead of receiving a pickled copy of the matrix.
+
+def _open(csv_path):
+    paths = cache_paths(csv_path)
+    return np.load(paths["X"], mmap_mode="r"), np.load(paths["y"], mmap_mode="r")
+
+
+def _evaluate_fold(csv_path, name, fold, train_idx, test_idx):
+    X, y = _open(csv_path)
+
+    start = time.perf_counter()
+    model = make_model(name).fit(X[train_idx], y[train_idx])
+    pred = model.predict(X[test_idx])
+
+    return {
+        "model": name,
+        "fold": fold,
+        "accuracy": accuracy_score(y[test_idx], pred),
+        "precision": precision_score(y[test_idx], pred, zero_division=0),
+        "recall": recall_score(y[test_idx], pred, zero_division=0),
+        "f1": f1_score(y[test_idx], pred, zero_division=0),
+        "seconds": time.perf_counter() - start
+    }
+
+
+def _fit_final(csv_path, name, columns, rows=None):
+    X, y = _open(csv_path)
+
+    if rows is not None:
+        X, y = X[rows], y[rows]
+    model = make_model(name).fit(X, y)
+    model.feature_columns = list(columns)   # read by pipeline.predictor
+    model.feature_schema = FEATURE_SCHEMA_VERSION
+    return name, model
+
+
+# --------------------------------------------------
+# Training pipeline
+# --------------------------------------------------
+
+def train_all(csv_path="dataset/large_static_dataset.csv", folds=5,
+              n_jobs=-1, output_dir="ml/models", models=MODEL_NAMES, keep=None):
+    """
+    Runs every (model, fold) pair as one parallel task, then fits the
+    final models on the full matrix in parallel and saves them.
+    Returns {model: mean metrics}.
+
+    `keep` restricts training to those row indices (e.g. one sample per
+    near-duplicate cluster, see dataset.near_duplicates). Folds are
+    split over all rows and still tested on all of them, so metrics
+    stay comparable with an unpruned run.
+    """
+    X, y, columns = load_feature_matrix(csv_path)
+
+    schema = feature_schema(csv_path)
+    if schema != FEATURE_SCHEMA_VERSION:
+        raise Exception(
+            f"{csv_path} has feature schema {schema}, the analyzer produces "
+            f"{FEATURE_SCHEMA_VERSION}; regenerate it with python -m dataset.auto_dataset_generator"
+        )
+
+    splitter = StratifiedKFold(n_splits=folds, shuffle=True, random_state=42)
+    splits = list(splitter.split(np.zeros(len(y)), y))
+
+    if keep is not None:
+        splits = [(np.intersect1d(train_idx, keep), test_idx) for train_idx, test_idx in splits]
+
+    start = time.perf_counter()
+
+    with Parallel(n_jobs=n_jobs) as parallel:
+        fold_results = parallel(
+            delayed(_evaluate_fold)(csv_path, name, fold, train_idx, test_idx)
+            for name in models
+            for fold, (train_idx, test_idx) in enumerate(splits)
+        )
+        final_models = parallel(
+            delayed(_fit_final)(csv_path, name, columns, keep) for name in models
+        )
+
+    elapsed = time.perf_counter() - start
+
+    os.makedirs(output_dir, exist_ok=True)
+    for name, model in final_models:
+        joblib.dump(model, os.path.join(output_dir, f"{name}.joblib"))
+
+    summary = {}
+    for name in models:
+        rows = [r for r in fold_results if r["model"] == name]
+        summary[name] = {
+            metric: float(np.mean([r[metric] for r in rows]))
+            for metric in ("accuracy", "precision", "recall", "f1", "seconds")
+        }
+
+    summary["_wall_seconds"] = elapsed
+    return summary
+
+
+# --------------------------------------------------
+# Run
+# --------------------------------------------------
+if __name__ == "__main__":
+    results = train_all()
+    wall = results.pop("_wall_seconds")
+
+    for name, metrics in results.items():
+        print(f"{name}:")
+        for metric, value in metrics.items():
+            print(f"  {metric}: {value:.4f}")
+
+    print(f"⏱ Total wall time: {wall:.2f}s")
@@ -0,0 +1,306 @@
+# shared_model.py
+# Random Forest node arrays in memory-mapped .npy files, so every worker
+# process predicts from the same read-only pages instead of its own copy
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import joblib
+import numpy as np
+
+
+# Written next to the arrays; its presence marks an exported directory
+META_FILE = "forest.json"
+FORMAT_VERSION = 1
+
+ARRAYS = ("left", "right", "feature", "threshold", "missing_left", "value", "roots")
+
+
+def model_columns(model):
+    """
+    Feature column names a fitted model expects, or None: the
+    feature_columns our trainers set, else scikit-learn's
+    feature_names_in_ (a numpy array, only set when fitted on a
+    DataFrame).
+    """
+    columns = getattr(model, "feature_columns", None)
+    if columns is None or len(columns) == 0:
+        columns = getattr(model, "feature_names_in_", None)
+    if columns is None or len(columns) == 0:
+        return None
+    return [str(name) for name in columns]
+
+
+# --------------------------------------------------
+# Export
+# --------------------------------------------------
+# joblib.load(mmap_mode="r") maps plain numpy arrays, but a fitted tree
+# copies its nodes into its own buffer when unpickled, so each process
+# would still hold the whole forest. Instead all trees are flattened
+# into a few arrays, and prediction walks those arrays directly.
+
+def flatten_forest(model):
+    """
+    Returns (arrays, meta) for a fitted RandomForestClassifier (single
+    output). Child indices are global across trees, and leaves point to
+    themselves, so a walk can simply run for max_depth steps.
+    """
+    estimators = getattr(model, "estimators_", None)
+    if estimators is None or getattr(model, "n_outputs_", 1) != 1:
+        raise Exception("Only fitted single-output forests can be shared")
+
+    left, right, feature, threshold, missing_left, value, roots = [], [], [], [], [], [], []
+    offset = 0
+    max_depth = 0
+
+    for estimator in estimators:
+        tree = estimator.tree_
+        nodes = np.arange(offset, offset + tree.node_count)
+        leaf = tree.children_left == -1
+
+        roots.append(offset)
+        left.append(np.where(leaf, nodes, tree.children_left + offset))
+        right.append(np.where(leaf, nodes, tree.children_right + offset))
+        feature.append(np.where(leaf, 0, tree.feature))
+        threshold.append(np.where(leaf, np.inf, tree.threshold))
+        missing_left.append(tree.missing_go_to_left.astype(bool))
+
+        # Per-node class fractions, as DecisionTreeClassifier.predict_proba
+        counts = tree.value[:, 0, :]
+        value.append(counts / counts.sum(axis=1, keepdims=True))
+
+        offset += tree.node_count
+        max_depth = max(max_depth, tree.max_depth)
+
+    arrays = {
+        "left": np.concatenate(left).astype(np.int32),
+        "right": np.concatenate(right).astype(np.int32),
+        "feature": np.concatenate(feature).astype(np.int32),
+        "threshold": np.concatenate(threshold).astype(np.float64),
+        "missing_left": np.concatenate(missing_left),
+        "value": np.concatenate(value).astype(np.float64),
+        "roots": np.asarray(roots, dtype=np.int32),
+    }
+
+    meta = {
+        "version": FORMAT_VERSION,
+        "max_depth": max_depth,
+        "n_features": int(model.n_features_in_),
+        "classes": model.classes_.tolist(),
+        "feature_columns": model_columns(model) or [],
+        "feature_schema": getattr(model, "feature_schema", None),
+    }
+    return arrays, meta
+
+
+def export_forest(model, directory):
+    """
+    Writes a fitted RandomForestClassifier as flat node arrays (see
+    flatten_forest) for SharedForest.load().
+    """
+    arrays, meta = flatten_forest(model)
+
+    os.makedirs(directory, exist_ok=True)
+    for name in ARRAYS:
+        np.save(os.path.join(directory, f"{name}.npy"), arrays[name])
+
+    with open(os.path.join(directory, META_FILE), "w") as f:
+        json.dump(meta, f)
+
+    return directory
+
+
+def is_shared_forest(path):
+    return os.path.isdir(path) and os.path.exists(os.path.join(path, META_FILE))
+
+
+# --------------------------------------------------
+# Shared Forest
+# --------------------------------------------------
+
+class SharedForest:
+    """
+    Read-only forest over flat node arrays: memory-mapped when opened
+    with load(), in memory with from_model(). predict() and
+    predict_proba() match the original RandomForestClassifier.
+    """
+
+    def __init__(self, arrays, meta, directory=None):
+        if meta["version"] != FORMAT_VERSION:
+            raise Exception(f"Unsupported shared forest version: {meta['version']}")
+
+        self.directory = directory
+        self.max_depth = meta["max_depth"]
+        self.n_features_in_ = meta["n_features"]
+        self.classes_ = np.asarray(meta["classes"])
+        self.feature_columns = meta["feature_columns"]
+        self.feature_schema = meta.get("feature_schema")
+
+        for name in ARRAYS:
+            setattr(self, name, arrays[name])
+
+    @classmethod
+    def load(cls, directory):
+        with open(os.path.join(directory, META_FILE)) as f:
+            meta = json.load(f)
+
+        arrays = {
+            name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r")
+            for name in ARRAYS
+        }
+        return cls(arrays, meta, directory)
+
+    @classmethod
+    def from_model(cls, model):
+        arrays, meta = flatten_forest(model)
+        return cls(arrays, meta)
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    def apply(self, X):
+        """
+        Leaf index reached in each tree: shape (n_trees, n_samples).
+        """
+        # Trees compare float32 features, as scikit-learn does
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise Exception(f"Expected {self.n_features_in_} features per row")
+
+        rows = np.arange(X.shape[0])
+        nodes = np.repeat(np.asarray(self.roots)[:, None], X.shape[0], axis=1)
+
+        for _ in range(self.max_depth):
+            x = X[rows, self.feature[nodes]]
+            go_left = (x <= self.threshold[nodes]) | (np.isnan(x) & self.missing_left[nodes])
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+
+        return nodes
+
+    def predict_proba(self, X):
+        leaves = self.apply(X)
+
+        # Summed tree by tree, in the forest's own order
+        proba = np.zeros((leaves.shape[1], len(self.classes_)))
+        for tree_leaves in leaves:
+            proba += self.value[tree_leaves]
+        return proba / len(leaves)
+
+    def predict(self, X):
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1))
+
+
+def load_model(path):
+    """
+    SharedForest for an exported directory; otherwise the joblib file,
+    with its plain numpy arrays memory-mapped rather than copied.
+    """
+    if is_shared_forest(path):
+        return SharedForest.load(path)
+    return joblib.load(path, mmap_mode="r")
+
+
+# --------------------------------------------------
+# Per-worker memory
+# --------------------------------------------------
+
+def memory_usage():
+    """
+    This process's memory in KB. "pss" splits shared pages between the
+    processes mapping them, so it drops as more workers share a model.
+    """
+    usage = {}
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) == 3 and parts[2] == "kB":
+                    usage[parts[0].rstrip(":")] = int(parts[1])
+    except OSError:
+        import resource
+
+        usage["Rss"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    return {
+        "rss": usage.get("Rss", 0),
+        "pss": usage.get("Pss", 0),
+        "shared": usage.get("Shared_Clean", 0) + usage.get("Shared_Dirty", 0),
+        "private": usage.get("Private_Clean", 0) + usage.get("Private_Dirty", 0),
+    }
+
+
+_worker = {}
+
+
+def _init_worker(path, shared, barrier):
+    # Imported in both modes, so the report compares the forests alone
+    # and not scikit-learn's own footprint
+    import sklearn.ensemble  # noqa: F401
+
+    _worker["model"] = SharedForest.load(path) if shared else joblib.load(path)
+    _worker["barrier"] = barrier
+
+
+def _worker_report(rows):
+    model = _worker["model"]
+    model.predict(rows)
+
+    # Every worker takes exactly one job and measures while all of them
+    # hold the model
+    _worker["barrier"].wait()
+    report = memory_usage()
+    report["pid"] = os.getpid()
+    _worker["barrier"].wait()
+    return report
+
+
+def worker_memory_report(path, rows, workers=4):
+    """
+    Starts `workers` processes that each load the model at `path` (a
+    SharedForest directory or a joblib file) and predict `rows`.
+    Returns one memory_usage() dict per worker.
+    """
+    import multiprocessing
+
+    # Spawned rather than forked: a forked worker inherits the parent's
+    # heap, and whatever it allocates (unpickling a model, say) runs the
+    # garbage collector over those objects and copies their pages,
+    # which would be counted against the model
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(workers)
+    shared = is_shared_forest(path)
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker,
+                             initargs=(path, shared, barrier)) as pool:
+        return list(pool.map(_worker_report, [rows] * workers))
+
+
+# --------------------------------------------------
+# Testing the shared forest
+# --------------------------------------------------
+if __name__ == "__main__":
+    import sys
+    import tempfile
+
+    from ml.feature_matrix import load_feature_matrix
+
+    model_path = sys.argv[1] if len(sys.argv) > 1 else "ml/models/random_forest.joblib"
+    model = joblib.load(model_path)
+
+    X, _, columns = load_feature_matrix("dataset/large_static_dataset.csv")
+    X = np.asarray(X[:, [columns.index(c) for c in model.feature_columns]])
+
+    output = sys.argv[2] if len(sys.argv) > 2 else tempfile.mkdtemp(suffix=".forest")
+    directory = export_forest(model, output)
+    shared = SharedForest.load(directory)
+
+    same = np.array_equal(shared.predict(X), model.predict(X))
+    print(f"Exported to {directory}; predictions identical on {len(X)} rows: {same}")
+
+    for label, path in (("joblib copy", model_path), ("shared", directory)):
+        print(f"{label}:")
+        for report in worker_memory_report(path, X[:100]):
+            print(f"  pid {report['pid']}: rss={report['rss']} KB pss={report['pss']} KB "
+                  f"shared={report['shared']} KB private={report['private']} KB")
@@ -0,0 +1,138 @@
+# analyze.py
+# Synchronous source → features pipeline shared by the front-ends
+
+import threading
+
+import ply.yacc as yacc
+
+import lexer_parser.parser as parser_module
+from lexer_parser.lexer import lexer as base_lexer
+from ast_nodes.ast_builder import NodeFactory
+from ast_nodes.symbol_table import SymbolTable
+from cfg.cfg_builder import CFGBuilder
+from features.feature_extractor import FeatureExtractor, FEATURE_NAMES
+from data_flow.function_summary import SummaryCache
+from pipeline.chunked_parse import parse_parallel
+from pipeline.budget import BudgetExceeded
+from rules.rule_engine import RuleEngine
+
+
+# --------------------------------------------------
+# Per-thread parser / lexer
+# --------------------------------------------------
+# PLY parsers and lexers keep their state on the instance, so each
+# thread gets its own pair built from the cached parse tables.
+
+_local = threading.local()
+
+# Function summaries are keyed by body hash, so one cache is shared by
+# every request handled in this process (an LRU, so long-running scans
+# and watch mode stay bounded).
+_summary_cache = SummaryCache()
+
+# Requests that do not pick their own rules share this engine, so its
+# per-rule times cover every such request
+_rule_engine = RuleEngine()
+
+
+def _thread_parser():
+    if not hasattr(_local, "parser"):
+        _local.parser = yacc.yacc(
+            module=parser_module,
+            debug=False,
+            write_tables=False
+        )
+        _local.lexer = base_lexer.clone()
+    return _local.parser, _local.lexer
+
+
+# --------------------------------------------------
+# Pipeline
+# --------------------------------------------------
+
+def analyze_source(code, parse_workers=None, budget=None, rules=None):
+    """
+    Runs parser → CFGBuilder → FeatureExtractor on one source string
+    and returns the feature dictionary. The grammar actions build the
+    AST directly (no tuple parse tree).
+
+    With parse_workers > 1, large sources are split into chunks that
+    are parsed in parallel (see chunked_parse.parse_parallel).
+
+    With an AnalysisBudget every stage checks its limits as it goes.
+    When one is hit, the features computed so far are returned (the
+    rest as 0) and budget.exceeded says why. Such partial features are
+    not a real feature vector: callers report the truncation instead
+    of a prediction.
+
+    `rules` is a RuleEngine with the checks to run for this request
+    (default: all rules); its .times accumulate the time per rule.
+    """
+    extractor = FeatureExtractor(_summary_cache, rules=rules or _rule_engine)
+
+    try:
+        ast, cfg, symbols = _parse_and_build(code, parse_workers, budget)
+        return extractor.extract(ast, cfg, symbols, budget)
+    except BudgetExceeded as e:
+        budget.exceeded = e
+        return {name: extractor.features.get(name, 0) for name in FEATURE_NAMES}
+
+
+def _parse_and_build(code, parse_workers, budget):
+    if parse_workers and parse_workers > 1:
+        ast, cfg, symbols = parse_parallel(code, parse_workers, budget=budget)
+        if ast is None:
+            raise Exception("Syntax error: unable to parse source")
+
+        # Tokens are counted while parsing; charge the rest here
+        if budget is not None:
+            budget.check_ast(ast)
+            budget.count_cfg_nodes(len(cfg.nodes))
+        return ast, cfg, symbols
+
+    parser, lexer = _thread_parser()
+    lexer.lineno = 1
+    lexer.symbols = symbols = SymbolTable()
+    lexer.nodes = NodeFactory(symbols=symbols)
+
+    tokenfunc = budget.token_func(lexer) if budget is not None else None
+
+    ast = parser.parse(code, lexer=lexer, tokenfunc=tokenfunc)
+    if ast is None:
+        raise Exception("Syntax error: unable to parse source")
+
+    # The visitors below recurse, so depth is checked before any runs
+    if budget is not None:
+        budget.check_ast(ast)
+
+    return ast, CFGBuilder(budget).build(ast), symbols
+
+
+# --------------------------------------------------
+# Testing the pipeline
+# --------------------------------------------------
+if __name__ == "__main__":
+    code = """
+    int a;
+    a = 10;
+    if (a > 5) {
+        a = a + 1;
+    }
+    """
+
+    for key, value in analyze_source(code).items():
+        print(f"{key}: {value}")
+
+    from pipeline.budget import AnalysisBudget
+
+    nested = "int a;\na = 0;\n" + "while (a < 9) {\n" * 300 + "a = a + 1;\n" + "}\n" * 300
+
+    print("Adversarial input under budgets:")
+    for budget in (
+        AnalysisBudget(max_tokens=500),
+        AnalysisBudget(max_ast_depth=100),
+        AnalysisBudget(max_cfg_nodes=200),
+        AnalysisBudget(max_solver_iterations=1000),
+    ):
+        features = analyze_source(nested, budget=budget)
+        print(f"  cfg_nodes={features['cfg_nodes']}: {budget.exceeded}")
@@ -0,0 +1,659 @@
+# artifacts.py
+# Compact, versioned binary format for AST / CFG / data-flow artifacts:
+# flat node tables, edge arrays and bitset-encoded data-flow facts that
+# can be read field by field without rebuilding the object graph
+
+import mmap
+import struct
+import sys
+from array import array
+
+from ast_nodes.ast_builder import (
+    ProgramNode,
+    DeclarationNode,
+    AssignmentNode,
+    IfNode,
+    WhileNode,
+    FunctionNode,
+    ReturnNode,
+    CallNode,
+    BinaryOpNode,
+    NumberNode,
+    IdentifierNode,
+    FROZEN_CLASSES
+)
+from cfg.cfg_builder import CFGNode, ControlFlowGraph
+
+
+# --------------------------------------------------
+# File layout
+# --------------------------------------------------
+#
+#   header    : magic(4s) version(H) reserved(H) section_count(I)
+#   directory : section_count × (tag(4s), offset(Q), length(Q))
+#   sections  : 8-byte aligned, each a flat array or string table
+#
+# Sections (all optional):
+#
+#   STRS  string table: count(I), offsets((count + 1) × I), UTF-8 data
+#
+#   AST node table, one column per section, one row per distinct node
+#   (shared subtrees are stored once); children always precede their
+#   parent, and the root is the last row:
+#   AKND kind(B)      ALIN lineno(i)    AST0 string 0(i)  AST1 string 1(i)
+#   ASID sid(i)       AVAL value(q)     ACST child start(I)
+#   ACHN child node indices(I)          AAST aux start(I)  AAUX aux(i)
+#   (child / aux counts are the differences of consecutive starts;
+#   the start columns have one extra row)
+#
+#   CFG node table / edges (CSR), node order = cfg.nodes:
+#   CIDS node id(q)   CLBL label string(i)    CDCL declared var(i)
+#   CDST defs start(I)    CDEF defs(i)    CUST uses start(I)  CUSE uses(i)
+#   CEST edge start(I)    CEDG successor node indices(I)
+#   CMET start index(i), exit index(i), max loop depth(i)
+#
+#   Data flow (node order = cfg.nodes):
+#   DVAR variable universe(i)   DINS / DOUT  n_nodes × ceil(vars / 8)
+#   bitset rows(B)              WARN warning strings(I)
+#
+# Variables are symbol IDs or names; both are stored as one i32 code:
+# 2 × sid for IDs, 2 × string index + 1 for names.
+#
+# Arrays are little-endian, as written by the host (see _check_host).
+
+MAGIC = b"MCAF"
+VERSION = 2     # v2: numbers outside int64 kept as text
+HEADER = struct.Struct("<4sHHI")
+ENTRY = struct.Struct("<4sQQ")
+
+# Kind code = position in this tuple
+KINDS = (
+    ProgramNode, DeclarationNode, AssignmentNode, IfNode, WhileNode,
+    FunctionNode, ReturnNode, CallNode, BinaryOpNode, NumberNode, IdentifierNode
+)
+_KIND_CODES = {kind: code for code, kind in enumerate(KINDS)}
+_KIND_CODES.update({frozen: _KIND_CODES[base] for base, frozen in FROZEN_CLASSES.items()})
+
+# Per-kind fields:
+#   Program      children = statements
+#   Declaration  s0 = datatype, s1 = identifier, sid
+#   Assignment   s0 = identifier, sid, children = [expression]
+#   If / While   children = [condition, *body]
+#   Function     s0 = return type, s1 = name, value = 1 if param_ids,
+#                aux = (datatype, name, param id) per parameter,
+#                children = body
+#   Return       children = [expression] or []
+#   Call         s0 = name, children = args
+#   BinaryOp     s0 = operator, children = [left, right]
+#   Number       value; s0 = decimal text instead when the literal
+#                does not fit AVAL's int64 (value is then 0)
+#   Identifier   s0 = name, sid
+
+_AST_COLUMNS = (
+    ("AKND", "B"), ("ALIN", "i"), ("AST0", "i"), ("AST1", "i"), ("ASID", "i"),
+    ("AVAL", "q"), ("ACST", "I"), ("ACHN", "I"), ("AAST", "I"), ("AAUX", "i"),
+)
+_CFG_COLUMNS = (
+    ("CIDS", "q"), ("CLBL", "i"), ("CDCL", "i"), ("CDST", "I"), ("CDEF", "i"),
+    ("CUST", "I"), ("CUSE", "i"), ("CEST", "I"), ("CEDG", "I"), ("CMET", "i"),
+)
+
+
+# Range of the AVAL column
+INT64_MIN, INT64_MAX = -2 ** 63, 2 ** 63 - 1
+
+
+def _check_host():
+    if sys.byteorder != "little":
+        raise Exception("Artifacts can only be read and written on little-endian hosts")
+
+    for code, size in (("B", 1), ("i", 4), ("I", 4), ("q", 8)):
+        if array(code).itemsize != size:
+            raise Exception(f"Unexpected array item size for '{code}'")
+
+
+# --------------------------------------------------
+# Writer
+# --------------------------------------------------
+
+class _Strings:
+    def __init__(self):
+        self.ids = {}
+        self.items = []
+
+    def id(self, text):
+        if text is None:
+            return -1
+        sid = self.ids.get(text)
+        if sid is None:
+            sid = self.ids[text] = len(self.items)
+            self.items.append(text)
+        return sid
+
+    def var(self, var):
+        if isinstance(var, int):
+            return 2 * var
+        return 2 * self.id(var) + 1
+
+    def encode(self):
+        data = [s.encode("utf-8") for s in self.items]
+        offsets = array("I", [0])
+        for item in data:
+            offsets.append(offsets[-1] + len(item))
+        return array("I", [len(data)]).tobytes() + offsets.tobytes() + b"".join(data)
+
+
+# Per node class: node → (children, s0, s1, value, aux)
+_NODE_FIELDS = {
+    ProgramNode: lambda n, st: (n.statements, -1, -1, 0, ()),
+    DeclarationNode: lambda n, st: ((), st.id(n.datatype), st.id(n.identifier), 0, ()),
+    AssignmentNode: lambda n, st: ((n.expression,), st.id(n.identifier), -1, 0, ()),
+    IfNode: lambda n, st: ([n.condition] + n.body, -1, -1, 0, ()),
+    WhileNode: lambda n, st: ([n.condition] + n.body, -1, -1, 0, ()),
+    FunctionNode: lambda n, st: (
+        n.body, st.id(n.return_type), st.id(n.name), int(n.param_ids is not None),
+        [code
+         for (datatype, name), pid in zip(n.params, n.param_ids or [None] * len(n.params))
+         for code in (st.id(datatype), st.id(name), pid if pid is not None else -1)]
+    ),
+    ReturnNode: lambda n, st: ((n.expression,) if n.expression is not None else (), -1, -1, 0, ()),
+    CallNode: lambda n, st: (n.args, st.id(n.name), -1, 0, ()),
+    BinaryOpNode: lambda n, st: ((n.left, n.right), st.id(n.operator), -1, 0, ()),
+    NumberNode: lambda n, st: (
+        ((), -1, -1, n.value, ()) if INT64_MIN <= n.value <= INT64_MAX
+        else ((), st.id(str(n.value)), -1, 0, ())
+    ),
+    IdentifierNode: lambda n, st: ((), st.id(n.name), -1, 0, ()),
+}
+_NODE_FIELDS.update({frozen: _NODE_FIELDS[base] for base, frozen in FROZEN_CLASSES.items()})
+
+
+def _encode_ast(ast_root, strings):
+    columns = {tag: array(code) for tag, code in _AST_COLUMNS}
+    kind, line, s0, s1, sid, value = (
+        columns["AKND"], columns["ALIN"], columns["AST0"],
+        columns["AST1"], columns["ASID"], columns["AVAL"]
+    )
+    child_start, children, aux_start, aux = (
+        columns["ACST"], columns["ACHN"], columns["AAST"], columns["AAUX"]
+    )
+
+    index = {}     # id(node) → row
+    stack = [(ast_root, None)]
+
+    # Iterative post-order, so children get their rows first. A node is
+    # pushed again with its fields once its children are on the stack.
+    while stack:
+        node, fields = stack.pop()
+        if id(node) in index:
+            continue
+
+        if fields is None:
+            describe = _NODE_FIELDS.get(type(node))
+            if describe is None:
+                raise Exception(f"Cannot serialize AST node: {node!r}")
+
+            fields = describe(node, strings)
+            pending = [child for child in fields[0] if id(child) not in index]
+            if pending:
+                stack.append((node, fields))
+                stack.extend((child, None) for child in reversed(pending))
+                continue
+
+        node_kids, first, second, number, extra = fields
+
+        index[id(node)] = len(kind)
+        kind.append(_KIND_CODES[type(node)])
+        line.append(node.lineno if node.lineno is not None else -1)
+        s0.append(first)
+        s1.append(second)
+        node_sid = node.__dict__.get("sid")
+        sid.append(node_sid if node_sid is not None else -1)
+        value.append(number)
+
+        child_start.append(len(children))
+        children.extend([index[id(child)] for child in node_kids])
+        aux_start.append(len(aux))
+        aux.extend(extra)
+
+    child_start.append(len(children))
+    aux_start.append(len(aux))
+    return columns
+
+
+def _encode_cfg(cfg, strings):
+    columns = {tag: array(code) for tag, code in _CFG_COLUMNS}
+    index = {node.id: i for i, node in enumerate(cfg.nodes)}
+
+    for node in cfg.nodes:
+        columns["CIDS"].append(node.id)
+        columns["CLBL"].append(strings.id(node.label))
+        columns["CDCL"].append(strings.var(node.declares) if node.declares is not None else -1)
+
+        columns["CDST"].append(len(columns["CDEF"]))
+        columns["CDEF"].extend(strings.var(v) for v in node.defs)
+        columns["CUST"].append(len(columns["CUSE"]))
+        columns["CUSE"].extend(strings.var(v) for v in node.uses)
+        columns["CEST"].append(len(columns["CEDG"]))
+        columns["CEDG"].extend(index[succ.id] for succ in node.next)
+
+    for tag, body in (("CDST", "CDEF"), ("CUST", "CUSE"), ("CEST", "CEDG")):
+        columns[tag].append(len(columns[body]))
+
+    columns["CMET"].extend((
+        index[cfg.start.id] if cfg.start is not None else -1,
+        index[cfg.exit.id] if cfg.exit is not None else -1,
+        cfg.max_loop_depth,
+    ))
+    return columns
+
+
+def _encode_dataflow(cfg, dataflow, strings):
+    universe = {}
+    for sets in (dataflow.get("in_sets", {}), dataflow.get("out_sets", {})):
+        for facts in sets.values():
+            for var in facts:
+                universe.setdefault(var, len(universe))
+
+    width = (len(universe) + 7) // 8
+    sections = {"DVAR": array("i", (strings.var(v) for v in universe))}
+
+    for tag, key in (("DINS", "in_sets"), ("DOUT", "out_sets")):
+        sets = dataflow.get(key, {})
+        rows = bytearray()
+        for node in cfg.nodes:
+            mask = 0
+            for var in sets.get(node.id, ()):
+                mask |= 1 << universe[var]
+            rows += mask.to_bytes(width, "little")
+        sections[tag] = bytes(rows)
+
+    return sections
+
+
+def dump_artifacts(ast=None, cfg=None, dataflow=None, warnings=None):
+    """
+    Returns the artifacts as bytes. `dataflow` is a DataFlowAnalyzer
+    report (in_sets / out_sets keyed by CFG node id) and needs `cfg`;
+    its warnings are stored unless `warnings` is given.
+    """
+    _check_host()
+    strings = _Strings()
+    sections = {}
+
+    if ast is not None:
+        sections.update(_encode_ast(ast, strings))
+    if cfg is not None:
+        sections.update(_encode_cfg(cfg, strings))
+    if dataflow is not None:
+        if cfg is None:
+            raise Exception("Data-flow facts are stored per CFG node; pass the cfg too")
+        sections.update(_encode_dataflow(cfg, dataflow, strings))
+        if warnings is None:
+            warnings = dataflow.get("warnings")
+    if warnings is not None:
+        sections["WARN"] = array("I", (strings.id(w) for w in warnings))
+
+    sections["STRS"] = strings.encode()
+
+    # Header, directory, then 8-byte aligned sections
+    offset = HEADER.size + ENTRY.size * len(sections)
+    directory = []
+    blobs = []
+
+    for tag, data in sections.items():
+        blob = data.tobytes() if isinstance(data, array) else data
+        padding = -offset % 8
+        blobs.append(b"\0" * padding + blob)
+        offset += padding
+        directory.append(ENTRY.pack(tag.encode("ascii"), offset, len(blob)))
+        offset += len(blob)
+
+    header = HEADER.pack(MAGIC, VERSION, 0, len(sections))
+    return header + b"".join(directory) + b"".join(blobs)
+
+
+def write_artifacts(path, **artifacts):
+    with open(path, "wb") as f:
+        f.write(dump_artifacts(**artifacts))
+
+
+# --------------------------------------------------
+# Lazy reader
+# --------------------------------------------------
+
+class ArtifactReader:
+    """
+    Read-only view of serialized artifacts. Only the header and section
+    directory are parsed up front; each column is a memoryview cast
+    into the buffer on first use, and strings are decoded on demand.
+    ast() / cfg() / dataflow() rebuild the full objects when needed.
+    """
+
+    def __init__(self, data):
+        _check_host()
+        self._view = memoryview(data)
+
+        magic, version, _, count = HEADER.unpack_from(self._view, 0)
+        if magic != MAGIC:
+            raise Exception("Not an analysis artifact file")
+        if version != VERSION:
+            raise Exception(f"Unsupported artifact version: {version}")
+
+        self.sections = {}
+        for i in range(count):
+            tag, offset, length = ENTRY.unpack_from(self._view, HEADER.size + i * ENTRY.size)
+            self.sections[tag.decode("ascii")] = (offset, length)
+
+        self._columns = {}
+        self._strings = None
+        self._string_cache = {}
+        self._fact_rows = {}
+
+    def __contains__(self, tag):
+        return tag in self.sections
+
+    def column(self, tag, code="B"):
+        """
+        Zero-copy view of one section as an array of `code` items.
+        """
+        col = self._columns.get(tag)
+        if col is None:
+            offset, length = self.sections[tag]
+            col = self._columns[tag] = self._view[offset:offset + length].cast(code)
+        return col
+
+    def _col(self, tag):
+        for group in (_AST_COLUMNS, _CFG_COLUMNS):
+            for name, code in group:
+                if name == tag:
+                    return self.column(tag, code)
+        raise Exception(f"Unknown column: {tag}")
+
+    # --------------------------------------------------
+    # Strings / variables
+    # --------------------------------------------------
+    def string(self, i):
+        if i < 0:
+            return None
+
+        text = self._string_cache.get(i)
+        if text is None:
+            if self._strings is None:
+                offset, _ = self.sections["STRS"]
+                count = struct.unpack_from("<I", self._view, offset)[0]
+                offsets = self._view[offset + 4:offset + 8 + 4 * count].cast("I")
+                self._strings = (offsets, offset + 8 + 4 * count)
+
+            offsets, base = self._strings
+            text = str(self._view[base + offsets[i]:base + offsets[i + 1]], "utf-8")
+            self._string_cache[i] = text
+        return text
+
+    def var(self, code):
+        return code // 2 if code % 2 == 0 else self.string(code // 2)
+
+    # --------------------------------------------------
+    # AST fields
+    # --------------------------------------------------
+    @property
+    def ast_node_count(self):
+        return len(self._col("AKND")) if "AKND" in self else 0
+
+    def ast_kind(self, i):
+        return KINDS[self._col("AKND")[i]]
+
+    def ast_lineno(self, i):
+        line = self._col("ALIN")[i]
+        return line if line >= 0 else None
+
+    def ast_children(self, i):
+        start = self._col("ACST")
+        return self._col("ACHN")[start[i]:start[i + 1]]
+
+    def ast_name(self, i):
+        """
+        Identifier / function / call name (operator for BinaryOp).
+        """
+        kind = self.ast_kind(i)
+        column = "AST1" if kind in (DeclarationNode, FunctionNode) else "AST0"
+        return self.string(self._col(column)[i])
+
+    def ast_counts(self):
+        """
+        {node class name: count} from the kind column alone.
+        """
+        counts = {}
+        for code in self._col("AKND"):
+            name = KINDS[code].__name__
+            counts[name] = counts.get(name, 0) + 1
+        return counts
+
+    def ast(self):
+        """
+        Rebuilds the AST (shared subtrees stay shared).
+        """
+        if not self.ast_node_count:
+            return None
+
+        kinds, lines = self._col("AKND"), self._col("ALIN")
+        s0, s1, sids, values = self._col("AST0"), self._col("AST1"), self._col("ASID"), self._col("AVAL")
+        child_start, children = self._col("ACST"), self._col("ACHN")
+        aux_start, aux = self._col("AAST"), self._col("AAUX")
+        string = self.string
+
+        nodes = []
+        for i in range(len(kinds)):
+            kind = KINDS[kinds[i]]
+            kids = [nodes[c] for c in children[child_start[i]:child_start[i + 1]]]
+            sid = sids[i] if sids[i] >= 0 else None
+
+            # Most frequent kinds first
+            if kind is IdentifierNode:
+                fields = {"nodetype": "Identifier", "name": string(s0[i]), "sid": sid}
+            elif kind is NumberNode:
+                fields = {"nodetype": "Number",
+                          "value": values[i] if s0[i] < 0 else int(string(s0[i]))}
+            elif kind is BinaryOpNode:
+                fields = {"nodetype": "BinaryOp", "operator": string(s0[i]),
+                          "left": kids[0], "right": kids[1]}
+            elif kind is AssignmentNode:
+                fields = {"nodetype": "Assignment", "identifier": string(s0[i]),
+                          "expression": kids[0], "sid": sid}
+            elif kind is DeclarationNode:
+                fields = {"nodetype": "Declaration", "datatype": string(s0[i]),
+                          "identifier": string(s1[i]), "sid": sid}
+            elif kind is IfNode:
+                fields = {"nodetype": "If", "condition": kids[0], "body": kids[1:]}
+            elif kind is WhileNode:
+                fields = {"nodetype": "While", "condition": kids[0], "body": kids[1:]}
+            elif kind is CallNode:
+                fields = {"nodetype": "Call", "name": string(s0[i]), "args": kids}
+            elif kind is ReturnNode:
+                fields = {"nodetype": "Return", "expression": kids[0] if kids else None}
+            elif kind is FunctionNode:
+                triples = aux[aux_start[i]:aux_start[i + 1]]
+                params = [(string(triples[j]), string(triples[j + 1]))
+                          for j in range(0, len(triples), 3)]
+                param_ids = [triples[j + 2] for j in range(0, len(triples), 3)]
+                fields = {"nodetype": "Function", "return_type": string(s0[i]),
+                          "name": string(s1[i]), "params": params, "body": kids,
+                          "param_ids": param_ids if values[i] else None}
+            else:
+                fields = {"nodetype": "Program", "statements": kids}
+
+            if lines[i] >= 0:
+                fields["lineno"] = lines[i]
+
+            # Built without __init__ / __setattr__, like unpickling
+            node = kind.__new__(kind)
+            node.__dict__.update(fields)
+            nodes.append(node)
+
+        return nodes[-1]
+
+    # --------------------------------------------------
+    # CFG fields
+    # --------------------------------------------------
+    @property
+    def cfg_node_count(self):
+        return len(self._col("CIDS")) if "CIDS" in self else 0
+
+    def cfg_label(self, i):
+        return self.string(self._col("CLBL")[i])
+
+    def cfg_successors(self, i):
+        start = self._col("CEST")
+        return self._col("CEDG")[start[i]:start[i + 1]]
+
+    def cfg_defs(self, i):
+        start = self._col("CDST")
+        return [self.var(v) for v in self._col("CDEF")[start[i]:start[i + 1]]]
+
+    def cfg_uses(self, i):
+        start = self._col("CUST")
+        return [self.var(v) for v in self._col("CUSE")[start[i]:start[i + 1]]]
+
+    @property
+    def cfg_edge_count(self):
+        return len(self._col("CEDG")) if "CEDG" in self else 0
+
+    def cfg(self):
+        """
+        Rebuilds the ControlFlowGraph with the original node ids.
+        """
+        if not self.cfg_node_count:
+            return None
+
+        ids, labels, declares = self._col("CIDS"), self._col("CLBL"), self._col("CDCL")
+        edge_start, edges = self._col("CEST"), self._col("CEDG")
+
+        nodes = []
+        for i in range(len(ids)):
+            node = CFGNode.__new__(CFGNode)
+            node.id = ids[i]
+            node.label = self.string(labels[i])
+            node.next = []
+            node.defs = self.cfg_defs(i)
+            node.uses = self.cfg_uses(i)
+            node.declares = self.var(declares[i]) if declares[i] >= 0 else None
+            nodes.append(node)
+
+        for i, node in enumerate(nodes):
+            node.next = [nodes[j] for j in edges[edge_start[i]:edge_start[i + 1]]]
+
+        start, last, loop_depth = self._col("CMET")
+        cfg = ControlFlowGraph()
+        cfg.nodes = nodes
+        cfg.start = nodes[start] if start >= 0 else None
+        cfg.exit = nodes[last] if last >= 0 else None
+        cfg.max_loop_depth = loop_depth
+        return cfg
+
+    # --------------------------------------------------
+    # Data flow
+    # --------------------------------------------------
+    def _facts(self, tag, i):
+        universe = self.column("DVAR", "i")
+        width = (len(universe) + 7) // 8
+        row = bytes(self.column(tag)[i * width:(i + 1) * width])
+
+        # Many nodes carry the same facts; each distinct row is decoded once
+        facts = self._fact_rows.get(row)
+        if facts is None:
+            mask = int.from_bytes(row, "little")
+            facts = []
+            while mask:
+                low = mask & -mask
+                facts.append(self.var(universe[low.bit_length() - 1]))
+                mask ^= low
+            facts = self._fact_rows[row] = frozenset(facts)
+        return set(facts)
+
+    def in_set(self, i):
+        """
+        IN facts of the i-th CFG node (by position, not id).
+        """
+        return self._facts("DINS", i)
+
+    def out_set(self, i):
+        return self._facts("DOUT", i)
+
+    def warnings(self):
+        if "WARN" not in self:
+            return []
+        return [self.string(i) for i in self.column("WARN", "I")]
+
+    def dataflow(self):
+        """
+        Rebuilds a DataFlowAnalyzer-style report.
+        """
+        ids = self._col("CIDS")
+        return {
+            "in_sets": {ids[i]: self.in_set(i) for i in range(len(ids))},
+            "out_sets": {ids[i]: self.out_set(i) for i in range(len(ids))},
+            "warnings": self.warnings(),
+        }
+
+    def close(self):
+        for col in self._columns.values():
+            col.release()
+        self._columns = {}
+        if self._strings is not None:
+            self._strings[0].release()
+            self._strings = None
+        self._view.release()
+
+
+def load_artifacts(data):
+    return ArtifactReader(data)
+
+
+def read_artifacts(path):
+    """
+    Memory-maps an artifact file; nothing is read until a field is used.
+    """
+    with open(path, "rb") as f:
+        return ArtifactReader(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+# --------------------------------------------------
+# Testing the artifact format
+# --------------------------------------------------
+if __name__ == "__main__":
+    from lexer_parser.parser import parse_ast
+    from cfg.cfg_builder import CFGBuilder
+    from data_flow.data_flow_analyzer import DataFlowAnalyzer
+    from ast_nodes.ast_printer import to_source
+
+    code = """
+    int inc(int x) {
+        return x + 1;
+    }
+    int a;
+    int b;
+    a = inc(2);
+    while (a < 20) {
+        a = a + b;
+    }
+    """
+
+    ast, symbols = parse_ast(code)
+    cfg = CFGBuilder().build(ast)
+    report = DataFlowAnalyzer(cfg, symbols=symbols).analyze()
+
+    data = dump_artifacts(ast=ast, cfg=cfg, dataflow=report)
+    reader = load_artifacts(data)
+    print(f"{len(data)} bytes, sections {sorted(reader.sections)}")
+
+    print("AST counts:", reader.ast_counts())
+    print("CFG node 2:", reader.cfg_label(2), "->", list(reader.cfg_successors(2)),
+          "IN:", reader.in_set(2))
+    print("Warnings:", reader.warnings())
+
+    same = (
+        to_source(reader.ast()) == to_source(ast)
+        and [str(n) for n in reader.cfg().nodes] == [str(n) for n in cfg.nodes]
+        and reader.dataflow()["in_sets"] == report["in_sets"]
+    )
+    print("Round trip identical:", same)
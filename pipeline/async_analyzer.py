@@ -0,0 +1,177 @@
+# async_analyzer.py
+# asyncio front-end for the analysis pipeline with bounded concurrency,
+# per-request timeouts and load shedding
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from pipeline.analyze import analyze_source
+
+
+# --------------------------------------------------
+# Errors
+# --------------------------------------------------
+
+class AnalyzerOverloaded(Exception):
+    """Raised immediately when the in-flight limit is reached."""
+
+
+class AnalysisTruncated(Exception):
+    """
+    Raised when a request ran out of its budget. `features` holds the
+    partial features, which are not a complete feature vector.
+    """
+
+    def __init__(self, reason, features):
+        super().__init__(reason)
+        self.features = features
+
+
+def _run(func, args, budget):
+    # The budget is a per-request copy (in a process pool, one that
+    # lives in the worker), so what it recorded is sent back here
+    features = func(*args)
+    reason = str(budget.exceeded) if budget is not None and budget.exceeded else None
+    return features, reason
+
+
+# --------------------------------------------------
+# Async Analyzer
+# --------------------------------------------------
+
+class AsyncAnalyzer:
+    """
+    Dispatches analyze_source() to a thread or process pool.
+
+    - max_workers:   pool size (requests actually running)
+    - max_in_flight: running + queued requests; beyond this new
+                     requests are rejected with AnalyzerOverloaded
+    - timeout:       default per-request timeout in seconds (None = no limit)
+    - profiler:      optional pipeline.profiling.Profiler; requests can
+                     then ask for a profile with analyze(..., profile=True)
+    - budget:        optional pipeline.budget.AnalysisBudget; each request
+                     gets a fresh copy, so its deadline starts at submission
+                     and running work stops itself once the budget is spent
+                     (the request then raises AnalysisTruncated)
+
+    A slot is released only when the pool has really finished with a
+    request, so timed-out or cancelled work that is already running
+    still counts against the limit until it ends.
+    """
+
+    def __init__(self, executor="thread", max_workers=4, max_in_flight=32, timeout=10.0,
+                 profiler=None, budget=None):
+        if executor == "process":
+            self._executor = ProcessPoolExecutor(max_workers=max_workers)
+        elif executor == "thread":
+            self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        else:
+            raise Exception(f"Unknown executor type: {executor}")
+
+        self.max_in_flight = max_in_flight
+        self.timeout = timeout
+        self.profiler = profiler
+        self.budget = budget
+
+        self.in_flight = 0
+        self.rejected = 0
+
+    # --------------------------------------------------
+    # Entry point
+    # --------------------------------------------------
+    async def analyze(self, source, timeout=None, profile=False):
+        if self.in_flight >= self.max_in_flight:
+            self.rejected += 1
+            raise AnalyzerOverloaded(
+                f"Analyzer saturated ({self.in_flight} requests in flight)"
+            )
+
+        loop = asyncio.get_running_loop()
+
+        budget = self.budget.fresh() if self.budget is not None else None
+
+        if self.profiler is not None:
+            func, args = self.profiler.job(source, profile, budget)
+        else:
+            func, args = analyze_source, (source, None, budget)
+
+        self.in_flight += 1
+        job = self._executor.submit(_run, func, args, budget)
+        job.add_done_callback(lambda _: self._schedule_release(loop))
+
+        # Cancelling the wrapper (timeout or caller cancellation) also
+        # cancels the pool future, dropping it if it has not started yet.
+        features, reason = await asyncio.wait_for(
+            asyncio.wrap_future(job),
+            timeout if timeout is not None else self.timeout
+        )
+        if reason is not None:
+            raise AnalysisTruncated(reason, features)
+        return features
+
+    def _schedule_release(self, loop):
+        if loop.is_closed():
+            self.in_flight -= 1
+        else:
+            loop.call_soon_threadsafe(self._release)
+
+    def _release(self):
+        self.in_flight -= 1
+
+    # --------------------------------------------------
+    # Shutdown
+    # --------------------------------------------------
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.close()
+
+
+# --------------------------------------------------
+# Module-level convenience API
+# --------------------------------------------------
+
+_default_analyzer = None
+
+
+def get_default_analyzer():
+    global _default_analyzer
+    if _default_analyzer is None:
+        _default_analyzer = AsyncAnalyzer()
+    return _default_analyzer
+
+
+async def analyze_async(source, timeout=None):
+    """
+    await analyze_async(code) → feature dictionary
+    """
+    return await get_default_analyzer().analyze(source, timeout=timeout)
+
+
+# --------------------------------------------------
+# Testing the Async Analyzer
+# --------------------------------------------------
+if __name__ == "__main__":
+    code = """
+    int a;
+    a = 10;
+    if (a > 5) {
+        a = a + 1;
+    }
+    """
+
+    async def main():
+        async with AsyncAnalyzer(max_workers=2, max_in_flight=4) as analyzer:
+            results = await asyncio.gather(
+                *(analyzer.analyze(code) for _ in range(8)),
+                return_exceptions=True
+            )
+
+        for r in results:
+            print("rejected" if isinstance(r, AnalyzerOverloaded) else r)
+
+    asyncio.run(main())
@@ -0,0 +1,194 @@
+# budget.py
+# Per-analysis resource budgets, checked cooperatively by each stage so
+# one pathological input cannot tie up a worker indefinitely
+
+import time
+
+from ast_nodes.ast_builder import ASTNode
+
+
+# --------------------------------------------------
+# Errors
+# --------------------------------------------------
+
+class BudgetExceeded(Exception):
+    """Raised by the stage that ran out of budget."""
+
+    def __init__(self, limit, value, maximum):
+        self.limit = limit
+        self.value = value
+        self.maximum = maximum
+
+        if limit == "deadline":
+            message = f"Analysis deadline of {maximum}s exceeded"
+        else:
+            message = f"Budget {limit} exceeded ({value} > {maximum})"
+        super().__init__(message)
+
+    def __reduce__(self):
+        # Keeps the exception intact when raised in a worker process
+        return BudgetExceeded, (self.limit, self.value, self.maximum)
+
+
+# --------------------------------------------------
+# Budget
+# --------------------------------------------------
+
+class AnalysisBudget:
+    """
+    Limits for one analysis (None = unlimited):
+
+    - max_tokens:            tokens read by the parser
+    - max_ast_depth:         nesting depth of the AST, checked before any
+                             recursive visitor runs
+    - max_cfg_nodes:         CFG nodes created (program + function CFGs)
+    - max_solver_iterations: node visits by the data-flow solvers
+    - deadline:              wall-clock seconds from construction
+
+    The deadline is checked every DEADLINE_EVERY counted events, so a
+    budget is cheap enough to pass through hot loops.
+    """
+
+    DEADLINE_EVERY = 256
+
+    def __init__(self, max_tokens=None, max_ast_depth=None, max_cfg_nodes=None,
+                 max_solver_iterations=None, deadline=None):
+        self.max_tokens = max_tokens
+        self.max_ast_depth = max_ast_depth
+        self.max_cfg_nodes = max_cfg_nodes
+        self.max_solver_iterations = max_solver_iterations
+        self.deadline = deadline
+
+        self.expires = time.monotonic() + deadline if deadline is not None else None
+
+        self.tokens = 0
+        self.cfg_nodes = 0
+        self.solver_iterations = 0
+        self._events = 0
+
+        self.exceeded = None    # the BudgetExceeded that stopped the analysis
+
+    def fresh(self):
+        """
+        Same limits, zeroed counters and a deadline starting now.
+        """
+        return AnalysisBudget(
+            self.max_tokens,
+            self.max_ast_depth,
+            self.max_cfg_nodes,
+            self.max_solver_iterations,
+            self.deadline
+        )
+
+    # --------------------------------------------------
+    # Checks
+    # --------------------------------------------------
+    def check_deadline(self):
+        if self.expires is not None and time.monotonic() > self.expires:
+            raise BudgetExceeded("deadline", None, self.deadline)
+
+    def _tick(self):
+        self._events += 1
+        if self._events % self.DEADLINE_EVERY == 0:
+            self.check_deadline()
+
+    def count_token(self):
+        self.tokens += 1
+        if self.max_tokens is not None and self.tokens > self.max_tokens:
+            raise BudgetExceeded("max_tokens", self.tokens, self.max_tokens)
+        self._tick()
+
+    def count_cfg_nodes(self, count=1):
+        self.cfg_nodes += count
+        if self.max_cfg_nodes is not None and self.cfg_nodes > self.max_cfg_nodes:
+            raise BudgetExceeded("max_cfg_nodes", self.cfg_nodes, self.max_cfg_nodes)
+        self._tick()
+
+    def count_solver_iteration(self):
+        self.solver_iterations += 1
+        if (
+            self.max_solver_iterations is not None
+            and self.solver_iterations > self.max_solver_iterations
+        ):
+            raise BudgetExceeded(
+                "max_solver_iterations", self.solver_iterations, self.max_solver_iterations
+            )
+        self._tick()
+
+    def check_ast(self, ast_root):
+        """
+        Measures the AST's depth without recursion (shared, interned
+        subtrees are measured once) and enforces max_ast_depth.
+        """
+        if self.max_ast_depth is None:
+            return
+
+        depth = ast_depth(ast_root)
+        if depth > self.max_ast_depth:
+            raise BudgetExceeded("max_ast_depth", depth, self.max_ast_depth)
+        self.check_deadline()
+
+    # --------------------------------------------------
+    # Parser hook
+    # --------------------------------------------------
+    def token_func(self, lexer):
+        """
+        Returns a tokenfunc for parser.parse() that counts every token
+        (not the end of input, so chunks add up to the whole file).
+        """
+        def next_token():
+            token = lexer.token()
+            if token is not None:
+                self.count_token()
+            return token
+
+        return next_token
+
+
+# --------------------------------------------------
+# AST depth
+# --------------------------------------------------
+
+def _children(node):
+    for value in vars(node).values():
+        if isinstance(value, ASTNode):
+            yield value
+        elif isinstance(value, list):
+            for item in value:
+                if isinstance(item, ASTNode):
+                    yield item
+
+
+def ast_depth(ast_root):
+    heights = {}
+    stack = [(ast_root, False)]
+
+    while stack:
+        node, expanded = stack.pop()
+        if id(node) in heights:
+            continue
+
+        children = list(_children(node))
+        if expanded:
+            heights[id(node)] = 1 + max((heights[id(c)] for c in children), default=0)
+        else:
+            stack.append((node, True))
+            stack.extend((c, False) for c in children if id(c) not in heights)
+
+    return heights[id(ast_root)]
+
+
+# --------------------------------------------------
+# Testing the budget
+# --------------------------------------------------
+if __name__ == "__main__":
+    from lexer_parser.parser import parse_ast
+
+    ast, _ = parse_ast("int a;\na = 0;\n" + "if (a > 0) {\n" * 50 + "a = 1;\n" + "}\n" * 50)
+    print("AST depth:", ast_depth(ast))
+
+    budget = AnalysisBudget(max_ast_depth=20, deadline=1.0)
+    try:
+        budget.check_ast(ast)
+    except BudgetExceeded as e:
+        print("Rejected:", e)
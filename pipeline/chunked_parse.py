@@ -0,0 +1,321 @@
+# chunked_parse.py
+# Parses one very large source file in parallel: the text is split on
+# top-level statement boundaries, each chunk is parsed (and its CFG
+# built) in a worker process, and the pieces are stitched back in order
+
+import contextlib
+import io
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+from lexer_parser.parser import parser
+from lexer_parser.lexer import lexer as base_lexer
+from ast_nodes.ast_builder import (
+    NodeFactory, DeclarationNode, AssignmentNode, IdentifierNode, FunctionNode
+)
+from ast_nodes.symbol_table import SymbolTable
+from cfg.cfg_builder import CFGBuilder, CFGNode, ControlFlowGraph
+from pipeline.artifacts import dump_artifacts, load_artifacts
+from pipeline.budget import BudgetExceeded
+from rules.rule_engine import CHILDREN
+
+
+# Files smaller than two chunks are parsed sequentially
+CHUNK_BYTES = 256 * 1024
+
+_braces = re.compile(r"[{};]")
+_non_space = re.compile(r"\S")
+
+
+# --------------------------------------------------
+# Splitting
+# --------------------------------------------------
+
+def split_top_level(data, chunk_bytes=CHUNK_BYTES):
+    """
+    Returns [(start, end, line)] ranges covering `data`. Every range
+    but the last ends right after a top-level statement (a ';' or a
+    closing '}' at brace depth 0); `line` is the line it starts on.
+
+    Mini-C has no strings or comments, so every brace and semicolon in
+    the text is a token: counting them gives the same depth the parser
+    sees. Depth up to each cut is found with str.count, so only the
+    text just after a cut is scanned in Python.
+    """
+    ranges = []
+    start = 0
+    line = 1
+
+    while len(data) - start > chunk_bytes:
+        target = start + chunk_bytes
+        depth = data.count("{", start, target) - data.count("}", start, target)
+        if depth < 0:
+            break   # unbalanced; the parser will report it
+
+        end = None
+        for match in _braces.finditer(data, target):
+            char = match.group()
+            if char == "{":
+                depth += 1
+            elif char == "}":
+                depth -= 1
+                if depth == 0:
+                    end = match.end()
+                    break
+            elif depth == 0:
+                end = match.end()
+                break
+
+        if end is None or _non_space.search(data, end) is None:
+            break
+
+        ranges.append((start, end, line))
+        line += data.count("\n", start, end)
+        start = end
+
+    ranges.append((start, len(data), line))
+    return ranges
+
+
+# --------------------------------------------------
+# Chunk parsing
+# --------------------------------------------------
+
+def _parse(text, line, budget=None):
+    """
+    Parses `text` as if it started on `line` of the full file and
+    builds its CFG. Returns (ProgramNode or None, cfg or None, symbols).
+    With an AnalysisBudget every token is counted.
+    """
+    lex = base_lexer.clone()
+    lex.lineno = line
+    lex.symbols = SymbolTable()
+    lex.nodes = NodeFactory(symbols=lex.symbols)
+
+    tokenfunc = budget.token_func(lex) if budget is not None else None
+    ast = parser.parse(text, lexer=lex, tokenfunc=tokenfunc)
+    if ast is None:
+        return None, None, lex.symbols
+
+    return ast, CFGBuilder().build(ast), lex.symbols
+
+
+def _flatten(cfg):
+    """
+    Replaces node → node edges by index lists. A long chain of linked
+    nodes would otherwise exceed the recursion limit when pickled.
+    """
+    index = {node.id: i for i, node in enumerate(cfg.nodes)}
+    edges = [[index[succ.id] for succ in node.next] for node in cfg.nodes]
+
+    for node in cfg.nodes:
+        node.next = []
+
+    start = index[cfg.start.id] if cfg.start is not None else None
+    last = index[cfg.exit.id] if cfg.exit is not None else None
+    return cfg.nodes, edges, start, last, cfg.max_loop_depth
+
+
+def _parse_chunk(job):
+    """
+    Runs in a worker process. Syntax diagnostics are captured instead
+    of printed, so a failed chunk can be re-parsed sequentially.
+
+    The AST goes back as a flat artifact (pipeline.artifacts): pickling
+    the node graph recurses once per level, so a deep expression would
+    exceed the recursion limit. The returned token count is what this
+    chunk used of the budget (a copy, whose deadline is the caller's).
+    """
+    text, line, budget = job
+    tokens = budget.tokens if budget is not None else 0
+    diagnostics = io.StringIO()
+
+    with contextlib.redirect_stdout(diagnostics):
+        ast, cfg, symbols = _parse(text, line, budget)
+
+    tree = dump_artifacts(ast=ast) if ast is not None else None
+    fragment = _flatten(cfg) if cfg is not None else None
+    tokens = budget.tokens - tokens if budget is not None else 0
+    return tree, fragment, symbols, diagnostics.getvalue(), tokens
+
+
+# --------------------------------------------------
+# Stitching
+# --------------------------------------------------
+
+def _merge_symbols(tables):
+    """
+    One SymbolTable for the whole file, plus a chunk sid → file sid list
+    per chunk. Chunks are merged in order, so IDs follow first
+    appearance and the first declaration wins, as in a sequential parse.
+    """
+    symbols = SymbolTable()
+    mappings = []
+
+    for table in tables:
+        mapping = []
+        for symbol in table:
+            mapping.append(symbols.intern(symbol.name))
+            if symbol.decl_line is not None:
+                symbols.declare(symbol.name, symbol.datatype, symbol.decl_line)
+        mappings.append(mapping)
+
+    return symbols, mappings
+
+
+def _remap(statements, nodes, mapping):
+    """
+    Rewrites a chunk's symbol IDs (AST and CFG) to the file's IDs.
+    """
+    if mapping == list(range(len(mapping))):
+        return
+
+    stack = list(statements)
+    while stack:
+        node = stack.pop()
+
+        if isinstance(node, (DeclarationNode, AssignmentNode, IdentifierNode)):
+            if node.sid is not None:
+                node.sid = mapping[node.sid]
+        elif isinstance(node, FunctionNode) and node.param_ids is not None:
+            node.param_ids = [mapping[sid] for sid in node.param_ids]
+
+        for attr, is_list in CHILDREN.get(type(node), ()):
+            value = getattr(node, attr)
+            if is_list:
+                stack.extend(child for child in value if child is not None)
+            elif value is not None:
+                stack.append(value)
+
+    for node in nodes:
+        node.defs = [mapping[sid] for sid in node.defs]
+        node.uses = [mapping[sid] for sid in node.uses]
+        if node.declares is not None:
+            node.declares = mapping[node.declares]
+
+
+def _stitch(pieces):
+    """
+    Concatenates the chunks' statement lists and chains their CFG
+    fragments exit → start, exactly as CFGBuilder chains top-level
+    statements. Node ids are renumbered, since each worker process
+    handed out its own, and symbol IDs are mapped onto one table.
+    """
+    pieces = list(pieces)
+    symbols, mappings = _merge_symbols(table for _, _, table in pieces)
+
+    statements = []
+    cfg = ControlFlowGraph()
+
+    for (ast, (nodes, edges, start, last, loop_depth), _), mapping in zip(pieces, mappings):
+        _remap(ast.statements, nodes, mapping)
+        statements.extend(ast.statements)
+
+        for node, successors in zip(nodes, edges):
+            node.id = next(CFGNode._ids)
+            node.next = [nodes[i] for i in successors]
+        cfg.nodes.extend(nodes)
+        cfg.max_loop_depth = max(cfg.max_loop_depth, loop_depth)
+
+        # A chunk of only function definitions adds no program nodes
+        if start is None:
+            continue
+
+        if cfg.exit is not None:
+            cfg.exit.connect(nodes[start])
+        else:
+            cfg.start = nodes[start]
+        cfg.exit = nodes[last]
+
+    return NodeFactory(symbols=symbols).program(statements), cfg, symbols
+
+
+# --------------------------------------------------
+# Entry point
+# --------------------------------------------------
+
+def parse_parallel(data, workers=None, chunk_bytes=CHUNK_BYTES, budget=None):
+    """
+    Returns (ast, cfg, symbols) for `data`; ast and cfg are None on a
+    syntax error.
+
+    Chunks are parsed in `workers` processes. If any chunk fails or
+    reports a diagnostic, or a worker raises, the whole file is parsed
+    again sequentially, so error messages and line numbers are exactly
+    those of a plain parse. Symbol IDs are the same as a sequential
+    parse would assign.
+
+    With an AnalysisBudget each worker counts its chunk's tokens and
+    checks the deadline; the chunks' tokens are added up here as they
+    come back, and BudgetExceeded is raised as soon as either limit is
+    passed.
+    """
+    ranges = split_top_level(data, chunk_bytes)
+
+    if len(ranges) > 1 and workers != 1:
+        jobs = [(data[start:end], line, budget) for start, end, line in ranges]
+        tokens = budget.tokens if budget is not None else 0
+
+        pool = ProcessPoolExecutor(max_workers=workers)
+        try:
+            results = []
+            for result in pool.map(_parse_chunk, jobs):
+                if budget is not None:
+                    _charge(budget, result[4])
+                results.append(result)
+        except BudgetExceeded:
+            raise
+        except Exception:
+            results = None
+        finally:
+            pool.shutdown(cancel_futures=True)
+
+        if results is not None and all(
+            tree is not None and not diagnostics for tree, _, _, diagnostics, _ in results
+        ):
+            return _stitch(
+                (load_artifacts(tree).ast(), fragment, symbols)
+                for tree, fragment, symbols, _, _ in results
+            )
+
+        # The sequential parse counts every token again
+        if budget is not None:
+            budget.tokens = tokens
+
+    return _parse(data, 1, budget)
+
+
+def _charge(budget, tokens):
+    budget.tokens += tokens
+    if budget.max_tokens is not None and budget.tokens > budget.max_tokens:
+        raise BudgetExceeded("max_tokens", budget.tokens, budget.max_tokens)
+    budget.check_deadline()
+
+
+# --------------------------------------------------
+# Testing the chunked parser
+# --------------------------------------------------
+if __name__ == "__main__":
+    block = """
+    int f(int x) {
+        return x + 1;
+    }
+    int a;
+    a = 10;
+    while (a < 20) {
+        a = f(a);
+    }
+    """
+
+    data = block * 2000
+    ranges = split_top_level(data, chunk_bytes=16 * 1024)
+    print(f"{len(data)} bytes -> {len(ranges)} chunks, "
+          f"starting on lines {[line for _, _, line in ranges[:5]]} ...")
+
+    ast, cfg, symbols = parse_parallel(data, workers=2, chunk_bytes=16 * 1024)
+    print(f"symbols={len(symbols)}, statements={len(ast.statements)}, cfg nodes={len(cfg.nodes)}, "
+          f"last statement on line {ast.statements[-1].lineno}")
+
+    print("With a syntax error (falls back to a sequential parse):")
+    ast, cfg, _ = parse_parallel(data + "a = ;\n", workers=2, chunk_bytes=16 * 1024)
+    print(ast)
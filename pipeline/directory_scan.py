@@ -0,0 +1,220 @@
+# directory_scan.py
+# Incremental, parallel analysis of a whole source tree into a FeatureStore
+
+import hashlib
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from features.feature_extractor import FEATURE_SCHEMA_VERSION
+from pipeline.analyze import analyze_source
+from pipeline.predictor import Predictor
+
+
+SOURCE_EXTENSIONS = (".mc", ".c")
+
+
+# --------------------------------------------------
+# Worker
+# --------------------------------------------------
+
+# Content hashes already in the store, set once per scan (and once per
+# worker process): a file whose content is stored under another path,
+# e.g. after a rename or copy, reuses that result instead of being
+# analyzed again
+_stored_hashes = frozenset()
+
+# Set in worker processes when the model is an exported shared forest
+# (ml.shared_model): each worker maps the same node arrays and predicts
+# its own files. Other models stay in the parent, which predicts all
+# results in one batch rather than loading a copy per worker.
+_predictor = None
+
+
+def _set_stored_hashes(hashes):
+    global _stored_hashes
+    _stored_hashes = hashes
+
+
+def _init_worker(hashes, model_path):
+    global _predictor
+    _set_stored_hashes(hashes)
+    _predictor = Predictor(model_path) if model_path else None
+
+
+def _analyze_file(job):
+    """
+    Runs in a worker process. Returns (path, hash, features, error,
+    prediction); features is None with error None when the content is
+    unchanged or already stored for another path. Truncated analyses
+    return partial features and the budget error; they are stored
+    without a prediction. prediction is None unless this worker holds
+    a shared forest. An unreadable file comes back with hash None and
+    the OS error.
+    """
+    path, known_hash, budget = job
+
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError as e:
+        return path, None, None, e, None
+
+    content_hash = hashlib.sha256(data).hexdigest()
+    if content_hash == known_hash or content_hash in _stored_hashes:
+        return path, content_hash, None, None, None
+
+    # Each file gets the full budget, with its deadline starting now
+    budget = budget.fresh() if budget is not None else None
+
+    try:
+        features = analyze_source(data.decode("utf-8"), budget=budget)
+    except Exception as e:
+        return path, content_hash, None, str(e), None
+
+    if budget is not None and budget.exceeded:
+        return path, content_hash, features, str(budget.exceeded), None
+
+    prediction = _predictor.predict(features) if _predictor is not None else None
+    return path, content_hash, features, None, prediction
+
+
+# --------------------------------------------------
+# Scanner
+# --------------------------------------------------
+
+def walk_sources(root, extensions=SOURCE_EXTENSIONS):
+    for dirpath, _, files in os.walk(root):
+        for name in files:
+            if name.endswith(extensions):
+                yield os.path.join(dirpath, name)
+
+
+def scan_directory(root, store, predictor, workers=None, extensions=SOURCE_EXTENSIONS,
+                   budget=None):
+    """
+    Brings the store up to date with the tree under root.
+
+    Only files whose (mtime, size) differ from the store are read; of
+    those, only files whose content hash changed are re-analyzed, and
+    content already stored under another path is copied from there.
+    Rows extracted with another feature schema or scored by another
+    model (predictor.model_version) count as changed and are never
+    copied.
+    Files that disappear during the scan count as removed; other read
+    errors are stored as the file's error.
+    Returns counts of analyzed / unchanged / removed files.
+    """
+    root = os.path.abspath(root)
+    known = store.stat_index()
+
+    # Pick up a newly published model before deciding what is current
+    predictor.refresh()
+    tags = (FEATURE_SCHEMA_VERSION, predictor.model_version)
+    current = {path: row[2] for path, row in known.items() if row[3:] == tags}
+    seen = set()
+    jobs = []
+    stats = {}
+
+    for path in walk_sources(root, extensions):
+        path = os.path.abspath(path)
+
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue    # removed since the walk listed it
+
+        seen.add(path)
+        stats[path] = (st.st_mtime, st.st_size)
+
+        previous = known.get(path)
+        if (previous and path in current
+                and previous[0] == st.st_mtime and previous[1] == st.st_size):
+            continue
+
+        jobs.append((path, current.get(path), budget))
+
+    stored_hashes = frozenset(current.values())
+
+    from ml.shared_model import is_shared_forest
+
+    model_path = getattr(predictor, "model_path", None)
+    if not (model_path and is_shared_forest(model_path)):
+        model_path = None
+
+    if workers and workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(stored_hashes, model_path)) as pool:
+            results = list(pool.map(_analyze_file, jobs, chunksize=16))
+    else:
+        _set_stored_hashes(stored_hashes)
+        try:
+            results = [_analyze_file(job) for job in jobs]
+        finally:
+            _set_stored_hashes(frozenset())
+
+    # Files that vanished before they were read count as removed
+    for path, content_hash, _, error, _ in results:
+        if content_hash is None and isinstance(error, FileNotFoundError):
+            seen.discard(path)
+    results = [r for r in results if r[0] in seen]
+
+    # Results to copy, looked up before anything is written (and before
+    # removed paths are deleted, so a renamed file finds its old row)
+    reused = {
+        path: store.find_by_hash(content_hash, *tags)
+        for path, content_hash, features, error, _ in results
+        if content_hash is not None and features is None and error is None
+        and current.get(path) != content_hash
+    }
+
+    analyzed = [r for r in results if r[2] is not None or r[3] is not None]
+
+    # Only complete feature vectors are scored, here unless a worker did
+    predictions = predictor.predict_many(
+        [r[2] for r in analyzed if r[3] is None and r[4] is None]
+    )
+    predictions = iter(predictions)
+
+    for path, content_hash, features, error, prediction in results:
+        mtime, size = stats[path]
+
+        if content_hash is None:
+            store.upsert(path, "", mtime, size, None, None, str(error), *tags)
+        elif path in reused:
+            features, prediction, error = reused[path]
+            store.upsert(path, content_hash, mtime, size, features, prediction, error, *tags)
+        elif features is None and error is None:
+            store.touch(path, mtime, size)
+        elif error is not None:
+            store.upsert(path, content_hash, mtime, size, features, None, error, *tags)
+        else:
+            if prediction is None:
+                prediction = next(predictions)
+            store.upsert(path, content_hash, mtime, size, features, prediction, None, *tags)
+
+    removed = [
+        path for path in known
+        if path not in seen and path.startswith(root + os.sep)
+    ]
+    store.remove(removed)
+    store.commit()
+
+    return {
+        "analyzed": len(analyzed),
+        "unchanged": len(seen) - len(analyzed),
+        "removed": len(removed)
+    }
+
+
+def watch_directory(root, store, predictor, workers=None, interval=2.0,
+                    extensions=SOURCE_EXTENSIONS, on_update=None, budget=None):
+    """
+    Polls the tree every `interval` seconds and keeps the store in sync.
+    Each poll only stats files, so idle trees cost one directory walk.
+    """
+    while True:
+        counts = scan_directory(root, store, predictor, workers, extensions, budget)
+        if on_update and (counts["analyzed"] or counts["removed"]):
+            on_update(counts)
+        time.sleep(interval)
@@ -0,0 +1,177 @@
+# predictor.py
+# Turns feature dictionaries into BUGGY / CLEAN predictions
+
+import hashlib
+import os
+import time
+
+from dataset.auto_dataset_generator import assign_label
+from features.feature_extractor import FEATURE_SCHEMA_VERSION
+
+
+# --------------------------------------------------
+# Predictor
+# --------------------------------------------------
+
+class Predictor:
+    """
+    Uses a trained scikit-learn model saved with joblib when model_path
+    is given, otherwise falls back to the rule-based labelling used for
+    the dataset (weak supervision). model_path may also be a forest
+    exported by ml.shared_model, which worker processes then share
+    through memory-mapped pages instead of each loading a copy.
+
+    With a ModelRegistry the predictor picks up newly published model
+    versions on its own (checked at most every `refresh_interval`
+    seconds), without restarting the process.
+
+    A model must record its feature columns and the feature schema it
+    was trained on (see FEATURE_SCHEMA_VERSION); others are refused
+    rather than fed misaligned rows.
+
+    model_version identifies the model that makes the predictions: the
+    SHA-256 of the model file, "rules" for the rule-based labels.
+    """
+
+    def __init__(self, model_path=None, registry=None, refresh_interval=5.0):
+        # (model, feature names, version, model_version) is swapped as
+        # one tuple so a concurrent predict never sees a model with the
+        # wrong columns
+        self._state = (None, None, None, "rules")
+
+        self.registry = registry
+        self.refresh_interval = refresh_interval
+        self._last_refresh = 0.0
+
+        self._explainer = (None, None)    # (model, ForestExplainer)
+
+        self.model_path = model_path
+        if model_path:
+            from ml.shared_model import load_model
+
+            self.set_model(load_model(model_path), model_version=_file_version(model_path))
+        elif registry is not None:
+            self.refresh(force=True)
+
+    # --------------------------------------------------
+    # Model management
+    # --------------------------------------------------
+    @property
+    def model(self):
+        return self._state[0]
+
+    @property
+    def version(self):
+        return self._state[2]
+
+    @property
+    def model_version(self):
+        return self._state[3]
+
+    def set_model(self, model, version=None, model_version=None):
+        """
+        model_version defaults to one unique to this model object, so
+        predictions it made are only reused within this process.
+        """
+        from ml.shared_model import model_columns
+
+        feature_names = model_columns(model)
+        if feature_names is None:
+            raise Exception("Model does not record its feature columns; retrain it")
+
+        schema = getattr(model, "feature_schema", None)
+        if schema != FEATURE_SCHEMA_VERSION:
+            raise Exception(
+                f"Model was trained on feature schema {schema}, the analyzer produces "
+                f"{FEATURE_SCHEMA_VERSION}; retrain it on a regenerated dataset"
+            )
+
+        if model_version is None:
+            model_version = f"object:{id(model):x}"
+
+        self._state = (model, feature_names, version, model_version)
+
+    def refresh(self, force=False):
+        """
+        Hot-swaps in the registry's current model if it changed.
+        """
+        if self.registry is None:
+            return False
+
+        now = time.monotonic()
+        if not force and now - self._last_refresh < self.refresh_interval:
+            return False
+        self._last_refresh = now
+
+        version = self.registry.current_version()
+        if version is None or version == self.version:
+            return False
+
+        self.set_model(self.registry.load(version), version,
+                       _file_version(self.registry.path(version)))
+        return True
+
+    # --------------------------------------------------
+    # Prediction
+    # --------------------------------------------------
+    def predict_many(self, feature_dicts):
+        if not feature_dicts:
+            return []
+
+        self.refresh()
+        model, feature_names, _, _ = self._state
+
+        if model is None:
+            return [assign_label(f) for f in feature_dicts]
+
+        rows = [[f[name] for name in feature_names] for f in feature_dicts]
+        return [int(p) for p in model.predict(rows)]
+
+    def predict(self, features):
+        return self.predict_many([features])[0]
+
+    # --------------------------------------------------
+    # Explanations
+    # --------------------------------------------------
+    def explain_many(self, feature_dicts, top=None):
+        """
+        Per-feature contributions to P(BUGGY) for each feature dict
+        (see ml.attributions). Needs a Random Forest model.
+        """
+        model = self.model
+        if model is None or not (hasattr(model, "estimators_") or hasattr(model, "roots")):
+            raise Exception("Explanations need a Random Forest model")
+
+        cached_model, explainer = self._explainer
+        if cached_model is not model:
+            from ml.attributions import ForestExplainer
+
+            explainer = ForestExplainer(model)
+            self._explainer = (model, explainer)
+
+        return explainer.explain_many(feature_dicts, top)
+
+    def explain(self, features, top=None):
+        return self.explain_many([features], top)[0]
+
+
+def _file_version(path):
+    """
+    SHA-256 of a model file, or of every file of an exported forest
+    directory (names included).
+    """
+    digest = hashlib.sha256()
+
+    if os.path.isdir(path):
+        files = []
+        for name in sorted(os.listdir(path)):
+            digest.update(name.encode("utf-8") + b"\0")
+            files.append(os.path.join(path, name))
+    else:
+        files = [path]
+
+    for name in files:
+        with open(name, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    return "sha256:" + digest.hexdigest()
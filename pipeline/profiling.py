@@ -0,0 +1,173 @@
+# profiling.py
+# Opt-in per-request profiling of the analysis pipeline.
+# Profiles are written to disk tagged with a hash of the input source.
+
+import cProfile
+import hashlib
+import itertools
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+from pipeline.analyze import analyze_source
+
+
+# --------------------------------------------------
+# Stack sampler
+# --------------------------------------------------
+
+class StackSampler:
+    """
+    Samples one thread's Python stack every `interval` seconds from a
+    background thread and aggregates collapsed stacks
+    ("outer;inner;leaf count"), the input format of flame-graph tools.
+    """
+
+    def __init__(self, thread_id, interval=0.001):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                module = os.path.splitext(os.path.basename(code.co_filename))[0]
+                names.append(f"{module}:{code.co_name}")
+                frame = frame.f_back
+
+            self.stacks[";".join(reversed(names))] += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def write(self, path):
+        with open(path, "w") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+# --------------------------------------------------
+# Profiled pipeline run
+# --------------------------------------------------
+
+def source_hash(code):
+    return hashlib.sha256(code.encode("utf-8")).hexdigest()[:16]
+
+
+# Keeps profiles of the same source written in the same millisecond
+# (by this process) apart
+_profile_ids = itertools.count()
+
+
+def analyze_with_profile(code, output_dir="profiles", mode="cprofile", save_input=False,
+                         budget=None):
+    """
+    Runs analyze_source under cProfile (.pstats) or the stack sampler
+    (.collapsed). The profile is written even if the analysis raises.
+    Returns the feature dictionary.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+
+    tag = f"{source_hash(code)}-{int(time.time() * 1000)}-{os.getpid()}-{next(_profile_ids)}"
+    base = os.path.join(output_dir, tag)
+
+    if save_input:
+        with open(base + ".mc", "w", encoding="utf-8") as f:
+            f.write(code)
+
+    if mode == "cprofile":
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            return analyze_source(code, budget=budget)
+        finally:
+            profiler.disable()
+            profiler.dump_stats(base + ".pstats")
+
+    elif mode == "sampler":
+        sampler = StackSampler(threading.get_ident())
+        sampler.start()
+        try:
+            return analyze_source(code, budget=budget)
+        finally:
+            sampler.stop()
+            sampler.write(base + ".collapsed")
+
+    else:
+        raise Exception(f"Unknown profiling mode: {mode}")
+
+
+# --------------------------------------------------
+# Profiling policy
+# --------------------------------------------------
+
+class Profiler:
+    """
+    Decides which requests are profiled:
+    - every request passed profile=True
+    - plus 1 in `sample_every` requests (0 disables sampling)
+    """
+
+    def __init__(self, sample_every=0, output_dir="profiles", mode="cprofile", save_input=False):
+        self.sample_every = sample_every
+        self.output_dir = output_dir
+        self.mode = mode
+        self.save_input = save_input
+
+        self._requests = itertools.count(1)
+
+    def should_profile(self, profile=False):
+        n = next(self._requests)
+        return profile or (self.sample_every > 0 and n % self.sample_every == 0)
+
+    def job(self, code, profile=False, budget=None):
+        """
+        Returns (callable, args) for an executor. The sampling decision
+        is made here, in the caller's process.
+        """
+        if self.should_profile(profile):
+            return analyze_with_profile, (
+                code, self.output_dir, self.mode, self.save_input, budget
+            )
+        return analyze_source, (code, None, budget)
+
+    def run(self, code, profile=False, budget=None):
+        func, args = self.job(code, profile, budget)
+        return func(*args)
+
+
+# --------------------------------------------------
+# Testing the Profiler
+# --------------------------------------------------
+if __name__ == "__main__":
+    import pstats
+
+    code = """
+    int a;
+    a = 10;
+    while (a < 100) {
+        a = a + 1;
+    }
+    """
+
+    analyze_with_profile(code, output_dir="profiles", mode="cprofile")
+    latest = max(
+        (os.path.join("profiles", p) for p in os.listdir("profiles") if p.endswith(".pstats")),
+        key=os.path.getmtime
+    )
+    pstats.Stats(latest).sort_stats("cumulative").print_stats(10)
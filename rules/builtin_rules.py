@@ -0,0 +1,58 @@
+# builtin_rules.py
+# The built-in checks: warnings drawn from the feature passes' results
+
+from rules.rule import Rule, register_rule
+
+
+# --------------------------------------------------
+# AST structure
+# --------------------------------------------------
+
+@register_rule
+class StructureRule(Rule):
+    name = "structure"
+    description = "Warns about deeply nested code"
+
+    MAX_DEPTH = 10
+
+    def finish(self, walk):
+        depth = walk.max_depth
+        if depth > self.MAX_DEPTH:
+            self.warnings.append(
+                f"Warning: High AST depth ({depth}) — code may be complex"
+            )
+
+
+# --------------------------------------------------
+# Unused variables
+# --------------------------------------------------
+
+@register_rule
+class UnusedVariablesRule(Rule):
+    name = "unused_variables"
+    description = "Variables declared (or taken as parameters) but never used"
+
+    def finish(self, walk):
+        for var in walk.passes["unused_variables"].unused:
+            where = ""
+            if self.symbols is not None and isinstance(var, int):
+                where = f" (line {self.symbols[var].decl_line})"
+
+            self.warnings.append(
+                f"Warning: Variable '{self.var_name(var)}' declared but never used{where}"
+            )
+
+
+# --------------------------------------------------
+# Calls
+# --------------------------------------------------
+
+@register_rule
+class CallsRule(Rule):
+    name = "calls"
+    description = "Calls to undefined functions or with the wrong arity"
+
+    def finish(self, walk):
+        for name, problem, line in walk.passes["calls"].invalid:
+            where = f" (line {line})" if line is not None else ""
+            self.warnings.append(f"Warning: Invalid call to '{name}': {problem}{where}")
@@ -0,0 +1,156 @@
+# feature_passes.py
+# The AST / CFG counts behind the feature vector, computed on every run
+# whichever rules are enabled
+
+from ast_nodes.ast_builder import (
+    ProgramNode,
+    DeclarationNode,
+    AssignmentNode,
+    IfNode,
+    WhileNode,
+    FunctionNode,
+    CallNode,
+    IdentifierNode
+)
+from cfg.cfg_builder import CFGNode
+from rules.rule import FeaturePass, register_feature_pass, handles
+
+
+# --------------------------------------------------
+# AST structure
+# --------------------------------------------------
+
+@register_feature_pass
+class StructurePass(FeaturePass):
+    name = "structure"
+    feature_names = (
+        "ast_max_depth", "if_statements", "while_loops", "loop_depth",
+        "assignments", "functions",
+    )
+
+    def __init__(self, symbols=None):
+        super().__init__(symbols)
+        self.features = {
+            "ast_max_depth": 0,
+            "if_statements": 0,
+            "while_loops": 0,
+            "loop_depth": 0,
+            "assignments": 0,
+            "functions": 0,
+        }
+
+    @handles(IfNode)
+    def if_statement(self, node, walk):
+        self.features["if_statements"] += 1
+
+    @handles(WhileNode)
+    def while_loop(self, node, walk):
+        self.features["while_loops"] += 1
+        self.features["loop_depth"] = max(self.features["loop_depth"], walk.loop_depth)
+
+    @handles(AssignmentNode)
+    def assignment(self, node, walk):
+        self.features["assignments"] += 1
+
+    @handles(FunctionNode)
+    def function(self, node, walk):
+        self.features["functions"] += 1
+
+    def finish(self, walk):
+        self.features["ast_max_depth"] = walk.max_depth
+
+
+# --------------------------------------------------
+# Unused variables
+# --------------------------------------------------
+
+@register_feature_pass
+class UnusedVariablesPass(FeaturePass):
+    name = "unused_variables"
+    feature_names = ("unused_variables",)
+
+    def __init__(self, symbols=None):
+        super().__init__(symbols)
+        self.declared = set()
+        self.used = set()
+        self.unused = set()     # variable keys (symbol IDs or names)
+
+    @handles(DeclarationNode)
+    def declaration(self, node, walk):
+        self.declared.add(node.identifier if node.sid is None else node.sid)
+
+    @handles(FunctionNode)
+    def function(self, node, walk):
+        if node.param_ids is not None:
+            self.declared.update(node.param_ids)
+        else:
+            self.declared.update(param for _, param in node.params)
+
+    @handles(AssignmentNode)
+    def assignment(self, node, walk):
+        self.used.add(node.identifier if node.sid is None else node.sid)
+
+    @handles(IdentifierNode)
+    def identifier(self, node, walk):
+        self.used.add(node.name if node.sid is None else node.sid)
+
+    def finish(self, walk):
+        self.unused = self.declared - self.used
+        self.features["unused_variables"] = len(self.unused)
+
+
+# --------------------------------------------------
+# Calls
+# --------------------------------------------------
+
+@register_feature_pass
+class CallsPass(FeaturePass):
+    name = "calls"
+    feature_names = ("function_calls", "invalid_calls")
+
+    def __init__(self, symbols=None):
+        super().__init__(symbols)
+        self.defined = {}       # top-level function name → parameter count
+        self.call_sites = []    # (function name, argument count, line)
+        self.invalid = []       # (function name, problem, line)
+
+    @handles(ProgramNode)
+    def program(self, node, walk):
+        for stmt in node.statements:
+            if isinstance(stmt, FunctionNode):
+                self.defined[stmt.name] = len(stmt.params)
+
+    @handles(CallNode)
+    def call(self, node, walk):
+        self.call_sites.append((node.name, len(node.args), node.lineno))
+
+    def finish(self, walk):
+        for name, argc, line in self.call_sites:
+            if name not in self.defined:
+                self.invalid.append((name, "undefined function", line))
+            elif self.defined[name] != argc:
+                self.invalid.append(
+                    (name, f"expects {self.defined[name]} arguments, got {argc}", line)
+                )
+
+        self.features["function_calls"] = len(self.call_sites)
+        self.features["invalid_calls"] = len(self.invalid)
+
+
+# --------------------------------------------------
+# CFG size
+# --------------------------------------------------
+
+@register_feature_pass
+class CFGSizePass(FeaturePass):
+    name = "cfg_size"
+    feature_names = ("cfg_nodes", "cfg_edges")
+
+    def __init__(self, symbols=None):
+        super().__init__(symbols)
+        self.features = {"cfg_nodes": 0, "cfg_edges": 0}
+
+    @handles(CFGNode)
+    def node(self, node, walk):
+        self.features["cfg_nodes"] += 1
+        self.features["cfg_edges"] += len(node.next)
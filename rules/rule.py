@@ -0,0 +1,119 @@
+# rule.py
+# Base classes and registries for the feature passes and checks run by
+# the rule engine
+
+# --------------------------------------------------
+# Registry
+# --------------------------------------------------
+
+# Rule name → Rule subclass, in registration order
+RULES = {}
+
+# Feature pass name → FeaturePass subclass, in registration order
+FEATURE_PASSES = {}
+
+
+def register_rule(rule_class):
+    """
+    Class decorator that makes a rule available to RuleEngine by name.
+    """
+    return _register(RULES, rule_class)
+
+
+def register_feature_pass(pass_class):
+    """
+    Class decorator that adds a feature pass to every RuleEngine.
+    """
+    return _register(FEATURE_PASSES, pass_class)
+
+
+def _register(registry, cls):
+    if not cls.name:
+        raise Exception(f"{cls.__name__} has no name")
+    if cls.name in registry and registry[cls.name] is not cls:
+        raise Exception(f"Duplicate name: {cls.name}")
+
+    registry[cls.name] = cls
+    return cls
+
+
+def handles(*node_types):
+    """
+    Marks a Rule method as the handler for the given AST or CFG node
+    classes (subclasses included). Handlers are called as
+    handler(rule, node, walk).
+    """
+    def mark(method):
+        method.handles = getattr(method, "handles", ()) + node_types
+        return method
+
+    return mark
+
+
+# --------------------------------------------------
+# Passes
+# --------------------------------------------------
+
+class Pass:
+    """
+    Common base of feature passes and rules. The engine creates a fresh
+    instance per run, calls the @handles methods during its single AST
+    walk and single CFG walk, then finish(walk).
+    """
+
+    name = None
+
+    def __init__(self, symbols=None):
+        self.symbols = symbols
+
+    def finish(self, walk):
+        pass
+
+    def var_name(self, var):
+        """
+        Name of a variable key (symbol ID or name).
+        """
+        if self.symbols is not None and isinstance(var, int):
+            return self.symbols.name(var)
+        return var
+
+    @classmethod
+    def handlers(cls):
+        """
+        Returns [(node class, function)] for every @handles method.
+        """
+        found = []
+        for attr in dir(cls):
+            function = getattr(cls, attr)
+            for node_type in getattr(function, "handles", ()):
+                found.append((node_type, function))
+        return found
+
+
+class FeaturePass(Pass):
+    """
+    Fills the feature columns in feature_names (self.features). Every
+    feature pass runs on every program, so the feature vector never
+    depends on the rule selection. Rules read a pass's results from
+    walk.passes[name] in their finish().
+    """
+
+    feature_names = ()
+
+    def __init__(self, symbols=None):
+        super().__init__(symbols)
+        self.features = {}
+
+
+class Rule(Pass):
+    """
+    A check that reports warnings (self.warnings). Only enabled rules
+    are instantiated and dispatched to; a disabled rule costs nothing.
+    Their finish() runs after every feature pass has finished.
+    """
+
+    description = ""
+
+    def __init__(self, symbols=None):
+        super().__init__(symbols)
+        self.warnings = []
@@ -0,0 +1,300 @@
+# rule_engine.py
+# Runs every feature pass and enabled rule in one AST walk and one CFG
+# walk, dispatching each node through a table compiled from their
+# @handles methods
+
+import threading
+import time
+
+from ast_nodes.ast_builder import (
+    ProgramNode,
+    AssignmentNode,
+    IfNode,
+    WhileNode,
+    FunctionNode,
+    ReturnNode,
+    CallNode,
+    BinaryOpNode,
+    FROZEN_CLASSES
+)
+from rules.rule import RULES, FEATURE_PASSES
+import rules.feature_passes  # registers the built-in feature passes
+import rules.builtin_rules  # registers the built-in rules
+
+
+# Child nodes of each AST node class, in source order. Each entry is
+# (attribute, is_list).
+CHILDREN = {
+    ProgramNode: (("statements", True),),
+    AssignmentNode: (("expression", False),),
+    IfNode: (("condition", False), ("body", True)),
+    WhileNode: (("condition", False), ("body", True)),
+    FunctionNode: (("body", True),),
+    ReturnNode: (("expression", False),),
+    CallNode: (("args", True),),
+    BinaryOpNode: (("left", False), ("right", False)),
+}
+
+# Interned expression nodes have the same children
+CHILDREN.update({
+    frozen: CHILDREN[base] for base, frozen in FROZEN_CLASSES.items() if base in CHILDREN
+})
+
+
+# --------------------------------------------------
+# Walk state
+# --------------------------------------------------
+
+class Walk:
+    """
+    Passed to every handler. During the AST walk `depth` is the node's
+    depth (root = 1) and `loop_depth` the number of while loops around
+    it, itself included. `passes` maps each feature pass name to its
+    instance for this run.
+    """
+
+    def __init__(self, symbols=None, passes=None):
+        self.symbols = symbols
+        self.passes = passes or {}
+
+        self.depth = 0
+        self.max_depth = 0
+        self.loop_depth = 0
+
+        self.ast_nodes = 0
+        self.cfg_nodes = 0
+
+
+# --------------------------------------------------
+# Rule Report
+# --------------------------------------------------
+
+class RuleReport:
+    def __init__(self, features, warnings, times):
+        self.features = features    # merged numeric features of all feature passes
+        self.warnings = warnings    # rule name → [warning]
+        self.times = times          # rule name → seconds spent in the rule
+
+    def all_warnings(self):
+        return [w for name in self.warnings for w in self.warnings[name]]
+
+
+# --------------------------------------------------
+# Rule Engine
+# --------------------------------------------------
+
+class RuleEngine:
+    """
+    enabled:  rule names to run (default: every registered rule)
+    disabled: rule names to leave out
+
+    Every feature pass runs, so the features do not depend on the rule
+    selection. Rules that are left out are not in the dispatch table
+    and do no work at all.
+
+    The dispatch table is built once per engine, so an engine can be
+    reused for any number of programs (and threads). Time spent in
+    each rule is returned per run and accumulated in self.times, and
+    time in each feature pass in self.pass_times.
+    """
+
+    def __init__(self, enabled=None, disabled=None):
+        names = list(enabled) if enabled is not None else list(RULES)
+        disabled = set(disabled or ())
+
+        for name in names + sorted(disabled):
+            if name not in RULES:
+                raise Exception(f"Unknown rule: {name}")
+
+        self.pass_classes = list(FEATURE_PASSES.values())
+        self.rule_classes = [RULES[name] for name in names if name not in disabled]
+        self.names = [rule_class.name for rule_class in self.rule_classes]
+
+        # node class → ((index, handler), ...); feature passes come
+        # first, then rules, in one list of instances per run
+        self.table = {}
+        for index, cls in enumerate(self.pass_classes + self.rule_classes):
+            for node_type, function in cls.handlers():
+                self.table.setdefault(node_type, []).append((index, function))
+
+        # Resolved per concrete node class on first sight (subclasses
+        # get their base classes' handlers)
+        self._dispatch = {}
+
+        self.times = dict.fromkeys(self.names, 0.0)
+        self.pass_times = dict.fromkeys(FEATURE_PASSES, 0.0)
+        self.runs = 0
+        self._lock = threading.Lock()
+
+    def _handlers(self, node_class):
+        handlers = self._dispatch.get(node_class)
+        if handlers is None:
+            handlers = []
+            for base in node_class.__mro__:
+                handlers.extend(self.table.get(base, ()))
+            handlers = self._dispatch[node_class] = tuple(handlers)
+        return handlers
+
+    # --------------------------------------------------
+    # Entry point
+    # --------------------------------------------------
+    def run(self, ast_root, cfg=None, symbols=None, budget=None):
+        """
+        Runs the feature passes and enabled rules over `ast_root` and
+        (if given) the program CFG. `budget` is an optional
+        AnalysisBudget whose deadline is checked while walking.
+        """
+        passes = [cls(symbols) for cls in self.pass_classes]
+        rules = [cls(symbols) for cls in self.rule_classes]
+        instances = passes + rules
+        times = [0.0] * len(instances)
+        walk = Walk(symbols, {p.name: p for p in passes})
+
+        self._walk_ast(ast_root, instances, times, walk, budget)
+        if cfg is not None:
+            self._walk_cfg(cfg, instances, times, walk, budget)
+
+        # Rules finish last, reading the feature passes' results
+        for index, instance in enumerate(instances):
+            start = time.perf_counter()
+            instance.finish(walk)
+            times[index] += time.perf_counter() - start
+
+        features = {}
+        for p in passes:
+            features.update(p.features)
+
+        rule_times = times[len(passes):]
+        with self._lock:
+            self.runs += 1
+            for p, seconds in zip(passes, times):
+                self.pass_times[p.name] += seconds
+            for name, seconds in zip(self.names, rule_times):
+                self.times[name] += seconds
+
+        return RuleReport(
+            features,
+            {rule.name: rule.warnings for rule in rules},
+            dict(zip(self.names, rule_times))
+        )
+
+    # --------------------------------------------------
+    # Walks
+    # --------------------------------------------------
+    def _walk_ast(self, ast_root, instances, times, walk, budget):
+        # Iterative pre-order walk, so deep nesting cannot overflow the
+        # Python stack. Shared (interned) subtrees are visited once per
+        # occurrence, as they are counted in the source.
+        clock = time.perf_counter
+        dispatch = self._dispatch
+        check_every = budget.DEADLINE_EVERY if budget is not None else 0
+
+        stack = [(ast_root, 1, 0)] if ast_root is not None else []
+        visited = 0
+        max_depth = 0
+
+        while stack:
+            node, depth, loop_depth = stack.pop()
+            node_class = type(node)
+            if node_class is WhileNode:
+                loop_depth += 1
+
+            walk.depth = depth
+            walk.loop_depth = loop_depth
+            if depth > max_depth:
+                max_depth = walk.max_depth = depth
+
+            handlers = dispatch.get(node_class)
+            if handlers is None:
+                handlers = self._handlers(node_class)
+            for index, function in handlers:
+                start = clock()
+                function(instances[index], node, walk)
+                times[index] += clock() - start
+
+            visited += 1
+            if check_every and visited % check_every == 0:
+                budget.check_deadline()
+
+            for attr, is_list in CHILDREN.get(node_class, ())[::-1]:
+                value = getattr(node, attr)
+                if is_list:
+                    for child in reversed(value):
+                        if child is not None:
+                            stack.append((child, depth + 1, loop_depth))
+                elif value is not None:
+                    stack.append((value, depth + 1, loop_depth))
+
+        walk.ast_nodes = visited
+
+    def _walk_cfg(self, cfg, instances, times, walk, budget):
+        clock = time.perf_counter
+        dispatch = self._dispatch
+        check_every = budget.DEADLINE_EVERY if budget is not None else 0
+
+        for visited, node in enumerate(cfg.nodes, 1):
+            handlers = dispatch.get(type(node))
+            if handlers is None:
+                handlers = self._handlers(type(node))
+            for index, function in handlers:
+                start = clock()
+                function(instances[index], node, walk)
+                times[index] += clock() - start
+
+            if check_every and visited % check_every == 0:
+                budget.check_deadline()
+
+        walk.cfg_nodes = len(cfg.nodes)
+
+    # --------------------------------------------------
+    # Timing report
+    # --------------------------------------------------
+    def timing_report(self):
+        """
+        Rules, then feature passes, by total time spent, slowest first.
+        """
+        lines = [f"{self.runs} runs"]
+        for title, times in (("rules", self.times), ("feature passes", self.pass_times)):
+            lines.append(f" {title}:")
+            for name, seconds in sorted(times.items(), key=lambda item: -item[1]):
+                lines.append(f"  {name:<20} {seconds * 1000:9.2f} ms")
+        return "\n".join(lines)
+
+
+# --------------------------------------------------
+# Testing the Rule Engine
+# --------------------------------------------------
+if __name__ == "__main__":
+    from lexer_parser.parser import parse_ast
+    from cfg.cfg_builder import CFGBuilder
+
+    code = """
+    int add(int x, int y) {
+        return x + y;
+    }
+    int a;
+    int b;
+    a = 10;
+    while (a < 20) {
+        if (a > 5) {
+            a = add(a);
+        }
+    }
+    """
+
+    ast, symbols = parse_ast(code)
+    cfg = CFGBuilder().build(ast)
+
+    engine = RuleEngine()
+    report = engine.run(ast, cfg, symbols)
+
+    print("Features:", report.features)
+    for warning in report.all_warnings():
+        print("-", warning)
+
+    print("Without the calls rule (same features, no call warnings):")
+    quiet = RuleEngine(disabled=["calls"]).run(ast, cfg, symbols)
+    print(quiet.features == report.features, quiet.all_warnings())
+
+    print("Time per rule:")
+    print(engine.timing_report())
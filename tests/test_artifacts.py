@@ -0,0 +1,74 @@
+# test_artifacts.py
+# Writing and reading back the binary artifacts gives the same AST,
+# CFG and data-flow results, whatever the literals hold
+
+import pytest
+
+from ast_nodes.ast_builder import ExpressionInterner
+from ast_nodes.ast_printer import to_source
+from cfg.cfg_builder import CFGBuilder
+from data_flow.data_flow_analyzer import DataFlowAnalyzer
+from dataset.ast_generator import ASTProgramGenerator
+from lexer_parser.parser import parse_ast
+from pipeline.artifacts import dump_artifacts, load_artifacts, read_artifacts, write_artifacts
+
+
+def numbers(node, found):
+    if node.nodetype == "Number":
+        found.append(node.value)
+    for value in vars(node).values():
+        for child in value if isinstance(value, list) else [value]:
+            if hasattr(child, "nodetype"):
+                numbers(child, found)
+    return found
+
+
+def round_trip(code, interner=None):
+    ast, symbols = parse_ast(code, interner)
+    cfg = CFGBuilder().build(ast)
+    report = DataFlowAnalyzer(cfg, symbols=symbols).analyze()
+
+    reader = load_artifacts(dump_artifacts(ast=ast, cfg=cfg, dataflow=report,
+                                           warnings=report["warnings"]))
+
+    assert to_source(reader.ast()) == to_source(ast)
+    assert numbers(reader.ast(), []) == numbers(ast, [])
+    assert [str(n) for n in reader.cfg().nodes] == [str(n) for n in cfg.nodes]
+    assert reader.dataflow()["in_sets"] == report["in_sets"]
+    assert reader.dataflow()["out_sets"] == report["out_sets"]
+    assert reader.warnings() == report["warnings"]
+    return reader
+
+
+@pytest.mark.parametrize("literal", [
+    0, 2 ** 31, 2 ** 63 - 1, 2 ** 63, 99999999999999999999, 10 ** 40,
+])
+def test_literals_of_any_size(literal):
+    reader = round_trip(f"int a;\na = {literal};\nif (a > 1) {{\n  a = a + {literal};\n}}\n")
+    assert literal in numbers(reader.ast(), [])
+
+
+def test_negative_literal_outside_int64():
+    ast, _ = parse_ast("int a;\na = 5;\n")
+    ast.statements[1].expression.value = -2 ** 70
+
+    rebuilt = load_artifacts(dump_artifacts(ast=ast)).ast()
+    assert rebuilt.statements[1].expression.value == -2 ** 70
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+@pytest.mark.parametrize("interned", [False, True])
+def test_generated_programs(seed, interned):
+    generator = ASTProgramGenerator(seed=seed, statements=(5, 12), depth=(0, 2))
+    for _ in range(25):
+        round_trip(generator.generate().source, ExpressionInterner() if interned else None)
+
+
+def test_file_round_trip(tmp_path):
+    ast, symbols = parse_ast("int a;\na = 99999999999999999999;\n")
+    path = str(tmp_path / "program.mcaf")
+    write_artifacts(path, ast=ast)
+
+    reader = read_artifacts(path)
+    assert to_source(reader.ast()) == to_source(ast)
+    reader.close()
@@ -0,0 +1,66 @@
+# test_ast_builder.py
+# Expression interning: frozen shared nodes and constant folding
+
+import pickle
+
+import pytest
+
+from ast_nodes.ast_builder import ExpressionInterner, FrozenNode, INT_MAX, _fold
+from cfg.cfg_builder import CFGBuilder
+from dataset.auto_dataset_generator import analyze, analyze_ast
+from dataset.ast_generator import ASTProgramGenerator
+from features.feature_extractor import FeatureExtractor
+from lexer_parser.parser import parse_ast
+
+
+def test_only_interned_nodes_are_frozen():
+    ast, _ = parse_ast("int a; a = a + 1; a = a + 1;", ExpressionInterner())
+    first, second = ast.statements[1], ast.statements[2]
+
+    assert first.expression is second.expression
+    assert isinstance(first.expression, FrozenNode)
+    with pytest.raises(AttributeError):
+        first.expression.left = None
+
+    first.identifier = "b"      # statements are not shared
+    assert not isinstance(first, FrozenNode)
+
+
+def test_frozen_nodes_pickle():
+    ast, _ = parse_ast("int a; a = a * 2;", ExpressionInterner())
+    expression = ast.statements[1].expression
+
+    copy = pickle.loads(pickle.dumps(expression))
+    assert str(copy) == str(expression) and isinstance(copy, FrozenNode)
+
+
+@pytest.mark.parametrize("operator, a, b, expected", [
+    ("+", 2, 3, 5),
+    ("/", 7, 2, 3),
+    ("/", -7, 2, -3),       # C truncates towards zero
+    ("<", 1, 2, 1),
+    ("/", 1, 0, None),      # kept visible
+    ("+", INT_MAX, 1, None),    # signed overflow is undefined
+    ("*", 65536, 65536, None),
+    ("+", 2 ** 40, 0, None),    # operand wider than int
+])
+def test_fold(operator, a, b, expected):
+    assert _fold(operator, a, b) == expected
+
+
+def test_interning_keeps_features():
+    generator = ASTProgramGenerator(seed=4, statements=(5, 12), depth=(0, 2))
+
+    for _ in range(40):
+        source = generator.generate().source
+        plain, symbols = parse_ast(source)
+        shared, shared_symbols = parse_ast(source, ExpressionInterner(fold_constants=False))
+
+        assert FeatureExtractor().extract(plain, CFGBuilder().build(plain), symbols) == \
+            FeatureExtractor().extract(shared, CFGBuilder().build(shared), shared_symbols)
+
+
+def test_syntax_errors_give_no_row(capsys):
+    assert analyze("int ;") is None
+    assert analyze_ast(parse_ast("a = ;")[0]) is None
+    assert analyze("int a;\na = 1;\n") is not None
@@ -0,0 +1,75 @@
+# test_async_analyzer.py
+# Requests give the same features as analyze_source, are shed beyond
+# the in-flight limit, and keep their slot until the pool is done
+
+import asyncio
+import threading
+
+import pytest
+
+import pipeline.async_analyzer as async_analyzer
+from pipeline.analyze import analyze_source
+from pipeline.async_analyzer import AnalyzerOverloaded, AsyncAnalyzer
+
+
+CODE = "int a;\na = 10;\nif (a > 5) {\n  a = a + 1;\n}\n"
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_results_match_analyze_source(executor):
+    async def run():
+        async with AsyncAnalyzer(executor, max_workers=2, timeout=60) as analyzer:
+            return await asyncio.gather(*(analyzer.analyze(CODE) for _ in range(4)))
+
+    assert asyncio.run(run()) == [analyze_source(CODE)] * 4
+
+
+@pytest.fixture
+def blocked(monkeypatch):
+    """analyze_source waits until the returned event is set."""
+    release = threading.Event()
+
+    def waiting(*args):
+        release.wait(10)
+        return analyze_source(*args)
+
+    monkeypatch.setattr(async_analyzer, "analyze_source", waiting)
+    yield release
+    release.set()
+
+
+def test_requests_beyond_the_limit_are_rejected(blocked):
+    async def run():
+        async with AsyncAnalyzer(max_workers=1, max_in_flight=2) as analyzer:
+            running = [asyncio.ensure_future(analyzer.analyze(CODE)) for _ in range(2)]
+            await asyncio.sleep(0)
+
+            with pytest.raises(AnalyzerOverloaded):
+                await analyzer.analyze(CODE)
+
+            blocked.set()
+            results = await asyncio.gather(*running)
+            return results, analyzer.rejected, analyzer.in_flight
+
+    results, rejected, in_flight = asyncio.run(run())
+    assert results == [analyze_source(CODE)] * 2
+    assert rejected == 1 and in_flight == 0
+
+
+def test_timed_out_work_keeps_its_slot_until_it_ends(blocked):
+    async def run():
+        async with AsyncAnalyzer(max_workers=1, max_in_flight=1) as analyzer:
+            with pytest.raises(asyncio.TimeoutError):
+                await analyzer.analyze(CODE, timeout=0.05)
+
+            # Still running in the pool, so it still counts
+            assert analyzer.in_flight == 1
+            with pytest.raises(AnalyzerOverloaded):
+                await analyzer.analyze(CODE)
+
+            blocked.set()
+            while analyzer.in_flight:
+                await asyncio.sleep(0.01)
+            return await analyzer.analyze(CODE)
+
+    assert asyncio.run(run()) == analyze_source(CODE)
@@ -0,0 +1,57 @@
+# test_attributions.py
+# Tree-path attributions add up to the forest's probability and keep
+# the model's column names, however the model recorded them
+
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from ml.attributions import ForestExplainer
+from ml.shared_model import SharedForest, export_forest, model_columns
+
+
+COLUMNS = ["use_before_init", "dead_assignments", "ast_max_depth", "loop_depth"]
+
+
+def data(rows=300, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.integers(0, 6, size=(rows, len(COLUMNS))).astype(np.float64)
+    y = ((X[:, 0] > 2) | (X[:, 1] + X[:, 3] > 7)).astype(int)
+    return X, y
+
+
+@pytest.fixture(scope="module")
+def forest():
+    X, y = data()
+    return RandomForestClassifier(n_estimators=15, max_depth=6, random_state=0).fit(X, y)
+
+
+def test_contributions_add_up_to_predict_proba(forest):
+    forest.feature_columns = list(COLUMNS)
+    explainer = ForestExplainer(forest)
+
+    X, _ = data(50, seed=1)
+    proba = explainer.bias + explainer.contributions(X).sum(axis=1)
+    assert np.allclose(proba, forest.predict_proba(X)[:, 1])
+
+    rows = [dict(zip(COLUMNS, row)) for row in X]
+    for row, explanation, expected in zip(rows, explainer.explain_many(rows), proba):
+        assert explanation["probability"] == pytest.approx(expected)
+        assert set(explanation["contributions"]) == set(COLUMNS)
+
+
+def test_columns_from_feature_names_in(tmp_path):
+    # A model fitted on a DataFrame records its columns as a numpy array
+    model = RandomForestClassifier(n_estimators=3, random_state=0).fit(*data())
+    model.feature_names_in_ = np.asarray(COLUMNS, dtype=object)
+
+    assert model_columns(model) == COLUMNS
+    assert ForestExplainer(model).feature_names == COLUMNS
+    assert SharedForest.load(export_forest(model, str(tmp_path / "forest"))).feature_columns == COLUMNS
+
+
+def test_columns_default_to_positions():
+    model = RandomForestClassifier(n_estimators=3, random_state=0).fit(*data())
+
+    assert model_columns(model) is None
+    assert ForestExplainer(model).feature_names == [f"x{i}" for i in range(len(COLUMNS))]
@@ -0,0 +1,86 @@
+# test_budget.py
+# Runs stopped by an AnalysisBudget report the truncation and are
+# never scored as if their partial features were complete
+
+import asyncio
+
+import pytest
+
+from features.feature_extractor import FEATURE_NAMES
+from features.feature_store import FeatureStore
+from pipeline.analyze import analyze_source
+from pipeline.async_analyzer import AsyncAnalyzer, AnalysisTruncated
+from pipeline.budget import AnalysisBudget, BudgetExceeded
+from pipeline.chunked_parse import parse_parallel, _parse
+from pipeline.directory_scan import scan_directory
+from pipeline.predictor import Predictor
+
+
+SMALL = "int a;\na = 1;\nif (a > 0) {\n  a = a + 1;\n}\n"
+NESTED = "int a;\na = 0;\n" + "while (a < 9) {\n" * 50 + "a = a + 1;\n" + "}\n" * 50
+LARGE = "int a;\n" + "a = 1;\nif (a > 0) {\n  a = a + 1;\n}\n" * 200
+
+
+def test_partial_features_have_only_feature_columns():
+    budget = AnalysisBudget(max_cfg_nodes=20)
+    features = analyze_source(NESTED, budget=budget)
+
+    assert budget.exceeded
+    assert list(features) == list(FEATURE_NAMES)
+
+
+def test_scan_stores_no_prediction_for_truncated_files(tmp_path):
+    source = tmp_path / "src"
+    source.mkdir()
+    (source / "small.mc").write_text(SMALL)
+    (source / "nested.mc").write_text(NESTED)
+
+    store = FeatureStore(str(tmp_path / "features.db"))
+    counts = scan_directory(str(source), store, Predictor(),
+                            budget=AnalysisBudget(max_cfg_nodes=20))
+    assert counts["analyzed"] == 2
+
+    small = store.get(str(source / "small.mc"))
+    nested = store.get(str(source / "nested.mc"))
+    store.close()
+
+    assert small["error"] is None and small["prediction"] is not None
+    assert "max_cfg_nodes" in nested["error"]
+    assert nested["prediction"] is None
+    assert list(nested["features"]) == list(FEATURE_NAMES)
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_async_requests_raise_when_truncated(executor):
+    async def run():
+        async with AsyncAnalyzer(executor, max_workers=1, timeout=60,
+                                 budget=AnalysisBudget(max_cfg_nodes=20)) as analyzer:
+            features = await analyzer.analyze(SMALL)
+            with pytest.raises(AnalysisTruncated) as truncated:
+                await analyzer.analyze(NESTED)
+        return features, truncated.value
+
+    features, truncated = asyncio.run(run())
+    assert list(features) == list(FEATURE_NAMES)
+    assert "max_cfg_nodes" in str(truncated)
+    assert list(truncated.features) == list(FEATURE_NAMES)
+
+
+def test_chunked_parse_counts_every_token():
+    sequential = AnalysisBudget()
+    _parse(LARGE, 1, sequential)
+
+    chunked = AnalysisBudget()
+    parse_parallel(LARGE, 2, chunk_bytes=512, budget=chunked)
+    assert chunked.tokens == sequential.tokens
+
+    budget = AnalysisBudget(max_tokens=sequential.tokens // 2)
+    features = analyze_source(LARGE, parse_workers=2, budget=budget)
+    assert budget.exceeded.limit == "max_tokens"
+    assert list(features) == list(FEATURE_NAMES)
+
+
+def test_chunked_parse_checks_the_deadline():
+    budget = AnalysisBudget(deadline=0)
+    with pytest.raises(BudgetExceeded, match="deadline"):
+        parse_parallel(LARGE, 2, chunk_bytes=512, budget=budget)
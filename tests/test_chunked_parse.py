@@ -0,0 +1,101 @@
+# test_chunked_parse.py
+# Parsing a file in parallel chunks must give the same AST, CFG,
+# symbols and features as one sequential parse
+
+import pytest
+
+import pipeline.chunked_parse as chunked_parse
+from dataset.ast_generator import ASTProgramGenerator
+from features.feature_extractor import FeatureExtractor
+from pipeline.chunked_parse import parse_parallel, split_top_level, _parse
+from rules.rule_engine import CHILDREN
+
+
+FUNCTION = "int f(int x) {\n  int y;\n  while (x > 0) { x = x - 1; }\n  return x + y;\n}\n"
+DEEP = (
+    "int a;\na = 1;\n" * 100
+    + "a = " + " + ".join(["a"] * 3000) + ";\n"
+    + "int b;\nb = a;\n" * 100
+)
+
+
+@pytest.fixture(scope="module")
+def source():
+    generator = ASTProgramGenerator(seed=7, statements=(3, 8), depth=(0, 2), variables=(1, 30))
+    programs = [generator.generate().source for _ in range(120)]
+    return FUNCTION + "\n".join(programs[:60]) + "\n" + FUNCTION + "\n".join(programs[60:])
+
+
+def symbol_ids(statements):
+    ids = []
+    stack = list(statements)
+    while stack:
+        node = stack.pop()
+        ids.append((node.nodetype, getattr(node, "sid", None), getattr(node, "param_ids", None)))
+        for attr, is_list in CHILDREN.get(type(node), ()):
+            value = getattr(node, attr)
+            stack.extend(value if is_list else [value])
+    return ids
+
+
+def test_split_covers_the_source(source):
+    ranges = split_top_level(source, chunk_bytes=2048)
+
+    assert len(ranges) > 4
+    assert ranges[0][0] == 0 and ranges[-1][1] == len(source)
+    for (_, end, _), (start, _, line) in zip(ranges, ranges[1:]):
+        assert end == start
+        assert line == source.count("\n", 0, start) + 1
+
+
+def test_chunked_parse_matches_sequential(source):
+    ast, cfg, symbols = _parse(source, 1)
+    chunked_ast, chunked_cfg, chunked_symbols = parse_parallel(source, 2, chunk_bytes=2048)
+
+    assert repr(chunked_ast) == repr(ast)
+    assert [s.lineno for s in chunked_ast.statements] == [s.lineno for s in ast.statements]
+    assert symbol_ids(chunked_ast.statements) == symbol_ids(ast.statements)
+
+    assert [(s.id, s.name, s.datatype, s.decl_line) for s in chunked_symbols] == \
+        [(s.id, s.name, s.datatype, s.decl_line) for s in symbols]
+
+    def shape(graph):
+        index = {node.id: i for i, node in enumerate(graph.nodes)}
+        return [
+            (node.label, node.defs, node.uses, node.declares, [index[n.id] for n in node.next])
+            for node in graph.nodes
+        ]
+
+    assert shape(chunked_cfg) == shape(cfg)
+    assert chunked_cfg.max_loop_depth == cfg.max_loop_depth
+
+    assert FeatureExtractor().extract(chunked_ast, chunked_cfg, chunked_symbols) == \
+        FeatureExtractor().extract(ast, cfg, symbols)
+
+
+def test_syntax_error_falls_back_to_sequential_parse(source, capsys):
+    ast, cfg, _ = parse_parallel(source + "a = ;\n", 2, chunk_bytes=2048)
+
+    assert ast is None and cfg is None
+    assert "Syntax error" in capsys.readouterr().out
+
+
+def test_deep_expression_in_a_chunk():
+    ast, _, _ = _parse(DEEP, 1)
+    chunked_ast, chunked_cfg, _ = parse_parallel(DEEP, 2, chunk_bytes=2000)
+
+    assert len(chunked_ast.statements) == len(ast.statements)
+    assert symbol_ids(chunked_ast.statements) == symbol_ids(ast.statements)
+    assert len(chunked_cfg.nodes) == 401
+
+
+def failing_chunk(job):
+    raise MemoryError("worker died")
+
+
+def test_worker_exception_falls_back_to_sequential_parse(source, monkeypatch):
+    monkeypatch.setattr(chunked_parse, "_parse_chunk", failing_chunk)
+    ast, cfg, _ = parse_parallel(source, 2, chunk_bytes=2048)
+
+    assert repr(ast) == repr(_parse(source, 1)[0])
+    assert cfg is not None
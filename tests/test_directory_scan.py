@@ -0,0 +1,168 @@
+# test_directory_scan.py
+# Incremental scans: files that vanish or cannot be read, content that
+# is already stored under another path, and rows from another feature
+# schema or model
+
+import os
+import sqlite3
+
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+import pipeline.directory_scan as directory_scan
+from features.feature_extractor import FEATURE_NAMES, FEATURE_SCHEMA_VERSION
+from features.feature_store import FeatureStore
+from pipeline.directory_scan import scan_directory, _analyze_file
+from pipeline.predictor import Predictor
+
+
+CODE = "int a;\nint b;\na = 1;\nif (a > 0) {\n  a = a + 1;\n}\n"
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / "src"
+    root.mkdir()
+    (root / "a.mc").write_text(CODE)
+    return root
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = FeatureStore(str(tmp_path / "features.db"))
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def analyses(monkeypatch):
+    calls = []
+    analyze_source = directory_scan.analyze_source
+
+    def counting(code, **kwargs):
+        calls.append(code)
+        return analyze_source(code, **kwargs)
+
+    monkeypatch.setattr(directory_scan, "analyze_source", counting)
+    return calls
+
+
+def model_predictor(label):
+    model = RandomForestClassifier(n_estimators=1).fit([[0] * 13, [1] * 13], [label, label])
+    model.feature_columns = list(FEATURE_NAMES)
+    model.feature_schema = FEATURE_SCHEMA_VERSION
+
+    predictor = Predictor()
+    predictor.set_model(model)
+    return predictor
+
+
+def test_renamed_file_reuses_the_stored_result(tree, store, analyses):
+    scan_directory(str(tree), store, Predictor())
+    before = store.get(str(tree / "a.mc"))
+
+    os.rename(tree / "a.mc", tree / "b.mc")
+    (tree / "c.mc").write_text(CODE)
+    counts = scan_directory(str(tree), store, Predictor())
+
+    assert len(analyses) == 1
+    assert counts == {"analyzed": 0, "unchanged": 2, "removed": 1}
+    assert store.get(str(tree / "a.mc")) is None
+    for name in ("b.mc", "c.mc"):
+        after = store.get(str(tree / name))
+        assert after["features"] == before["features"]
+        assert after["prediction"] == before["prediction"]
+
+
+def test_changed_file_is_analyzed_again(tree, store, analyses):
+    scan_directory(str(tree), store, Predictor())
+    (tree / "a.mc").write_text(CODE + "b = a;\n")
+    scan_directory(str(tree), store, Predictor())
+
+    assert len(analyses) == 2
+    assert store.get(str(tree / "a.mc"))["features"]["assignments"] == 3
+
+
+def test_vanished_files_count_as_removed(tree, store, monkeypatch):
+    walk_sources = directory_scan.walk_sources
+
+    def with_ghost(root, extensions):
+        yield from walk_sources(root, extensions)
+        yield os.path.join(root, "ghost.mc")
+
+    monkeypatch.setattr(directory_scan, "walk_sources", with_ghost)
+    counts = scan_directory(str(tree), store, Predictor())
+
+    assert counts == {"analyzed": 1, "unchanged": 0, "removed": 0}
+
+    path, content_hash, features, error, _ = _analyze_file((str(tree / "ghost.mc"), None, None))
+    assert content_hash is None and features is None
+    assert isinstance(error, FileNotFoundError)
+
+
+def test_unreadable_file_is_stored_as_an_error(tree, store, monkeypatch):
+    (tree / "locked.mc").write_text(CODE)
+
+    def locked_open(path, *args):
+        if path.endswith("locked.mc"):
+            raise PermissionError(13, "Permission denied", path)
+        return open(path, *args)
+
+    monkeypatch.setattr(directory_scan, "open", locked_open, raising=False)
+    counts = scan_directory(str(tree), store, Predictor())
+
+    entry = store.get(str(tree / "locked.mc"))
+    assert counts == {"analyzed": 2, "unchanged": 0, "removed": 0}
+    assert entry["prediction"] is None and "Permission denied" in entry["error"]
+    assert store.get(str(tree / "a.mc"))["prediction"] is not None
+
+
+def test_rows_from_another_model_are_not_reused(tree, store, analyses):
+    first, second = model_predictor(0), model_predictor(1)
+    scan_directory(str(tree), store, first)
+    assert scan_directory(str(tree), store, first)["analyzed"] == 0
+
+    # Same content under a new path: the other model's row is not copied
+    os.rename(tree / "a.mc", tree / "b.mc")
+    counts = scan_directory(str(tree), store, second)
+
+    assert counts == {"analyzed": 1, "unchanged": 0, "removed": 1}
+    assert store.get(str(tree / "b.mc"))["prediction"] == 1
+    assert store.stat_index()[str(tree / "b.mc")][3:] == \
+        (FEATURE_SCHEMA_VERSION, second.model_version)
+
+    content_hash = store.get(str(tree / "b.mc"))["content_hash"]
+    assert store.find_by_hash(content_hash, FEATURE_SCHEMA_VERSION, first.model_version) is None
+
+
+def test_rows_from_another_schema_are_analyzed_again(tree, store, analyses, monkeypatch):
+    scan_directory(str(tree), store, Predictor())
+
+    monkeypatch.setattr(directory_scan, "FEATURE_SCHEMA_VERSION", FEATURE_SCHEMA_VERSION + 1)
+    counts = scan_directory(str(tree), store, Predictor())
+
+    assert len(analyses) == 2
+    assert counts == {"analyzed": 1, "unchanged": 0, "removed": 0}
+
+
+def test_untagged_store_is_migrated(tree, tmp_path, analyses):
+    path = str(tmp_path / "old.db")
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE files (path TEXT PRIMARY KEY, content_hash TEXT NOT NULL, "
+        "mtime REAL NOT NULL, size INTEGER NOT NULL, features TEXT, prediction INTEGER, "
+        "error TEXT, analyzed_at REAL NOT NULL)"
+    )
+    st = os.stat(tree / "a.mc")
+    conn.execute("INSERT INTO files VALUES (?, 'x', ?, ?, '{}', 0, NULL, 0)",
+                 (str(tree / "a.mc"), st.st_mtime, st.st_size))
+    conn.commit()
+    conn.close()
+
+    store = FeatureStore(path)
+    counts = scan_directory(str(tree), store, Predictor())
+    entry = store.get(str(tree / "a.mc"))
+    store.close()
+
+    assert counts["analyzed"] == 1 and len(analyses) == 1
+    assert entry["features"]["assignments"] == 2
@@ -0,0 +1,49 @@
+# test_feature_matrix.py
+# CSV → memory-mapped feature matrix conversion and cache invalidation
+
+import csv
+import json
+
+import numpy as np
+
+from ml.feature_matrix import FORMAT_VERSION, cache_paths, load_feature_matrix
+
+
+def write_csv(path):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["assignments", "cfg_nodes", "label", "code"])
+        writer.writerow([1, 3, 1, "int a;\na = 1;\n"])
+        writer.writerow([2, 4, 0, "int b;\nb = 2;\nb = b + 1;\n"])
+
+
+def test_multiline_code_column_counts_records(tmp_path):
+    path = str(tmp_path / "data.csv")
+    write_csv(path)
+
+    X, y, columns = load_feature_matrix(path)
+
+    assert columns == ["assignments", "cfg_nodes"]
+    assert X.shape == (2, 2)
+    assert np.array_equal(X, [[1, 3], [2, 4]])
+    assert list(y) == [1, 0]
+
+
+def test_cache_from_another_format_version_is_rebuilt(tmp_path):
+    path = str(tmp_path / "data.csv")
+    write_csv(path)
+    load_feature_matrix(path)
+
+    meta_path = cache_paths(path)["meta"]
+    with open(meta_path) as f:
+        meta = json.load(f)
+    del meta["version"]
+    meta["columns"] = ["stale"]
+    with open(meta_path, "w") as f:
+        json.dump(meta, f)
+
+    _, _, columns = load_feature_matrix(path)
+
+    with open(meta_path) as f:
+        assert json.load(f)["version"] == FORMAT_VERSION
+    assert columns == ["assignments", "cfg_nodes"]
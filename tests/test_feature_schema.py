@@ -0,0 +1,79 @@
+# test_feature_schema.py
+# Datasets and models record the feature schema they were built with,
+# and the predictor refuses models trained on another one
+
+import csv
+
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from dataset.auto_dataset_generator import generate_dataset
+from features.feature_extractor import FEATURE_NAMES, FEATURE_SCHEMA_VERSION
+from ml.feature_matrix import feature_schema, load_feature_matrix
+from ml.parallel_train import _fit_final, train_all
+from ml.shared_model import SharedForest
+from pipeline.analyze import analyze_source
+from pipeline.predictor import Predictor
+
+
+CODE = "int a;\nint b;\na = 1;\nwhile (a < 5) {\n  a = a + 1;\n}\n"
+
+
+def header(csv_path):
+    with open(csv_path, newline="") as f:
+        return next(csv.reader(f))
+
+
+def test_committed_dataset_matches_the_schema():
+    path = "dataset/large_static_dataset.csv"
+
+    assert header(path) == list(FEATURE_NAMES) + ["label", "feature_schema"]
+    assert feature_schema(path) == FEATURE_SCHEMA_VERSION
+
+
+def test_trained_models_record_the_schema(tmp_path):
+    path = str(tmp_path / "dataset.csv")
+    generate_dataset(samples_per_type=10, output_csv=path)
+
+    _, _, columns = load_feature_matrix(path)
+    _, model = _fit_final(path, "random_forest", columns)
+
+    assert columns == list(FEATURE_NAMES)
+    assert model.feature_schema == FEATURE_SCHEMA_VERSION
+    assert SharedForest.from_model(model).feature_schema == FEATURE_SCHEMA_VERSION
+
+    predictor = Predictor()
+    predictor.set_model(model)
+    assert predictor.predict(analyze_source(CODE)) in (0, 1)
+
+
+def test_old_datasets_are_not_trained_on(tmp_path):
+    path = str(tmp_path / "old.csv")
+    old_columns = [
+        "ast_max_depth", "unused_variables", "if_statements", "assignments",
+        "cfg_nodes", "cfg_edges", "use_before_init", "dead_assignments", "label",
+    ]
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(old_columns)
+        writer.writerows([[1, 0, 0, 1, 3, 2, 0, label, label] for label in (0, 1) * 5])
+
+    assert feature_schema(path) is None
+    with pytest.raises(Exception, match="feature schema None"):
+        train_all(path, folds=2, n_jobs=1, output_dir=str(tmp_path / "models"))
+
+
+@pytest.mark.parametrize("columns, schema, message", [
+    (None, None, "feature columns"),
+    (list(FEATURE_NAMES[:8]), None, "feature schema None"),
+    (list(FEATURE_NAMES), FEATURE_SCHEMA_VERSION - 1, "feature schema 2"),
+])
+def test_predictor_refuses_mismatched_models(columns, schema, message):
+    model = RandomForestClassifier(n_estimators=2).fit([[0] * 13, [1] * 13], [0, 1])
+    if columns is not None:
+        model.feature_columns = columns
+    if schema is not None:
+        model.feature_schema = schema
+
+    with pytest.raises(Exception, match=message):
+        Predictor().set_model(model)
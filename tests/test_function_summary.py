@@ -0,0 +1,39 @@
+# test_function_summary.py
+# Cached function summaries hold nothing specific to the file they
+# were computed for, and every definition of a function is summarized
+
+from data_flow.function_summary import SummaryCache, analyze_functions
+from lexer_parser.parser import parse_ast
+from pipeline.analyze import analyze_source
+
+
+LEAKY = "int f(int x) {\n  int y;\n  int z;\n  x = y + 1;\n  return x;\n}\n"
+
+
+def test_summaries_are_the_same_in_any_file(tmp_path):
+    cache = SummaryCache(str(tmp_path))
+
+    first, symbols = parse_ast(LEAKY + "int a;\na = f(1);\n")
+    second, other = parse_ast("int b;\nint c;\nb = 2;\n\n\n" + LEAKY)
+
+    fresh = analyze_functions(first, cache, symbols=symbols)
+    reused = analyze_functions(second, SummaryCache(str(tmp_path)), symbols=other)
+
+    assert cache.misses == 1
+    (summary,) = fresh.values()
+    (cached,) = reused.values()
+    assert summary.to_dict() == cached.to_dict()
+    assert summary.use_before_init == 1 and summary.unused_variables == 1
+    assert "warnings" not in summary.to_dict()
+
+
+def test_functions_defined_twice_are_both_summarized():
+    code = LEAKY + "int f(int x) {\n  return x;\n}\n"
+    ast, symbols = parse_ast(code)
+
+    summaries = analyze_functions(ast, symbols=symbols)
+
+    assert sorted(summaries) == [("f", 0), ("f", 1)]
+    assert [s.use_before_init for s in summaries.values()] == [1, 0]
+    assert analyze_source(LEAKY + LEAKY)["use_before_init"] == \
+        2 * analyze_source(LEAKY)["use_before_init"]
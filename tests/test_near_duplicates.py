@@ -0,0 +1,66 @@
+# test_near_duplicates.py
+# Programs that differ only in names and constants cluster together,
+# and pruning keeps the requested number of members of each cluster
+
+import csv
+
+import numpy as np
+
+from dataset.auto_dataset_generator import generate_dataset
+from dataset.near_duplicates import (
+    NearDuplicateIndex, downsample, normalized_tokens, prune_csv_rows,
+)
+
+
+def variant(name, value, other="b"):
+    return (
+        f"int {name};\nint {other};\n{name} = {value};\n"
+        f"while ({name} < {value * 3}) {{\n  {name} = {name} + 1;\n"
+        f"  if ({name} > {other}) {{\n    {other} = {name};\n  }}\n}}\n"
+    )
+
+
+DIFFERENT = (
+    "int f(int x, int y) {\n  return x * y - x / y;\n}\n"
+    "int q;\nq = f(1, 2);\nq = f(q, q);\n"
+)
+
+
+def test_renamed_variants_normalize_equally():
+    assert normalized_tokens(variant("a", 5)) == normalized_tokens(variant("z", 77, "k"))
+    assert normalized_tokens("a = a + 1;") != normalized_tokens("a = b + 1;")
+
+
+def test_variants_form_one_cluster():
+    index = NearDuplicateIndex()
+    index.add_many([variant(name, value) for name, value in zip("acdefg", range(1, 7))])
+    index.add(DIFFERENT)
+
+    assert sorted(map(sorted, index.clusters())) == [[0, 1, 2, 3, 4, 5], [6]]
+    assert index.similarity(0, 5) == 1.0
+    assert index.similarity(0, 6) < index.threshold
+
+
+def test_prune_keeps_one_member_per_cluster_and_label():
+    clusters = np.array([0, 0, 0, 3, 3, 5])
+    labels = ["1", "1", "0", "1", "1", "0"]
+
+    keep = downsample(clusters, labels, per_cluster=1)
+    assert sorted((clusters[i], labels[i]) for i in keep) == \
+        [(0, "0"), (0, "1"), (3, "1"), (5, "0")]
+    assert len(downsample(clusters, per_cluster=2)) == 5
+
+
+def test_prune_csv_rows(tmp_path):
+    path = str(tmp_path / "dataset.csv")
+    generate_dataset(samples_per_type=20, output_csv=path, include_source=True)
+
+    with open(path, newline="") as f:
+        labels = [row["label"] for row in csv.DictReader(f)]
+
+    keep, index = prune_csv_rows(path, per_cluster=1)
+    groups = set(zip(index.cluster_labels(), labels))
+
+    assert 0 < len(keep) < len(labels) == 100
+    assert {(index.cluster_labels()[i], labels[i]) for i in keep} == groups
+    assert len(keep) == len(groups)
@@ -0,0 +1,89 @@
+# test_online_model.py
+# Online updates publish numbered model versions, grow the existing
+# model instead of refitting it, and reach running predictors
+
+import csv
+
+import numpy as np
+import pytest
+
+from dataset.auto_dataset_generator import generate_dataset
+from ml.online_model import ModelRegistry, OnlineTrainer
+from pipeline.analyze import analyze_source
+from pipeline.predictor import Predictor
+
+
+CODE = "int a;\nint b;\na = 1;\nif (a > 0) {\n  a = a + 1;\n}\n"
+
+
+@pytest.fixture(scope="module")
+def batches(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("rows") / "rows.csv")
+    generate_dataset(samples_per_type=20, output_csv=path, mode="ast", seed=9)
+
+    with open(path, newline="") as f:
+        rows = list(csv.DictReader(f))
+    return rows[:50], rows[50:]
+
+
+def test_registry_versions(tmp_path):
+    registry = ModelRegistry(str(tmp_path))
+    assert registry.versions() == [] and registry.load() is None
+
+    assert registry.publish({"model": 1}) == 1
+    assert registry.publish({"model": 2}) == 2
+    assert registry.versions() == [1, 2]
+    assert registry.current_version() == 2
+    assert registry.load() == {"model": 2}
+    assert registry.load(1) == {"model": 1}
+
+
+def test_forest_grows_from_the_published_model(tmp_path, batches):
+    registry = ModelRegistry(str(tmp_path))
+    first, second = batches
+
+    assert OnlineTrainer(registry, trees_per_batch=5).update(first) == 1
+    old_trees = registry.load().estimators_
+
+    # A new trainer warm-starts from the registry: old trees are kept
+    assert OnlineTrainer(registry, trees_per_batch=5).update(second) == 2
+    model = registry.load()
+    assert len(model.estimators_) == 10
+    for old, new in zip(old_trees, model.estimators_):
+        assert np.array_equal(old.tree_.threshold, new.tree_.threshold)
+
+
+def test_linear_model_is_updated_in_place(tmp_path, batches):
+    registry = ModelRegistry(str(tmp_path))
+    first, second = batches
+
+    trainer = OnlineTrainer(registry, kind="linear")
+    trainer.update(first)
+    coef = registry.load().coef_.copy()
+
+    OnlineTrainer(registry, kind="linear").update(second)
+    model = registry.load()
+    assert model.t_ > len(first)        # partial_fit continued, not restarted
+    assert not np.array_equal(model.coef_, coef)
+
+
+def test_kind_must_match_the_registry_model(tmp_path, batches):
+    registry = ModelRegistry(str(tmp_path))
+    OnlineTrainer(registry, trees_per_batch=2).update(batches[0])
+
+    with pytest.raises(ValueError, match="kind='forest'"):
+        OnlineTrainer(registry, kind="linear")
+
+
+def test_predictor_hot_swaps_new_versions(tmp_path, batches):
+    registry = ModelRegistry(str(tmp_path))
+    trainer = OnlineTrainer(registry, trees_per_batch=2)
+    trainer.update(batches[0])
+
+    predictor = Predictor(registry=registry, refresh_interval=0)
+    first = predictor.model
+    assert predictor.version == 1
+
+    trainer.update(batches[1])
+    assert predictor.predict(analyze_source(CODE)) in (0, 1)
+    assert predictor.version == 2 and predictor.model is not first
@@ -0,0 +1,70 @@
+# test_packed_corpus.py
+# A packed corpus gives back every program it was written with, and bulk
+# analysis gives the same rows as analyzing each program on its own
+
+import struct
+
+import pytest
+
+from dataset.ast_generator import ASTProgramGenerator
+from dataset.auto_dataset_generator import analyze
+from dataset.packed_corpus import (
+    HEADER, MAGIC, VERSION, PackedCorpus, analyze_packed_corpus, write_packed_corpus,
+)
+
+
+@pytest.fixture(scope="module")
+def sources():
+    generator = ASTProgramGenerator(seed=3, statements=(3, 8), depth=(0, 2))
+    programs = [generator.generate().source for _ in range(30)]
+    programs.insert(7, "int ;\n")           # does not parse
+    programs.insert(12, "")
+    programs.insert(20, "int é;\n")         # not ASCII
+    return programs
+
+
+def test_header_and_index_round_trip(sources, tmp_path):
+    path = str(tmp_path / "corpus.mcpk")
+    assert write_packed_corpus(sources, path) == len(sources)
+
+    with open(path, "rb") as f:
+        data = f.read()
+    magic, version, count, index_offset = HEADER.unpack_from(data, 0)
+    assert (magic, version, count) == (MAGIC, VERSION, len(sources))
+
+    offset, length = struct.unpack_from("<QQ", data, index_offset + 16)
+    assert data[offset:offset + length].decode("utf-8") == sources[1]
+
+    with PackedCorpus(path) as corpus:
+        assert len(corpus) == len(sources)
+        assert [corpus.source(i) for i in range(len(corpus))] == sources
+
+
+def test_empty_corpus(tmp_path):
+    path = str(tmp_path / "empty.mcpk")
+    assert write_packed_corpus([], path) == 0
+
+    with PackedCorpus(path) as corpus:
+        assert len(corpus) == 0
+    assert list(analyze_packed_corpus(path)) == []
+    assert list(analyze_packed_corpus(path, workers=2)) == []
+
+
+def test_not_a_corpus(tmp_path):
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"MCAF" + bytes(40))
+
+    with pytest.raises(Exception, match="Not a packed corpus"):
+        PackedCorpus(str(path))
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_rows_match_analyze(sources, tmp_path, workers):
+    path = str(tmp_path / "corpus.mcpk")
+    write_packed_corpus(sources, path)
+
+    rows = list(analyze_packed_corpus(path, workers=workers, chunk_size=8))
+
+    assert [i for i, _ in rows] == list(range(len(sources)))
+    assert rows[7][1] is None
+    assert [features for _, features in rows] == [analyze(code) for code in sources]
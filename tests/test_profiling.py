@@ -0,0 +1,57 @@
+# test_profiling.py
+# Profiled requests return the usual features and leave a profile
+# tagged with the source hash; others leave nothing
+
+import asyncio
+import os
+import pstats
+
+import pytest
+
+from pipeline.analyze import analyze_source
+from pipeline.async_analyzer import AsyncAnalyzer
+from pipeline.profiling import Profiler, analyze_with_profile, source_hash
+
+
+CODE = "int a;\na = 10;\nwhile (a < 100) {\n  a = a + 1;\n}\n"
+
+
+def test_cprofile_writes_stats(tmp_path):
+    features = analyze_with_profile(CODE, str(tmp_path), save_input=True)
+    assert features == analyze_source(CODE)
+
+    names = sorted(os.listdir(tmp_path))
+    assert [os.path.splitext(n)[1] for n in names] == [".mc", ".pstats"]
+    assert names[0].startswith(source_hash(CODE))
+    assert (tmp_path / names[0]).read_text() == CODE
+
+    stats = pstats.Stats(str(tmp_path / names[1]))
+    assert any(name == "analyze_source" for _, _, name in stats.stats)
+
+
+def test_sampler_writes_collapsed_stacks(tmp_path):
+    analyze_with_profile(CODE * 50, str(tmp_path), mode="sampler")
+
+    (name,) = os.listdir(tmp_path)
+    assert name.endswith(".collapsed")
+    for line in (tmp_path / name).read_text().splitlines():
+        stack, count = line.rsplit(" ", 1)
+        assert int(count) > 0 and ";" in stack
+
+
+def test_unknown_mode(tmp_path):
+    with pytest.raises(Exception, match="Unknown profiling mode"):
+        analyze_with_profile(CODE, str(tmp_path), mode="perf")
+
+
+def test_only_chosen_requests_are_profiled(tmp_path):
+    profiler = Profiler(sample_every=3, output_dir=str(tmp_path))
+
+    async def run():
+        async with AsyncAnalyzer(max_workers=1, profiler=profiler) as analyzer:
+            results = [await analyzer.analyze(CODE) for _ in range(6)]
+            results.append(await analyzer.analyze(CODE, profile=True))
+        return results
+
+    assert asyncio.run(run()) == [analyze_source(CODE)] * 7
+    assert len(os.listdir(tmp_path)) == 3     # requests 3, 6 and 7
@@ -0,0 +1,96 @@
+# test_rules.py
+# The rule selection changes which warnings are reported, never the
+# feature vector, and disabled rules do no work
+
+import pytest
+
+from dataset.ast_generator import ASTProgramGenerator
+from features.feature_extractor import FEATURE_NAMES
+from pipeline.analyze import analyze_source
+from pipeline.predictor import Predictor
+from ast_nodes.ast_builder import AssignmentNode
+from rules.rule import RULES, Rule, handles
+from rules.rule_engine import RuleEngine
+
+
+CODE = """
+int add(int x, int y) {
+    return x + y;
+}
+int a;
+int b;
+a = 10;
+while (a < 20) {
+    a = add(a);
+}
+"""
+
+
+def programs(count=30):
+    generator = ASTProgramGenerator(seed=3, statements=(5, 12), depth=(0, 2))
+    return [CODE] + [generator.generate().source for _ in range(count)]
+
+
+@pytest.mark.parametrize("enabled, disabled", [
+    (None, ["unused_variables"]),
+    (None, ["calls", "structure"]),
+    (["structure"], None),
+    ([], None),
+])
+def test_features_do_not_depend_on_rules(enabled, disabled):
+    for code in programs():
+        full = analyze_source(code, rules=RuleEngine())
+        selected = analyze_source(code, rules=RuleEngine(enabled, disabled))
+
+        assert list(selected) == list(FEATURE_NAMES)
+        assert selected == full
+
+
+def test_disabled_rules_report_nothing():
+    from lexer_parser.parser import parse_ast
+    from cfg.cfg_builder import CFGBuilder
+
+    ast, symbols = parse_ast(CODE)
+    cfg = CFGBuilder().build(ast)
+
+    full = RuleEngine().run(ast, cfg, symbols)
+    engine = RuleEngine(disabled=["unused_variables", "calls"])
+    report = engine.run(ast, cfg, symbols)
+
+    assert full.warnings["unused_variables"] and full.warnings["calls"]
+    assert set(report.warnings) == set(report.times) == set(engine.times) == {
+        name for name in RULES if name not in ("unused_variables", "calls")
+    }
+    assert report.features == full.features
+
+
+def test_rule_based_prediction_with_a_rule_disabled():
+    features = analyze_source(CODE, rules=RuleEngine(disabled=["unused_variables"]))
+    assert Predictor().predict(features) == Predictor().predict(analyze_source(CODE))
+
+
+class CountingRule(Rule):
+    name = "counting"
+    calls = 0
+
+    @handles(AssignmentNode)
+    def assignment(self, node, walk):
+        CountingRule.calls += 1
+
+    def finish(self, walk):
+        CountingRule.calls += 1
+
+
+def test_disabled_rules_are_not_dispatched(monkeypatch):
+    monkeypatch.setitem(RULES, "counting", CountingRule)
+    monkeypatch.setattr(CountingRule, "calls", 0)
+
+    analyze_source(CODE, rules=RuleEngine())
+    assert CountingRule.calls == 3
+
+    engine = RuleEngine(disabled=["counting", "calls"])
+    analyze_source(CODE, rules=engine)
+    assert CountingRule.calls == 3
+    assert CountingRule.assignment not in [
+        function for handlers in engine.table.values() for _, function in handlers
+    ]
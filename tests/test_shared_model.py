@@ -0,0 +1,84 @@
+# test_shared_model.py
+# An exported shared forest predicts exactly like the forest it came
+# from, and scan workers holding it give the same stored predictions
+
+import joblib
+import numpy as np
+import pytest
+
+from dataset.ast_generator import ASTProgramGenerator
+from dataset.auto_dataset_generator import generate_dataset
+from features.feature_store import FeatureStore
+from ml.feature_matrix import load_feature_matrix
+from ml.parallel_train import _fit_final
+from ml.shared_model import SharedForest, export_forest, load_model
+from pipeline.directory_scan import scan_directory
+from pipeline.predictor import Predictor
+
+
+@pytest.fixture(scope="module")
+def models(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("models")
+    csv_path = str(directory / "dataset.csv")
+    generate_dataset(samples_per_type=40, output_csv=csv_path, mode="ast", seed=5)
+
+    X, _, columns = load_feature_matrix(csv_path)
+    _, model = _fit_final(csv_path, "random_forest", columns)
+
+    joblib_path = str(directory / "random_forest.joblib")
+    joblib.dump(model, joblib_path)
+    forest_path = export_forest(model, str(directory / "random_forest.forest"))
+    return model, joblib_path, forest_path, np.asarray(X)
+
+
+def test_shared_forest_matches_the_model(models):
+    model, _, forest_path, X = models
+    rng = np.random.default_rng(0)
+    rows = np.vstack([X, rng.integers(0, 12, size=(500, X.shape[1]))])
+
+    shared = SharedForest.load(forest_path)
+    assert isinstance(load_model(forest_path), SharedForest)
+    assert np.array_equal(shared.predict(rows), model.predict(rows))
+    assert np.allclose(shared.predict_proba(rows), model.predict_proba(rows))
+    assert shared.feature_columns == model.feature_columns
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / "src"
+    root.mkdir()
+    generator = ASTProgramGenerator(seed=11, statements=(5, 12), depth=(0, 2))
+    for i in range(24):
+        (root / f"p{i}.mc").write_text(generator.generate().source)
+    return root
+
+
+def stored_predictions(store, root):
+    return {
+        path: store.get(path)["prediction"]
+        for path in store.stat_index() if path.startswith(str(root))
+    }
+
+
+def test_scan_workers_predict_like_the_parent(models, tree, tmp_path):
+    _, joblib_path, forest_path, _ = models
+
+    sequential = FeatureStore(str(tmp_path / "sequential.db"))
+    scan_directory(str(tree), sequential, Predictor(joblib_path))
+
+    # With a shared forest the workers predict; the parent scores nothing
+    predictor = Predictor(forest_path)
+    batches = []
+    predict_many = predictor.predict_many
+    predictor.predict_many = lambda rows: batches.append(len(rows)) or predict_many(rows)
+
+    parallel = FeatureStore(str(tmp_path / "parallel.db"))
+    scan_directory(str(tree), parallel, predictor, workers=2)
+
+    expected = stored_predictions(sequential, tree)
+    assert len(expected) == 24 and None not in expected.values()
+    assert stored_predictions(parallel, tree) == expected
+    assert sum(batches) == 0
+
+    sequential.close()
+    parallel.close()
@@ -0,0 +1,69 @@
+# test_token_stream.py
+# A packed token stream holds the same tokens as the PLY lexer, and
+# parsing it gives the same AST, symbols and features as parsing text
+
+import pytest
+
+from cfg.cfg_builder import CFGBuilder
+from dataset.ast_generator import ASTProgramGenerator
+from features.feature_extractor import FeatureExtractor
+from lexer_parser.lexer import lexer as base_lexer
+from lexer_parser.parser import parse_ast, parse_tokens
+from lexer_parser.token_stream import TokenStream
+from pipeline.budget import AnalysisBudget, BudgetExceeded
+
+
+FUNCTION = "int f(int x) {\n  int y;\n  y = x * 2;\n  return y + 99999999999999999999;\n}\n"
+
+
+def lex(data):
+    lex = base_lexer.clone()
+    lex.lineno = 1
+    lex.symbols = None
+    lex.nodes = None
+    lex.input(data)
+    return [(t.type, t.value, t.lineno, t.lexpos) for t in iter(lex.token, None)]
+
+
+def programs(seed, count=40):
+    generator = ASTProgramGenerator(seed=seed, statements=(5, 12), depth=(0, 2))
+    return [FUNCTION] + [generator.generate().source for _ in range(count)]
+
+
+def features(ast, symbols):
+    return FeatureExtractor().extract(ast, CFGBuilder().build(ast), symbols)
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_stream_round_trip(seed):
+    for code in programs(seed):
+        stream = TokenStream.lex(code)
+        tokens = lex(code)
+
+        assert [(t.type, t.value, t.lineno, t.lexpos) for t in stream] == tokens
+        assert len(stream.constants) == len({(type(v), v) for _, v, _, _ in tokens})
+        for i, (_, _, _, offset) in enumerate(tokens):
+            assert stream.columns[i] == offset - code.rfind("\n", 0, offset)
+
+        expected, expected_symbols = parse_ast(code)
+        for _ in range(2):   # a stream can be replayed any number of times
+            ast, symbols = parse_tokens(stream)
+            assert repr(ast) == repr(expected)
+            assert list(map(str, symbols)) == list(map(str, expected_symbols))
+            assert features(ast, symbols) == features(expected, expected_symbols)
+
+
+def test_syntax_error():
+    stream = TokenStream.lex("int a;\na = ;\n")
+    assert parse_tokens(stream)[0] is None
+
+
+def test_budget_counts_replayed_tokens():
+    stream = TokenStream.lex(FUNCTION)
+
+    budget = AnalysisBudget()
+    parse_tokens(stream, budget=budget)
+    assert budget.tokens == len(stream)
+
+    with pytest.raises(BudgetExceeded):
+        parse_tokens(stream, budget=AnalysisBudget(max_tokens=len(stream) - 1))